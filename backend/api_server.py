@@ -0,0 +1,588 @@
+# backend/api_server.py – Lokale HTTP-API für Live- und Verlaufsdaten
+"""
+Kleiner asyncio-HTTP-Dienst neben der Zählung, damit Beschilderung, Gebäudetechnik
+oder das Dashboard Zählerstände abfragen können, ohne selbst `counter.json` bzw.
+`log.db` zu lesen.
+
+Endpunkte (GET/HEAD, Antwort JSON):
+    /api/live
+        Aktueller Zählerstand (wie counter.json).
+    /api/history?start=…&end=…&bucket=hourly&camera=…
+        Verlauf im Zeitfenster [start, end): `bucket` ist "raw" oder eine
+        Rollup-Granularität (10min, 30min, hourly, daily, weekly, monthly);
+        `start`/`end` als Epoch-ms oder ISO-Zeitpunkt in Ortszeit
+        (Standard: letzte 24 Stunden ab Bucket-Beginn, Ende offen).
+    /api/export?format=csv&bucket=raw&start=…&end=…&camera=…&name=…
+        Download (CSV oder Parquet) mit denselben Parametern wie /api/history.
+        Die Datei wird blockweise aus SQLite erzeugt (`backend/storage/export.py`),
+        in Blöcken von der Festplatte gesendet und danach gelöscht – weder die API
+        noch das Dashboard halten den Export im Speicher.
+
+Caching und Änderungen:
+- Jede Antwort trägt `ETag` und `Last-Modified`; passt `If-None-Match` bzw.
+  `If-Modified-Since`, kommt 304 ohne Body.
+- Long-Polling: `wait=<Sekunden>` zusammen mit `If-None-Match` (oder `etag=…`
+  ohne Preflight im Browser) hält die Anfrage offen, bis sich die Antwort ändert
+  (200) oder die Wartezeit abläuft (304).
+- Gemeinsamer Lesepfad: Ein einziger Hintergrund-Task liest den Live-Datensatz
+  (mmap) und erkennt neue Commits per `PRAGMA data_version`. Verlaufsantworten
+  liegen in einem LRU-Cache, der bei jedem Commit verworfen wird; gleichzeitige
+  identische Anfragen lösen nur eine Abfrage aus. Alle Datenbankzugriffe laufen
+  über eine Lese-Verbindung in einem eigenen Thread.
+
+Start (macht `ekspar.py` automatisch):
+    python backend/api_server.py --host 0.0.0.0 --port 8600
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import asyncio
+import collections
+import datetime
+import email.utils
+import hashlib
+import json
+import os
+import re
+import signal
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from backend.storage import export
+from backend.storage.live_state import read_live_state
+from backend.storage.rollups import GRANULARITIES, bucket_start
+
+# ─── Pfade ─────────────────────────────────────────────────────────────────────
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DB_PATH = os.path.join(PROJECT_DIR, "data", "log.db")
+COUNTER_PATH = os.path.join(PROJECT_DIR, "data", "counter.json")
+LIVE_STATE_PATH = os.path.join(PROJECT_DIR, "data", "counter.bin")
+
+# ─── Konfiguration ─────────────────────────────────────────────────────────────
+API_HOST = "127.0.0.1"           # "0.0.0.0" = im lokalen Netz erreichbar
+API_PORT = 8600
+LIVE_POLL_INTERVAL = 0.25        # Sekunden zwischen zwei Lesevorgängen des Live-Datensatzes
+DB_POLL_INTERVAL = 1.0           # Sekunden zwischen zwei Prüfungen auf neue Commits
+MAX_WAIT = 60.0                  # Längste Long-Polling-Wartezeit in Sekunden
+CACHE_ENTRIES = 128              # Zwischengespeicherte Verlaufsantworten
+MAX_ROWS = 100_000               # Zeilen je Verlaufsantwort (darüber: "truncated")
+DEFAULT_HISTORY_HOURS = 24       # Zeitfenster ohne `start`
+DEFAULT_RAW_ALIGN = "10min"      # Rohdaten ohne `start`: Beginn auf diese Bucket-Grenze gerundet
+EXPORT_SEND_CHUNK = 64 * 1024    # Bytes je Block beim Senden einer Exportdatei
+REQUEST_TIMEOUT = 10.0           # Sekunden für Anfragezeile und Header
+MAX_HEADER_LINES = 64
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+STATUS_TEXT = {
+    200: "OK",
+    204: "No Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class ApiError(Exception):
+    """Fehler, der als JSON-Antwort mit HTTP-Status an den Client geht."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Snapshot:
+    """
+    Fertig serialisierte Antwort mit Validatoren.
+
+    Args:
+        payload (dict): JSON-Inhalt.
+        last_modified (float): Zeitpunkt der letzten Änderung (Epoch-Sekunden).
+    """
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, payload: dict, last_modified: float) -> None:
+        self.body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+        self.last_modified = last_modified
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧩 Parameter
+# ────────────────────────────────────────────────────────────────────────────────
+def parse_time(value: str | None, default: int) -> int:
+    """
+    Wandelt einen Zeitparameter in Epoch-ms.
+
+    Args:
+        value (str | None): Epoch-ms oder ISO-Zeitpunkt (Ortszeit); None = `default`.
+        default (int): Wert ohne Angabe.
+    """
+    if value is None or value == "":
+        return default
+    try:
+        if value.lstrip("-").isdigit():
+            return int(value)
+        return int(datetime.datetime.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        raise ApiError(400, f"Ungültiger Zeitpunkt: {value}") from None
+
+
+def parse_history_query(query: dict[str, str]) -> tuple[str, int, int, str | None]:
+    """
+    Liest Bucket, Zeitfenster und Kamera aus den Parametern von /api/history.
+
+    Args:
+        query (dict[str, str]): Query-Parameter.
+
+    Returns:
+        tuple[str, int, int, str | None]: (bucket, start, end, camera).
+    """
+    bucket = query.get("bucket", "hourly")
+    if bucket not in (export.RAW,) + GRANULARITIES:
+        raise ApiError(400, f"Unbekannter bucket: {bucket} (erlaubt: raw, {', '.join(GRANULARITIES)})")
+    # Standardbeginn auf eine Bucket-Grenze runden: sonst ändern sich Zeitfenster, ETag
+    # und Cache-Schlüssel mit jeder Millisekunde (kein Cache-Treffer, kein Long-Polling)
+    since = int(time.time() * 1000) - DEFAULT_HISTORY_HOURS * 3_600_000
+    default_start = bucket_start(since, DEFAULT_RAW_ALIGN if bucket == export.RAW else bucket)
+    start = parse_time(query.get("start"), default_start)
+    end = parse_time(query.get("end"), export.OPEN_END)
+    if end <= start:
+        raise ApiError(400, "end muss nach start liegen")
+    return bucket, start, end, query.get("camera")
+
+
+def parse_export_query(query: dict[str, str]) -> tuple[str, str, str, int, int, str | None]:
+    """
+    Liest Format, Dateiname, Bucket, Zeitfenster und Kamera aus den Parametern von /api/export.
+
+    Args:
+        query (dict[str, str]): Query-Parameter.
+
+    Returns:
+        tuple: (format, Dateiname, bucket, start, end, camera).
+    """
+    fmt = query.get("format", "csv")
+    if fmt not in export.FORMATS:
+        raise ApiError(400, f"Unbekanntes Format: {fmt} (erlaubt: {', '.join(export.FORMATS)})")
+    if fmt == "parquet" and not export.parquet_available():
+        raise ApiError(400, "Parquet-Export benötigt das Paket 'pyarrow'")
+    bucket, start, end, camera = parse_history_query(query)
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", query.get("name") or f"ekspar_export_{bucket}")
+    if not name.endswith(f".{fmt}"):
+        name += f".{fmt}"
+    return fmt, name, bucket, start, end, camera
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Prüft If-None-Match (Liste, schwache Validatoren, "*") gegen einen ETag."""
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def http_date(timestamp: float) -> str:
+    """Zeitpunkt als HTTP-Datum (RFC 7231)."""
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 ApiServer
+# ────────────────────────────────────────────────────────────────────────────────
+class ApiServer:
+    """
+    HTTP-Dienst mit gemeinsamem, zwischengespeichertem Lesepfad für alle Clients.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        json_path (str): Pfad zu counter.json (Fallback des Live-Zählerstands).
+        mmap_path (str | None): Pfad zum Live-Datensatz (counter.bin).
+        host (str): Adresse, an die der Dienst gebunden wird.
+        port (int): TCP-Port.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, json_path: str = COUNTER_PATH,
+                 mmap_path: str | None = LIVE_STATE_PATH, host: str = API_HOST, port: int = API_PORT) -> None:
+        self.db_path = db_path
+        self.json_path = json_path
+        self.mmap_path = mmap_path
+        self.host = host
+        self.port = port
+
+        # Datenbank: eine Lese-Verbindung, nur im eigenen Thread benutzt
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ekspar-api-db")
+        self._conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        # Exporte in einem eigenen Thread, damit Live- und Verlaufsabfragen nicht warten
+        self._export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ekspar-api-export")
+
+        # Gemeinsamer Zustand (nur im Event-Loop verändert)
+        self._version = 0                  # Steigt bei jeder Änderung (Live oder Datenbank)
+        self._db_version = 0               # Steigt bei jedem neuen Commit (Teil des Cache-Schlüssels)
+        self._live: Snapshot | None = None
+        self._live_key: tuple | None = None
+        self._changed: asyncio.Condition | None = None
+        self._cache: collections.OrderedDict[tuple, Snapshot] = collections.OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._server: asyncio.base_events.Server | None = None
+        self._poller: asyncio.Task | None = None
+
+        # Metriken
+        self.requests = 0
+        self.not_modified = 0
+        self.cache_hits = 0
+        self.db_queries = 0
+        self.exports = 0
+
+    # ── Lebenszyklus ──
+    async def start(self) -> None:
+        """Öffnet den Port und startet den Hintergrund-Task für Live-Datensatz und Datenbank."""
+        self._changed = asyncio.Condition()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._poller = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        """Schließt den Port, beendet den Hintergrund-Task und die Datenbankverbindung."""
+        if self._poller is not None:
+            self._poller.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_db)
+        self._executor.shutdown(wait=True)
+        self._export_executor.shutdown(wait=True)
+
+    def format_stats(self) -> str:
+        """Formatiert die Kennzahlen als einzeilige Log-Ausgabe."""
+        return (
+            f"API: {self.requests} Anfragen, {self.not_modified}× 304, "
+            f"{self.cache_hits} Cache-Treffer, {self.db_queries} Datenbankabfragen, {self.exports} Exporte"
+        )
+
+    # ── Gemeinsamer Lesepfad ──
+    async def _poll_loop(self) -> None:
+        """Liest den Live-Datensatz und erkennt neue Commits; weckt wartende Long-Poll-Anfragen."""
+        loop = asyncio.get_running_loop()
+        next_db_check = 0.0
+        while True:
+            changed = self._refresh_live()
+            if loop.time() >= next_db_check:
+                next_db_check = loop.time() + DB_POLL_INTERVAL
+                try:
+                    data_version = await loop.run_in_executor(self._executor, self._read_data_version)
+                except sqlite3.Error as e:
+                    print(f"[WARN] API: Datenbank nicht lesbar: {e}")
+                    data_version = None
+                if data_version != self._data_version:
+                    self._data_version = data_version
+                    self._db_version += 1
+                    self._cache.clear()
+                    changed = True
+            if changed:
+                self._version += 1
+                async with self._changed:
+                    self._changed.notify_all()
+            await asyncio.sleep(LIVE_POLL_INTERVAL)
+
+    def _refresh_live(self) -> bool:
+        """Liest den Live-Zählerstand (mmap, sonst JSON); True bei Änderung."""
+        try:
+            data = read_live_state(self.json_path, self.mmap_path)
+        except (OSError, ValueError):
+            return False
+        if data is None:
+            return False
+        key = tuple(data.get(k) for k in ("timestamp", "in", "out", "current", "total_tracks"))
+        if key == self._live_key:
+            return False
+        try:
+            modified = datetime.datetime.fromisoformat(data["timestamp"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            modified = time.time()
+        self._live_key = key
+        self._live = Snapshot(data, modified)
+        return True
+
+    async def live_snapshot(self) -> Snapshot:
+        """Aktueller Zählerstand aus dem gemeinsamen Speicher."""
+        if self._live is None:
+            raise ApiError(503, "Noch kein Zählerstand vorhanden")
+        return self._live
+
+    async def history_snapshot(self, bucket: str, start: int, end: int, camera: str | None) -> Snapshot:
+        """
+        Verlauf aus dem Cache bzw. per (gebündelter) Datenbankabfrage.
+
+        Args:
+            bucket (str): "raw" oder eine Rollup-Granularität.
+            start (int): Beginn in Epoch-ms.
+            end (int): Ende in Epoch-ms (exklusive).
+            camera (str | None): Nur diese Kamera (None = alle).
+        """
+        key = (bucket, start, end, camera, self._db_version)
+        snapshot = self._cache.get(key)
+        if snapshot is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return snapshot
+
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._query_history, bucket, start, end, camera)
+            self._inflight[key] = future
+            self.db_queries += 1
+            try:
+                snapshot = await future
+            finally:
+                del self._inflight[key]
+            if key[-1] == self._db_version:  # Inzwischen neuer Commit → nicht mehr zwischenspeichern
+                self._cache[key] = snapshot
+                while len(self._cache) > CACHE_ENTRIES:
+                    self._cache.popitem(last=False)
+            return snapshot
+        self.cache_hits += 1
+        return await asyncio.shield(future)
+
+    # ── Datenbank (nur im Executor-Thread) ──
+    def _connection(self) -> sqlite3.Connection:
+        """Öffnet die Lese-Verbindung bei Bedarf."""
+        if self._conn is None:
+            if not os.path.exists(self.db_path):
+                raise ApiError(503, "Datenbank noch nicht vorhanden")
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return self._conn
+
+    def _close_db(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _read_data_version(self) -> int | None:
+        """`PRAGMA data_version` ändert sich, sobald eine andere Verbindung committet."""
+        try:
+            return self._connection().execute("PRAGMA data_version").fetchone()[0]
+        except ApiError:
+            return None
+
+    def _query_history(self, bucket: str, start: int, end: int, camera: str | None) -> Snapshot:
+        """Liest den Verlauf über denselben Lesepfad wie der Export (`export.iter_chunks`)."""
+        conn = self._connection()
+        columns = export.columns_for(bucket)
+        chunks = export.iter_chunks(conn, bucket, start, end, camera, chunk_size=MAX_ROWS + 1)
+        try:
+            rows = next(chunks, [])
+        finally:
+            chunks.close()
+        latest = conn.execute("SELECT max(ts) FROM log").fetchone()[0]
+        payload = {
+            "bucket": bucket,
+            "start": start,
+            "end": end if end != export.OPEN_END else None,
+            "camera": camera,
+            "truncated": len(rows) > MAX_ROWS,
+            "rows": [dict(zip(columns, row)) for row in rows[:MAX_ROWS]],
+        }
+        return Snapshot(payload, latest / 1000 if latest else time.time())
+
+    # ── HTTP ──
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Bearbeitet genau eine Anfrage je Verbindung (Connection: close)."""
+        method = "GET"
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                raise ApiError(400, "Ungültige Anfragezeile")
+            method, target = parts[0], parts[1]
+            self.requests += 1
+
+            if method == "OPTIONS":  # CORS-Preflight für If-None-Match aus dem Browser
+                self._send(writer, 204, b"", method=method)
+                return
+            if method not in ("GET", "HEAD"):
+                raise ApiError(405, f"Methode {method} nicht erlaubt")
+
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if url.path == "/api/live":
+                get_snapshot = self.live_snapshot
+            elif url.path == "/api/history":
+                params = parse_history_query(query)
+                get_snapshot = lambda: self.history_snapshot(*params)  # noqa: E731
+            elif url.path == "/api/export":
+                await self._send_export(writer, method, *parse_export_query(query))
+                return
+            else:
+                raise ApiError(404, f"Unbekannter Pfad: {url.path}")
+            await self._respond(writer, method, headers, query, get_snapshot)
+
+        except ApiError as e:
+            self._send_error(writer, e.status, e.message, method)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            print(f"[ERROR] API: {e}")
+            self._send_error(writer, 500, "Interner Fehler", method)
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, headers: dict[str, str],
+                       query: dict[str, str], get_snapshot) -> None:
+        """Antwortet mit 200 bzw. 304, ggf. nach Long-Polling auf eine Änderung."""
+        client_etag = headers.get("if-none-match") or query.get("etag")
+        try:
+            wait = min(max(float(query.get("wait", 0)), 0.0), MAX_WAIT)
+        except ValueError:
+            raise ApiError(400, f"Ungültige Wartezeit: {query.get('wait')}") from None
+
+        seen = self._version
+        snapshot = await get_snapshot()
+        if wait and client_etag and etag_matches(client_etag, snapshot.etag):
+            deadline = asyncio.get_running_loop().time() + wait
+            while etag_matches(client_etag, snapshot.etag):
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                async with self._changed:
+                    try:
+                        await asyncio.wait_for(self._changed.wait_for(lambda: self._version != seen), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                seen = self._version
+                snapshot = await get_snapshot()
+
+        if self._not_modified(headers, query, snapshot):
+            self.not_modified += 1
+            self._send(writer, 304, b"", snapshot, method)
+        else:
+            self._send(writer, 200, snapshot.body, snapshot, method)
+
+    async def _send_export(self, writer: asyncio.StreamWriter, method: str, fmt: str, name: str,
+                           bucket: str, start: int, end: int, camera: str | None) -> None:
+        """Erzeugt die Exportdatei im Export-Thread und sendet sie blockweise von der Festplatte."""
+        if not os.path.exists(self.db_path):
+            raise ApiError(503, "Datenbank noch nicht vorhanden")
+        loop = asyncio.get_running_loop()
+        path, count = await loop.run_in_executor(
+            self._export_executor, export.export_file, self.db_path, fmt, bucket, start, end, camera
+        )
+        self.exports += 1
+        try:
+            self._write_head(writer, 200, EXPORT_CONTENT_TYPES[fmt], os.path.getsize(path), [
+                f'Content-Disposition: attachment; filename="{name}"',
+                f"X-Row-Count: {count}",
+            ])
+            if method == "HEAD":
+                return
+            with open(path, "rb") as f:
+                while chunk := f.read(EXPORT_SEND_CHUNK):
+                    writer.write(chunk)
+                    await writer.drain()  # Gegendruck: erst weiterlesen, wenn der Client abgenommen hat
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _not_modified(headers: dict[str, str], query: dict[str, str], snapshot: Snapshot) -> bool:
+        """Bedingte Anfrage: If-None-Match hat Vorrang vor If-Modified-Since."""
+        client_etag = headers.get("if-none-match") or query.get("etag")
+        if client_etag:
+            return etag_matches(client_etag, snapshot.etag)
+        since = headers.get("if-modified-since")
+        if since:
+            try:
+                return int(snapshot.last_modified) <= email.utils.parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+              snapshot: Snapshot | None = None, method: str = "GET") -> None:
+        """Schreibt Statuszeile, Header und (außer bei HEAD/304) den Body."""
+        extra = []
+        if snapshot is not None:
+            extra.append(f"ETag: {snapshot.etag}")
+            extra.append(f"Last-Modified: {http_date(snapshot.last_modified)}")
+        self._write_head(writer, status, "application/json; charset=utf-8", len(body), extra)
+        if method != "HEAD" and status not in (204, 304):
+            writer.write(body)
+
+    @staticmethod
+    def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str, length: int,
+                    extra: list[str]) -> None:
+        """Schreibt Statuszeile und Header (gemeinsam für JSON-Antworten und Exporte)."""
+        lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {length}",
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Headers: If-None-Match, If-Modified-Since",
+            "Access-Control-Expose-Headers: ETag, Last-Modified",
+            "Connection: close",
+        ] + extra
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str, method: str) -> None:
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self._send(writer, status, body, method=method)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+async def serve(server: ApiServer) -> None:
+    """Betreibt den Dienst bis SIGTERM/SIGINT."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)  # ekspar.py beendet per terminate()
+
+    await server.start()
+    print(f"[INFO] API läuft auf http://{server.host}:{server.port}/api/live")
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+        print(f"[PERF] {server.format_stats()}")
+
+
+def main() -> None:
+    """Startet die HTTP-API über die Kommandozeile."""
+    parser = argparse.ArgumentParser(description="Lokale HTTP-API für Live- und Verlaufsdaten")
+    parser.add_argument("--host", default=API_HOST, help="Adresse (0.0.0.0 = im lokalen Netz erreichbar)")
+    parser.add_argument("--port", type=int, default=API_PORT, help="TCP-Port")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur SQLite-Datenbank")
+    parser.add_argument("--counter", default=COUNTER_PATH, help="Pfad zu counter.json")
+    parser.add_argument("--live-state", default=LIVE_STATE_PATH, help="Pfad zum Live-Datensatz (counter.bin)")
+    args = parser.parse_args()
+
+    asyncio.run(serve(ApiServer(args.db, args.counter, args.live_state, args.host, args.port)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,112 @@
 # backend/camera/camera_interface.py
 """
-Modul zur externen Kameraauslösung für den Konfigurationsmodus.
-Führt `capture_raw.py` außerhalb der virtuellen Umgebung aus, um `libcamera`-Kompatibilität zu gewährleisten.
+Modul zur Kameraauslösung für den Konfigurationsmodus.
+
+Läuft die Zählung, besitzt deren Kameradienst den Sensor: Standbilder werden dann
+per Unix-Socket direkt aus dem laufenden Stream angefordert (Millisekunden, ohne
+Unterbrechung der Zählung). Nur wenn kein Kameradienst erreichbar ist, wird
+`capture_raw.py` außerhalb der virtuellen Umgebung ausgeführt, um
+`libcamera`-Kompatibilität zu gewährleisten. Für andere Bildquellen (Video,
+Bildverzeichnis, synthetisch) genügt der aktuelle Interpreter.
 """
 
 import os
+import sys
 import subprocess
 import time
 import logging
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.control import COUNTER_SOCKET_PATH, send_command, switch_mode
+
 # ─── Logging Setup ──────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # ─── Konstanten ─────────────────────────────────────────────────────────────────
+PROJECT_DIR: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 SCRIPT_PATH: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "capture_raw.py"))
+SNAPSHOT_PATH: str = os.path.join(PROJECT_DIR, "static", "last_config.jpg")
+CAMERA_SOCKET_PATH: str = COUNTER_SOCKET_PATH
 SYSTEM_PYTHON: str = "/usr/bin/python3"  # Wichtig: außerhalb der .venv
+CAMERA_SOURCE: str = os.environ.get("EKSPAR_CAMERA_SOURCE", "picamera2")  # Wie backend/camera/sources.py
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 📷 Bildaufnahme über externes Skript
+# 🔌 Kameradienst der laufenden Zählung
+# ────────────────────────────────────────────────────────────────────────────────
+def send_camera_command(command: str, timeout: float = 3.0) -> str | None:
+    """
+    Sendet eine Befehlszeile an den Kameradienst der Zählung.
+
+    Args:
+        command (str): Befehl, z. B. "SNAPSHOT <Pfad>" oder "RELOAD".
+        timeout (float): Maximale Wartezeit auf die Antwort in Sekunden.
+
+    Returns:
+        str | None: Antwortzeile oder None, falls kein Kameradienst erreichbar ist.
+    """
+    return send_command(CAMERA_SOCKET_PATH, command, timeout)
+
+
+def request_snapshot(path: str = SNAPSHOT_PATH) -> bool:
+    """
+    Fordert ein Standbild aus dem laufenden Kamerastream an.
+
+    Args:
+        path (str): Zielpfad des JPEG-Bildes.
+
+    Returns:
+        bool: True, wenn der Kameradienst das Bild geschrieben hat.
+    """
+    reply = send_camera_command(f"SNAPSHOT {path}")
+    if reply is None:
+        return False
+    if reply.startswith("OK"):
+        logging.info(f"✅ Bild aus laufendem Kamerastream gespeichert ({reply[3:]} ms).")
+        return True
+    logging.warning(f"⚠️ Kameradienst: {reply}")
+    return False
+
+
+def request_reload() -> bool:
+    """
+    Fordert die laufende Zählung auf, Zählbereich und Richtung neu zu laden.
+
+    Returns:
+        bool: True, wenn der Kameradienst den Befehl angenommen hat.
+    """
+    reply = send_camera_command("RELOAD")
+    return reply is not None and reply.startswith("OK")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📷 Bildaufnahme (Kameradienst oder externes Skript)
 # ────────────────────────────────────────────────────────────────────────────────
 def capture_image() -> bool:
     """
-    Führt die Bildaufnahme über ein externes Python-Skript (`capture_raw.py`) aus,
-    um ein Kamerabild für den Konfigurationsmodus zu erzeugen.
+    Erzeugt ein Kamerabild für den Konfigurationsmodus.
+
+    Bevorzugt wird das Standbild aus dem Kameradienst der laufenden Zählung; nur
+    ohne Kameradienst wird die Kamera auf 'config' gesetzt und das externe Skript
+    (`capture_raw.py`) ausgeführt.
 
     Returns:
         bool: True bei Erfolg, False bei Fehler.
     """
+    if request_snapshot():
+        return True
+
     try:
-        # Kamera auf Konfigurationsmodus setzen
-        with open("camera.lock", "w") as f:
-            f.write("config")
+        # Kamera auf Konfigurationsmodus setzen (ekspar.py gibt die Kamera sofort frei)
+        switch_mode("config")
         logging.info("📷 Kamera auf 'config' gesetzt.")
 
         # Kleine Verzögerung (Kamera initialisieren)
         time.sleep(1.5)
 
-        # Subprozess ausführen (außerhalb der .venv)
+        # Subprozess ausführen (picamera2: außerhalb der .venv)
+        python = SYSTEM_PYTHON if CAMERA_SOURCE == "picamera2" else sys.executable
         result = subprocess.run(
-            [SYSTEM_PYTHON, SCRIPT_PATH],
+            [python, SCRIPT_PATH, "--source", CAMERA_SOURCE],
             capture_output=True,
             text=True
         )
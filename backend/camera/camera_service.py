@@ -0,0 +1,205 @@
+# backend/camera/camera_service.py – Langlebiger Kameradienst
+"""
+Besitzt die Bildquelle (Sensor) für die gesamte Laufzeit des Zählprozesses.
+
+Ein Aufnahme-Thread liest fortlaufend Frames und hält den jeweils neuesten vor:
+- Die Zählung holt Frames mit `read()` (blockiert bis ein neuer Frame vorliegt).
+- Standbilder für den Konfigurationsmodus werden aus dem laufenden Stream als
+  JPEG geschrieben (`snapshot()`), ohne Kamera-Neuinitialisierung, ohne
+  Modell-Neuladen und ohne Lücke in der Zählung.
+
+Andere Prozesse (Dashboard) erreichen den Dienst über den Steuer-Socket der
+Zählung (`backend/control.py`); `register_commands()` hängt dort an:
+
+    PING               → OK <Quelle>
+    SNAPSHOT <Pfad>    → OK <Dauer in ms>
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from backend.camera.sources import CameraSource
+from backend.control import ControlServer
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📷 CameraService
+# ────────────────────────────────────────────────────────────────────────────────
+class CameraService:
+    """
+    Kameradienst mit Aufnahme-Thread, Frame-Übergabe an die Zählung und Standbild-Anfragen.
+
+    Args:
+        source (CameraSource): Noch nicht gestartete Bildquelle; gehört ab jetzt dem Dienst.
+        jpeg_quality (int): JPEG-Qualität der Standbilder (0–100).
+        notify (threading.Event | None): Wird bei jedem neuen Frame gesetzt; mehrere Dienste können sich
+            ein Event teilen, damit ein Verbraucher auf den nächsten Frame irgendeiner Kamera warten kann.
+    """
+
+    def __init__(self, source: CameraSource, jpeg_quality: int = 90,
+                 notify: threading.Event | None = None) -> None:
+        self.source = source
+        self.jpeg_quality = jpeg_quality
+        self.notify = notify
+        self.error: Exception | None = None
+
+        self._cond = threading.Condition()
+        self._frame: np.ndarray | None = None
+        self._captured_at = 0.0
+        self._seq = 0
+        self._delivered_seq = 0
+        self._running = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Metriken
+        self.snapshots = 0
+        self.last_snapshot_ms = 0.0
+
+    # ── Lebenszyklus ──
+    def start(self) -> None:
+        """Startet Bildquelle und Aufnahme-Thread."""
+        self.source.start()
+        self._running.set()
+        self._thread = threading.Thread(target=self._capture_loop, name="ekspar-camera", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Stoppt Aufnahme-Thread und Bildquelle.
+
+        Args:
+            timeout (float): Maximale Wartezeit auf den Aufnahme-Thread in Sekunden.
+        """
+        self._running.clear()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.source.stop()
+
+    # ── Aufnahme ──
+    def _capture_loop(self) -> None:
+        """Liest fortlaufend Frames und ersetzt den vorgehaltenen neuesten Frame."""
+        try:
+            while self._running.is_set():
+                frame = self.source.read()
+                with self._cond:
+                    self._frame = frame
+                    self._captured_at = time.time()
+                    self._seq += 1
+                    self._cond.notify_all()
+                if self.notify is not None:
+                    self.notify.set()
+        except Exception as e:  # inkl. StopIteration bei erschöpfter Dateiquelle
+            self.error = e
+        finally:
+            self._running.clear()
+            with self._cond:
+                self._cond.notify_all()
+            if self.notify is not None:
+                self.notify.set()
+
+    def _hand_out(self, frame: np.ndarray) -> np.ndarray:
+        """Kopiert Frames aus Ringpuffern, damit sie der Aufnahme-Thread nicht überschreibt."""
+        return frame.copy() if self.source.reuses_buffers else frame
+
+    def read(self, timeout: float | None = None) -> np.ndarray:
+        """
+        Liefert den nächsten noch nicht abgeholten Frame (für genau einen Verbraucher: die Zählung).
+
+        Zwischenzeitlich aufgenommene Frames werden übersprungen – die Zählung arbeitet
+        immer auf dem aktuellsten Bild.
+
+        Args:
+            timeout (float | None): Maximale Wartezeit in Sekunden (0 = nicht blockierend).
+
+        Returns:
+            np.ndarray: Frame im BGR-Format.
+
+        Raises:
+            StopIteration: Wenn der Dienst gestoppt bzw. die Quelle erschöpft ist.
+            TimeoutError: Wenn innerhalb von `timeout` kein neuer Frame eintrifft.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > self._delivered_seq or not self._running.is_set(),
+                                       timeout):
+                raise TimeoutError("Kein neuer Frame von der Kamera.")
+            if self._seq <= self._delivered_seq:
+                if self.error is not None and not isinstance(self.error, StopIteration):
+                    raise self.error
+                raise StopIteration
+            self._delivered_seq = self._seq
+            return self._hand_out(self._frame)
+
+    def latest(self, timeout: float = 2.0) -> tuple[int, float, np.ndarray]:
+        """
+        Liefert eine Kopie des neuesten Frames, ohne die Zählung zu beeinflussen.
+
+        Args:
+            timeout (float): Maximale Wartezeit auf den ersten Frame in Sekunden.
+
+        Returns:
+            tuple: (Sequenznummer, Aufnahmezeitpunkt als Epoch-Sekunden, Frame).
+
+        Raises:
+            TimeoutError: Wenn noch kein Frame vorliegt.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frame is not None or not self._running.is_set(), timeout) \
+                    or self._frame is None:
+                raise TimeoutError("Noch kein Frame von der Kamera.")
+            return self._seq, self._captured_at, self._frame.copy()
+
+    # ── Standbilder ──
+    def snapshot(self, path: str) -> float:
+        """
+        Schreibt den neuesten Frame als JPEG (atomar per temporärer Datei + os.replace).
+
+        Args:
+            path (str): Zielpfad, z. B. static/last_config.jpg.
+
+        Returns:
+            float: Dauer in Millisekunden.
+        """
+        start = time.perf_counter()
+        _, _, frame = self.latest()
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise RuntimeError("JPEG-Kodierung fehlgeschlagen.")
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encoded.tobytes())
+        os.replace(tmp_path, path)
+
+        self.snapshots += 1
+        self.last_snapshot_ms = (time.perf_counter() - start) * 1000
+        return self.last_snapshot_ms
+
+    # ── Befehle ──
+    def register_commands(self, control: ControlServer) -> None:
+        """
+        Hängt PING und SNAPSHOT an den Steuer-Socket.
+
+        Args:
+            control (ControlServer): Steuer-Socket der Zählung.
+        """
+        control.on("PING", lambda args: f"OK {self.describe()}")
+        control.on("SNAPSHOT", self._handle_snapshot)
+
+    def _handle_snapshot(self, args: str) -> str:
+        """Socket-Befehl SNAPSHOT <Pfad>."""
+        if not args:
+            return "ERR Zielpfad fehlt"
+        return f"OK {self.snapshot(args):.1f}"
+
+    def describe(self) -> str:
+        """Kurzbeschreibung der Bildquelle für Log-Ausgaben."""
+        return self.source.describe()
@@ -1,47 +1,53 @@
 # backend/camera/capture_raw.py
 """
-Einfaches Aufnahmeskript für Einzelbilder mit Picamera2.
+Einfaches Aufnahmeskript für Einzelbilder.
 Speichert das Bild zur visuellen Konfiguration im Streamlit-Dashboard.
+
+Die Bildquelle ist austauschbar (`backend/camera/sources.py`): standardmäßig die
+Raspberry-Pi-Kamera, alternativ Videodatei, Bildverzeichnis oder synthetische Frames
+(`--source` bzw. Umgebungsvariable `EKSPAR_CAMERA_SOURCE`).
 """
 
 import os
+import sys
+import argparse
 import logging
-from picamera2 import Picamera2
 from PIL import Image
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.camera.sources import create_source, DEFAULT_SOURCE
+
 # ─── Logging Setup ──────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # ─── Pfad zum Ausgabebild ───────────────────────────────────────────────────────
 OUTPUT_PATH: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "static", "last_config.jpg"))
+FRAME_SIZE: tuple[int, int] = (1280, 720)  # 16:9 für volle Dashboard-Kompatibilität
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📷 Einzelbildaufnahme
 # ────────────────────────────────────────────────────────────────────────────────
-def main():
+def main(source_spec: str = DEFAULT_SOURCE):
     """
-    Nimmt ein Einzelbild mit der Raspberry Pi Kamera auf und speichert es im JPEG-Format
+    Nimmt ein Einzelbild mit der konfigurierten Bildquelle auf und speichert es im JPEG-Format
     zur späteren Anzeige im Konfigurationsmodus.
 
+    Args:
+        source_spec (str): "picamera2", "synthetic" oder Pfad zu Videodatei bzw. Bildverzeichnis.
+
     Output:
         static/last_config.jpg
     """
     try:
-        # Kamera initialisieren
-        picam2 = Picamera2()
-        picam2.configure(picam2.create_still_configuration(
-            main={"size": (1280, 720)}  # 16:9 für volle Dashboard-Kompatibilität
-        ))
-        picam2.start()
-
-        # Aufnahme
-        frame = picam2.capture_array()
-        picam2.close()
-
-        # Speichern
-        image = Image.fromarray(frame)
+        # Quelle initialisieren (Kamera: Standbild-Konfiguration)
+        source = create_source(source_spec, *FRAME_SIZE, still=True)
+        with source:
+            frame = source.read()
+
+        # Speichern (Quellen liefern BGR, PIL erwartet RGB)
+        image = Image.fromarray(frame[..., ::-1])
         image.save(OUTPUT_PATH)
-        logging.info(f"[OK] Bild gespeichert: {OUTPUT_PATH}")
+        logging.info(f"[OK] Bild gespeichert: {OUTPUT_PATH} ({source.describe()})")
 
         # Wichtig für Erfolgserkennung im Subprozess-Aufrufer
         print("[OK]")
@@ -52,4 +58,6 @@ def main():
 
 # ─── Entry Point ────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Einzelbild für den Konfigurationsmodus aufnehmen")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="Bildquelle (Standard: EKSPAR_CAMERA_SOURCE)")
+    main(parser.parse_args().source)
@@ -0,0 +1,470 @@
+# backend/camera/sources.py – Austauschbare Bildquellen für Zählung, Konfiguration & Benchmarks
+"""
+Einheitliche Schnittstelle für alle Bildquellen des EKSPAR-Systems.
+
+Implementierungen:
+- `Picamera2Source`:  Raspberry-Pi-Kamera über picamera2/libcamera
+- `VideoFileSource`:  Videodatei über OpenCV
+- `ImageDirSource`:   Verzeichnis mit Einzelbildern
+- `SyntheticSource`:  Generierte Frames mit bewegten Rechtecken (Lasttests ohne Kamera)
+
+Alle Quellen liefern Frames im BGR-Format (OpenCV-Konvention) in der
+konfigurierten Auflösung. Dateibasierte Quellen schreiben in einen kleinen Ring
+vorab allokierter Puffer, ein Frame bleibt also für `num_buffers - 1` weitere
+Aufrufe von `read()` gültig. Optional wird in Echtzeit getaktet (`realtime`);
+mit `drop_late` werden verspätete Frames wie bei einer Live-Kamera verworfen.
+
+Die Standardquelle kann über die Umgebungsvariable `EKSPAR_CAMERA_SOURCE`
+gesetzt werden ("picamera2", "synthetic" oder Pfad zu Video/Bildverzeichnis).
+
+Abhängigkeiten (picamera2, OpenCV) werden erst beim Erzeugen der jeweiligen
+Quelle importiert, damit das Modul auch mit dem System-Python ohne OpenCV bzw.
+auf Rechnern ohne libcamera nutzbar ist.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import abc
+import os
+import time
+
+import numpy as np
+
+# ─── Konstanten ────────────────────────────────────────────────────────────────
+DEFAULT_SOURCE = os.environ.get("EKSPAR_CAMERA_SOURCE", "picamera2")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📷 Basisklasse
+# ────────────────────────────────────────────────────────────────────────────────
+class CameraSource(abc.ABC):
+    """
+    Gemeinsame Schnittstelle aller Bildquellen.
+
+    Abstrakt: Unterklassen müssen `_grab()` implementieren, sonst schlägt bereits
+    das Erzeugen der Quelle fehl (nicht erst der erste Frame).
+
+    Args:
+        width (int | None): Ausgabebreite in Pixeln (None = native Auflösung der Quelle).
+        height (int | None): Ausgabehöhe in Pixeln (None = native Auflösung der Quelle).
+        fps (float | None): Bildrate für die Taktung (None = Rate der Quelle).
+        realtime (bool): Frames im Takt von `fps` ausliefern statt so schnell wie möglich.
+        drop_late (bool): Im Echtzeitmodus verspätete Frames überspringen (wie eine Live-Kamera).
+        max_frames (int | None): Optionale Obergrenze gelieferter Frames.
+        num_buffers (int): Anzahl wiederverwendeter Ausgabepuffer.
+
+    Attributes:
+        frames_read (int): Anzahl gelieferter Frames.
+        frames_skipped (int): Anzahl im Echtzeitmodus verworfener Frames.
+        last_read_s (float): Dauer des letzten Lesevorgangs ohne Wartezeit der Taktung.
+        reuses_buffers (bool): True, wenn gelieferte Frames später überschrieben werden (Ringpuffer).
+    """
+
+    name = "base"
+    reuses_buffers = True
+
+    def __init__(
+        self,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float | None = None,
+        realtime: bool = False,
+        drop_late: bool = False,
+        max_frames: int | None = None,
+        num_buffers: int = 4,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.drop_late = drop_late
+        self.max_frames = max_frames
+        self.num_buffers = max(1, num_buffers)
+
+        self.frames_read = 0
+        self.frames_skipped = 0
+        self.last_read_s = 0.0
+
+        self._buffers: list[np.ndarray] = []
+        self._buffer_index = 0
+        self._started_at: float | None = None
+        self._frame_index = 0
+
+    # ── Lebenszyklus ──
+    def start(self) -> None:
+        """Öffnet die Quelle (Standard: nichts zu tun)."""
+
+    def stop(self) -> None:
+        """Gibt die Quelle frei (Standard: nichts zu tun)."""
+
+    def __enter__(self) -> "CameraSource":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── Lesen ──
+    def read(self) -> np.ndarray:
+        """
+        Liefert den nächsten Frame (im Echtzeitmodus den zeitlich fälligen).
+
+        Returns:
+            np.ndarray: Frame (H, W, 3) im BGR-Format.
+
+        Raises:
+            StopIteration: Wenn die Quelle erschöpft ist.
+        """
+        if self.max_frames is not None and self.frames_read >= self.max_frames:
+            raise StopIteration
+        if self.realtime and self.fps:
+            self._pace()
+
+        start = time.perf_counter()
+        frame = self._grab()
+        if frame is None:
+            raise StopIteration
+        self.last_read_s = time.perf_counter() - start
+        self._frame_index += 1
+        self.frames_read += 1
+        return frame
+
+    @abc.abstractmethod
+    def _grab(self) -> np.ndarray | None:
+        """Liest den nächsten Frame ohne Taktung; None = Quelle erschöpft."""
+
+    def _skip(self) -> bool:
+        """Verwirft einen Frame; Unterklassen können das Dekodieren einsparen."""
+        return self._grab() is not None
+
+    def _pace(self) -> None:
+        """Wartet bis zum Zeitpunkt des nächsten Frames bzw. überspringt verpasste Frames."""
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now - self._frame_index / self.fps
+        if self.drop_late:
+            due = int((now - self._started_at) * self.fps)
+            while self._frame_index < due:
+                if not self._skip():
+                    return  # Erschöpft – der folgende Lesevorgang meldet StopIteration
+                self._frame_index += 1
+                self.frames_skipped += 1
+        wait = self._started_at + self._frame_index / self.fps - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+    # ── Puffer ──
+    def _next_buffer(self, height: int, width: int) -> np.ndarray:
+        """
+        Gibt den nächsten Ausgabepuffer aus dem Ring zurück (bei Größenwechsel neu allokiert).
+
+        Args:
+            height (int): Bildhöhe in Pixeln.
+            width (int): Bildbreite in Pixeln.
+
+        Returns:
+            np.ndarray: Puffer (height, width, 3) als uint8.
+        """
+        if not self._buffers or self._buffers[0].shape[:2] != (height, width):
+            self._buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self.num_buffers)]
+            self._buffer_index = 0
+        buffer = self._buffers[self._buffer_index]
+        self._buffer_index = (self._buffer_index + 1) % self.num_buffers
+        return buffer
+
+    def _fit(self, frame: np.ndarray) -> np.ndarray:
+        """Skaliert einen Frame auf die konfigurierte Auflösung in den nächsten Ringpuffer."""
+        if self.width is None or self.height is None or frame.shape[:2] == (self.height, self.width):
+            return frame
+        import cv2
+        return cv2.resize(frame, (self.width, self.height), dst=self._next_buffer(self.height, self.width),
+                          interpolation=cv2.INTER_AREA)
+
+    def describe(self) -> str:
+        """Kurzbeschreibung für Log-Ausgaben."""
+        size = f"{self.width}x{self.height}" if self.width and self.height else "nativ"
+        return f"{self.name} ({size}, {self.fps or '–'} FPS)"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🍓 Raspberry-Pi-Kamera
+# ────────────────────────────────────────────────────────────────────────────────
+class Picamera2Source(CameraSource):
+    """
+    Raspberry-Pi-Kamera über picamera2.
+
+    Die Kamera taktet selbst; picamera2 verwaltet die DMA-Puffer (`buffer_count`).
+    Mit `still=True` wird eine Standbild-Konfiguration verwendet (Konfigurationsbild).
+
+    Args:
+        width (int): Ausgabebreite in Pixeln.
+        height (int): Ausgabehöhe in Pixeln.
+        fps (float | None): Ziel-Bildrate des Sensors (None = Standard der Kamera).
+        still (bool): Standbild- statt Vorschau-Konfiguration.
+        camera_num (int): Index der Kamera bei mehreren angeschlossenen Kameras (Pi 5: 0 oder 1).
+        **kwargs: Weitere Argumente für CameraSource (z. B. `num_buffers`).
+    """
+
+    name = "picamera2"
+    reuses_buffers = False  # capture_array() liefert jeweils ein neues Array
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float | None = None,
+                 still: bool = False, camera_num: int = 0, **kwargs) -> None:
+        kwargs["realtime"] = False  # Sensor liefert bereits im Takt
+        super().__init__(width, height, fps, **kwargs)
+        self.still = still
+        self.camera_num = camera_num
+        self._picam2 = None
+
+    def start(self) -> None:
+        """Initialisiert und startet die Kamera."""
+        from picamera2 import Picamera2  # Erst hier: Modul ist auch ohne libcamera importierbar
+
+        picam2 = Picamera2(self.camera_num)
+        controls = {"FrameRate": self.fps} if self.fps else {}
+        if self.still:
+            # "RGB888" liefert BGR-geordnete Arrays (OpenCV-Konvention)
+            config = picam2.create_still_configuration(
+                main={"size": (self.width, self.height), "format": "RGB888"}, controls=controls
+            )
+            picam2.configure(config)
+        else:
+            picam2.preview_configuration.main.size = (self.width, self.height)
+            picam2.preview_configuration.main.format = "RGB888"
+            picam2.preview_configuration.buffer_count = self.num_buffers
+            for name, value in controls.items():
+                setattr(picam2.preview_configuration.controls, name, value)
+            picam2.preview_configuration.align()
+            picam2.configure("preview")
+        picam2.start()
+        self._picam2 = picam2
+
+    def _grab(self) -> np.ndarray:
+        return self._picam2.capture_array()
+
+    def stop(self) -> None:
+        """Stoppt und schließt die Kamera."""
+        if self._picam2 is not None:
+            self._picam2.stop()
+            self._picam2.close()
+            self._picam2 = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎞 Videodatei
+# ────────────────────────────────────────────────────────────────────────────────
+class VideoFileSource(CameraSource):
+    """
+    Videodatei über OpenCV, dekodiert direkt in wiederverwendete Puffer.
+
+    Args:
+        path (str): Pfad zur Videodatei.
+        loop (bool): Am Dateiende von vorne beginnen.
+        **kwargs: Argumente für CameraSource (Auflösung, FPS, Taktung).
+    """
+
+    name = "video"
+
+    def __init__(self, path: str, loop: bool = False, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self.loop = loop
+        self._cap = None
+
+    def start(self) -> None:
+        """Öffnet die Videodatei; ohne FPS-Vorgabe wird die Rate des Videos übernommen."""
+        import cv2
+        self._cap = cv2.VideoCapture(self.path)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Video konnte nicht geöffnet werden: {self.path}")
+        if not self.fps:
+            self.fps = self._cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        # Bei abweichender Zielauflösung in einen festen Dekodierpuffer lesen und in den Ring skalieren
+        height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._native_shape = (height, width) if height and width else None
+        self._decode_buffer = None
+        if self._native_shape and self.width is not None and self._native_shape != (self.height, self.width):
+            self._decode_buffer = np.empty((height, width, 3), dtype=np.uint8)
+
+    def _read_raw(self) -> np.ndarray | None:
+        """Dekodiert den nächsten Frame; am Dateiende optional zurückspulen."""
+        if self._decode_buffer is not None:
+            target = self._decode_buffer
+        elif self._native_shape is not None:
+            target = self._next_buffer(*self._native_shape)
+        else:
+            target = None  # Größe unbekannt – OpenCV allokiert selbst
+
+        ok, frame = self._cap.read(target)
+        if not ok and self.loop:
+            import cv2
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read(target)
+        return frame if ok else None
+
+    def _grab(self) -> np.ndarray | None:
+        frame = self._read_raw()
+        return None if frame is None else self._fit(frame)
+
+    def _skip(self) -> bool:
+        if self._cap.grab():  # Ohne Dekodieren
+            return True
+        if self.loop:
+            import cv2
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            return self._cap.grab()
+        return False
+
+    def stop(self) -> None:
+        """Gibt die Videodatei frei."""
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def describe(self) -> str:
+        return f"{super().describe()} – {self.path}"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖼 Bildverzeichnis
+# ────────────────────────────────────────────────────────────────────────────────
+class ImageDirSource(CameraSource):
+    """
+    Verzeichnis mit Einzelbildern (alphabetisch sortiert).
+
+    Args:
+        path (str): Verzeichnis mit JPEG/PNG/BMP-Dateien.
+        loop (bool): Nach dem letzten Bild von vorne beginnen.
+        **kwargs: Argumente für CameraSource (Auflösung, FPS, Taktung); ohne FPS-Vorgabe 30 FPS.
+    """
+
+    name = "images"
+
+    def __init__(self, path: str, loop: bool = False, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self.loop = loop
+        self.fps = self.fps or 30.0
+        self._files: list[str] = []
+        self._position = 0
+
+    def start(self) -> None:
+        """Liest die Dateiliste ein."""
+        self._files = sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self._files:
+            raise RuntimeError(f"Keine Bilder gefunden: {self.path}")
+        self._position = 0
+
+    def _advance(self) -> str | None:
+        """Gibt den nächsten Dateipfad zurück (bzw. None am Ende ohne Schleife)."""
+        if self._position >= len(self._files):
+            if not self.loop:
+                return None
+            self._position = 0
+        path = self._files[self._position]
+        self._position += 1
+        return path
+
+    def _grab(self) -> np.ndarray | None:
+        import cv2
+        path = self._advance()
+        if path is None:
+            return None
+        frame = cv2.imread(path)
+        if frame is None:
+            raise RuntimeError(f"Bild konnte nicht gelesen werden: {path}")
+        return self._fit(frame)
+
+    def _skip(self) -> bool:
+        return self._advance() is not None  # Ohne Laden
+
+    def describe(self) -> str:
+        return f"{super().describe()} – {self.path}"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧪 Synthetische Frames
+# ────────────────────────────────────────────────────────────────────────────────
+class SyntheticSource(CameraSource):
+    """
+    Erzeugt Frames mit Rechtecken, die sich horizontal durchs Bild bewegen.
+
+    Gedacht für Last- und Durchsatztests ohne Kamera und ohne Testmaterial;
+    die Frames werden in die Ringpuffer gezeichnet (keine Allokation pro Frame).
+
+    Args:
+        width (int): Bildbreite in Pixeln.
+        height (int): Bildhöhe in Pixeln.
+        fps (float): Bildrate für die Taktung.
+        num_objects (int): Anzahl bewegter Rechtecke.
+        speed (int): Bewegung pro Frame in Pixeln.
+        **kwargs: Weitere Argumente für CameraSource.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 15.0,
+                 num_objects: int = 2, speed: int = 8, **kwargs) -> None:
+        super().__init__(width, height, fps, **kwargs)
+        self.num_objects = num_objects
+        self.speed = speed
+        self._background: np.ndarray | None = None
+
+    def start(self) -> None:
+        """Erzeugt den Hintergrund (vertikaler Grauverlauf)."""
+        ramp = np.linspace(60, 140, self.height, dtype=np.uint8)
+        self._background = np.repeat(ramp[:, None, None], self.width, axis=1).repeat(3, axis=2)
+
+    def _grab(self) -> np.ndarray:
+        frame = self._next_buffer(self.height, self.width)
+        np.copyto(frame, self._background)
+
+        obj_w, obj_h = max(8, self.width // 16), max(16, self.height // 3)
+        lane = self.height // max(1, self.num_objects)
+        period = self.width + obj_w
+        for i in range(self.num_objects):
+            x1 = (self._frame_index * self.speed + i * period // max(1, self.num_objects)) % period - obj_w
+            y1 = min(i * lane + (lane - obj_h) // 2, self.height - obj_h)
+            frame[max(0, y1):y1 + obj_h, max(0, x1):max(0, x1 + obj_w)] = ((40 + 60 * i) % 200, 80, 200)
+        return frame
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏭 Fabrik
+# ────────────────────────────────────────────────────────────────────────────────
+def create_source(spec: str | None = None, width: int | None = 1280, height: int | None = 720,
+                  fps: float | None = None, **kwargs) -> CameraSource:
+    """
+    Erzeugt eine Bildquelle anhand einer Kurzbeschreibung.
+
+    Args:
+        spec (str | None): "picamera2" (bzw. "picamera2:<Index>"), "synthetic" oder Pfad zu Videodatei
+            bzw. Bildverzeichnis (None = DEFAULT_SOURCE bzw. Umgebungsvariable EKSPAR_CAMERA_SOURCE).
+        width (int | None): Ausgabebreite in Pixeln.
+        height (int | None): Ausgabehöhe in Pixeln.
+        fps (float | None): Bildrate.
+        **kwargs: Weitere Argumente der jeweiligen Quelle (z. B. `realtime`, `loop`, `still`).
+
+    Returns:
+        CameraSource: Noch nicht gestartete Quelle.
+
+    Raises:
+        ValueError: Wenn die Quelle unbekannt ist bzw. der Pfad nicht existiert.
+    """
+    spec = spec or DEFAULT_SOURCE
+    if spec == "picamera2" or spec.startswith("picamera2:"):
+        camera_num = int(spec.partition(":")[2] or 0)
+        return Picamera2Source(width, height, fps, camera_num=camera_num, **kwargs)
+    kwargs.pop("still", None)  # Nur für die Kamera relevant
+    if spec == "synthetic":
+        return SyntheticSource(width or 1280, height or 720, fps or 15.0, **kwargs)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, width=width, height=height, fps=fps, **kwargs)
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, width=width, height=height, fps=fps, **kwargs)
+    raise ValueError(f"Unbekannte Kameraquelle: {spec}")
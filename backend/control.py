@@ -0,0 +1,265 @@
+# backend/control.py – Steuerkanal zwischen Starter, Dashboard und Zählung
+"""
+Ereignisgesteuerte Modusumschaltung statt Polling der Lock-Datei.
+
+- `ControlServer`: Unix-Socket mit zeilenbasierten Textbefehlen ("BEFEHL argumente"
+  → "OK ..." bzw. "ERR ..."). Die Zählung (`data/camera.sock`) und der Starter
+  `ekspar.py` (`data/ekspar.sock`) betreiben je einen Server.
+- `send_command()`: Client für eine einzelne Befehlszeile.
+- `switch_mode()`: Schreibt den Modus in `camera.lock` und schiebt ihn sofort an
+  Zählung und Starter.
+- `ModeState`: Hält den Modus im Speicher (per Befehl gesetzt). Die Lock-Datei
+  dient nur noch als Fallback und wird höchstens alle `poll_interval` Sekunden
+  per `os.stat` auf Änderungen geprüft.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Callable
+
+# ─── Pfade ─────────────────────────────────────────────────────────────────────
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LOCK_PATH = os.path.join(PROJECT_DIR, "camera.lock")
+COUNTER_SOCKET_PATH = os.path.join(PROJECT_DIR, "data", "camera.sock")
+LAUNCHER_SOCKET_PATH = os.path.join(PROJECT_DIR, "data", "ekspar.sock")
+
+MODES = ("counting", "config")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔒 Lock-Datei (Fallback & persistenter Zustand)
+# ────────────────────────────────────────────────────────────────────────────────
+def read_lock(path: str = LOCK_PATH) -> str | None:
+    """
+    Liest den Modus aus der Lock-Datei.
+
+    Args:
+        path (str): Pfad zur Lock-Datei.
+
+    Returns:
+        str | None: 'config', 'counting' oder None (nicht gesetzt).
+    """
+    try:
+        with open(path, "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_lock(mode: str | None, path: str = LOCK_PATH) -> None:
+    """
+    Schreibt den Modus atomar in die Lock-Datei (None entfernt sie).
+
+    Args:
+        mode (str | None): 'config', 'counting' oder None.
+        path (str): Pfad zur Lock-Datei.
+    """
+    if mode is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(mode)
+    os.replace(tmp_path, path)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Socket-Server
+# ────────────────────────────────────────────────────────────────────────────────
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Liest eine Befehlszeile und antwortet mit einer Zeile."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline().decode("utf-8", errors="replace").strip()
+        if not line:
+            return
+        reply = self.server.control.handle_command(line)
+        self.wfile.write((reply + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    Unix-Socket-Server für zeilenbasierte Befehle.
+
+    Args:
+        socket_path (str): Pfad des Sockets (eine verwaiste Socket-Datei wird ersetzt).
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        self._handlers: dict[str, Callable[[str], str]] = {}
+        self._server: _UnixServer | None = None
+        self.on("PING", lambda args: "OK")
+
+    def on(self, command: str, handler: Callable[[str], str]) -> None:
+        """
+        Registriert einen Befehl.
+
+        Args:
+            command (str): Befehlsname, z. B. "MODE" (Groß-/Kleinschreibung egal).
+            handler (Callable[[str], str]): Erhält die Argumente der Zeile und liefert die Antwortzeile.
+        """
+        self._handlers[command.upper()] = handler
+
+    def handle_command(self, line: str) -> str:
+        """
+        Führt eine Befehlszeile aus.
+
+        Args:
+            line (str): Befehl und optionale Argumente.
+
+        Returns:
+            str: Antwortzeile ("OK ..." bzw. "ERR ...").
+        """
+        command, _, args = line.partition(" ")
+        handler = self._handlers.get(command.upper())
+        if handler is None:
+            return f"ERR Unbekannter Befehl: {command}"
+        try:
+            return handler(args.strip())
+        except Exception as e:
+            return f"ERR {e}"
+
+    def start(self) -> None:
+        """Öffnet den Socket und bedient ihn in einem Hintergrund-Thread."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _UnixServer(self.socket_path, _CommandHandler)
+        self._server.control = self
+        threading.Thread(target=self._server.serve_forever, name="ekspar-control", daemon=True).start()
+
+    def stop(self) -> None:
+        """Schließt den Socket und entfernt die Socket-Datei."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📨 Client
+# ────────────────────────────────────────────────────────────────────────────────
+def send_command(socket_path: str, command: str, timeout: float = 3.0) -> str | None:
+    """
+    Sendet eine Befehlszeile und wartet auf die Antwort.
+
+    Args:
+        socket_path (str): Pfad des Ziel-Sockets.
+        command (str): Befehlszeile, z. B. "MODE counting".
+        timeout (float): Maximale Wartezeit in Sekunden.
+
+    Returns:
+        str | None: Antwortzeile oder None, falls niemand lauscht.
+    """
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall((command + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as reply:
+                return reply.readline().strip()
+    except OSError:
+        return None
+
+
+def switch_mode(mode: str | None, lock_path: str = LOCK_PATH) -> None:
+    """
+    Setzt den Kameramodus: Lock-Datei (Fallback) schreiben, dann Zählung und Starter benachrichtigen.
+
+    Args:
+        mode (str | None): 'config', 'counting' oder None (kein Modus, z. B. nach Zurücksetzen).
+        lock_path (str): Pfad zur Lock-Datei.
+    """
+    write_lock(mode, lock_path)
+    command = f"MODE {mode or 'none'}"
+    send_command(COUNTER_SOCKET_PATH, command)
+    send_command(LAUNCHER_SOCKET_PATH, command)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎛 Modus im Speicher
+# ────────────────────────────────────────────────────────────────────────────────
+class ModeState:
+    """
+    Aktueller Kameramodus, per Befehl gesetzt, mit Lock-Datei als Fallback.
+
+    `current()` kostet im Normalfall nur einen Zeitvergleich; die Lock-Datei wird
+    höchstens alle `poll_interval` Sekunden per `os.stat` geprüft und nur bei
+    geänderter Änderungszeit neu gelesen.
+
+    Args:
+        lock_path (str): Pfad zur Lock-Datei.
+        poll_interval (float): Mindestabstand zwischen zwei Prüfungen der Lock-Datei in Sekunden.
+    """
+
+    def __init__(self, lock_path: str = LOCK_PATH, poll_interval: float = 2.0) -> None:
+        self.lock_path = lock_path
+        self.poll_interval = poll_interval
+        self.changed = threading.Event()
+        self._mode: str | None = None
+        self._lock_mtime: int | None = None
+        self._last_poll = 0.0
+        self._poll_lock_file()
+
+    def _poll_lock_file(self) -> None:
+        """Liest die Lock-Datei neu, falls sie sich seit der letzten Prüfung geändert hat."""
+        self._last_poll = time.monotonic()
+        try:
+            mtime = os.stat(self.lock_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._lock_mtime:
+            self._lock_mtime = mtime
+            mode = read_lock(self.lock_path)
+            if mode != self._mode:
+                self._mode = mode
+                self.changed.set()
+
+    def set(self, mode: str | None) -> None:
+        """
+        Setzt den Modus (per Socket-Befehl).
+
+        Args:
+            mode (str | None): 'config', 'counting' oder None.
+        """
+        if mode not in MODES:
+            mode = None
+        self._mode = mode
+        self.changed.set()
+
+    def current(self) -> str | None:
+        """Liefert den aktuellen Modus (Lock-Datei nur im Fallback-Intervall geprüft)."""
+        if time.monotonic() - self._last_poll >= self.poll_interval:
+            self._poll_lock_file()
+        return self._mode
+
+    def handle_command(self, args: str) -> str:
+        """
+        Socket-Befehl MODE <counting|config|none>.
+
+        Args:
+            args (str): Neuer Modus.
+
+        Returns:
+            str: Antwortzeile.
+        """
+        mode = args.strip().lower() or None
+        if mode not in MODES and mode != "none":
+            return f"ERR Unbekannter Modus: {args}"
+        self.set(None if mode == "none" else mode)
+        return f"OK {self._mode or 'none'}"
@@ -0,0 +1,120 @@
+# backend/detection/motion_gate.py – Bewegungsfilter vor der Inferenz
+"""
+Überspringt YOLO-Inferenz und Tracking auf statischen Frames.
+
+Der aktuelle Frame wird (optional nur im Zählbereich) stark verkleinert, in
+Graustufen umgewandelt und mit dem zuletzt verarbeiteten Frame verglichen.
+Ändert sich kein nennenswerter Anteil der Pixel, kann die Inferenz entfallen.
+Spätestens nach einer maximalen Anzahl Frames bzw. Sekunden wird trotzdem
+wieder verarbeitet.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import time
+
+import cv2
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎚 MotionGate
+# ────────────────────────────────────────────────────────────────────────────────
+class MotionGate:
+    """
+    Günstige Bewegungserkennung per Differenzbild auf verkleinerten Frames.
+
+    Args:
+        downscale (int): Verkleinerungsfaktor je Achse (8 → 1280x720 wird 160x90).
+        pixel_threshold (int): Minimale Grauwertdifferenz, ab der ein Pixel als verändert gilt.
+        area_threshold (float): Anteil veränderter Pixel (0–1), ab dem Bewegung vorliegt.
+        max_skip_frames (int): Spätestens nach so vielen übersprungenen Frames wird verarbeitet.
+        max_skip_seconds (float): Spätestens nach so vielen Sekunden wird verarbeitet.
+        region (tuple[int, int, int, int] | None): Optional nur diesen Ausschnitt (x1, y1, x2, y2) prüfen.
+    """
+
+    def __init__(
+        self,
+        downscale: int = 8,
+        pixel_threshold: int = 25,
+        area_threshold: float = 0.002,
+        max_skip_frames: int = 30,
+        max_skip_seconds: float = 1.0,
+        region: tuple[int, int, int, int] | None = None,
+    ) -> None:
+        self.downscale = max(1, downscale)
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.max_skip_frames = max_skip_frames
+        self.max_skip_seconds = max_skip_seconds
+        self.region = region
+
+        self.processed = 0
+        self.skipped = 0
+
+        self._reference = None
+        self._skipped_in_row = 0
+        self._last_processed_at = 0.0
+
+    def _prepare(self, frame):
+        """Schneidet den Prüfbereich aus, verkleinert ihn und wandelt ihn in Graustufen um."""
+        if self.region is not None:
+            x1, y1, x2, y2 = self.region
+            frame = frame[y1:y2, x1:x2]
+        h, w = frame.shape[:2]
+        size = (max(1, w // self.downscale), max(1, h // self.downscale))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def should_process(self, frame) -> bool:
+        """
+        Entscheidet, ob der Frame durch Inferenz und Tracking laufen muss.
+
+        Verglichen wird immer mit dem zuletzt verarbeiteten Frame, damit sich auch
+        langsame Bewegungen über mehrere Frames aufsummieren.
+
+        Args:
+            frame: Kameraframe als NumPy-Array (BGR oder Graustufen).
+
+        Returns:
+            bool: True bei Bewegung, beim ersten Frame oder nach Ablauf des Skip-Limits.
+        """
+        small = self._prepare(frame)
+        now = time.monotonic()
+
+        if (
+            self._reference is None
+            or self._reference.shape != small.shape
+            or self._skipped_in_row >= self.max_skip_frames
+            or now - self._last_processed_at >= self.max_skip_seconds
+        ):
+            motion = True
+        else:
+            diff = cv2.absdiff(small, self._reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+            motion = changed >= self.area_threshold * small.size
+
+        if motion:
+            self._reference = small
+            self._skipped_in_row = 0
+            self._last_processed_at = now
+            self.processed += 1
+        else:
+            self._skipped_in_row += 1
+            self.skipped += 1
+        return motion
+
+    def reset(self, region: tuple[int, int, int, int] | None = None) -> None:
+        """
+        Verwirft den Referenzframe (z. B. nach geändertem Zählbereich), der nächste Frame wird verarbeitet.
+
+        Args:
+            region (tuple[int, int, int, int] | None): Neuer Prüfbereich (x1, y1, x2, y2) oder None = ganzer Frame.
+        """
+        self.region = region
+        self._reference = None
+        self._skipped_in_row = 0
+
+    def format_stats(self) -> str:
+        """Formatiert verarbeitete und übersprungene Frames als einzeilige Log-Ausgabe."""
+        total = self.processed + self.skipped
+        share = self.skipped / total * 100 if total else 0.0
+        return f"Bewegungsfilter: {self.processed} verarbeitet, {self.skipped} übersprungen ({share:.0f}%)"
@@ -0,0 +1,196 @@
+# backend/detection/multi_camera.py – Mehrere Kameras mit gemeinsamem Detektor
+"""
+Bausteine für den Mehrkamerabetrieb in einem Zählprozess.
+
+- Kameraliste aus `backend/config/cameras.json` (je Eintrag Quelle, Zählbereich, Richtung)
+- Ein einziger geladener Detektor für alle Kameras: Die Frames aller Kameras mit
+  neuem Bild werden gemeinsam als Batch (ultralytics) bzw. direkt nacheinander
+  (NCNN) durch das Modell geschickt
+- Je Kamera ein eigener ObjectCounter mit eigenem ByteTrack, eigenem Bewegungsfilter
+  und eigenen Zählerständen
+
+Format von `cameras.json`:
+
+    [
+        {"id": "eingang-nord", "source": "picamera2:0"},
+        {"id": "eingang-sued", "source": "picamera2:1",
+         "bbox": {"x": 400, "y": 120, "w": 300, "h": 420}, "angle": 180}
+    ]
+
+Fehlen `bbox` bzw. `angle`, gelten die im Dashboard gespeicherten Dateien
+(`bbox_config.json`, `direction_config.json`).
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import json
+import os
+import time
+
+import numpy as np
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📄 Kameraliste
+# ────────────────────────────────────────────────────────────────────────────────
+def load_camera_specs(path: str) -> list[dict] | None:
+    """
+    Lädt die Kameraliste.
+
+    Args:
+        path (str): Pfad zu `cameras.json`.
+
+    Returns:
+        list[dict] | None: Einträge mit mindestens 'id' und 'source'; None, wenn die Datei fehlt oder ungültig ist.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            specs = json.load(f)
+    except Exception as e:
+        print(f"[ERROR] Fehler beim Laden der Kameraliste {path}: {e}")
+        return None
+
+    valid = []
+    for index, spec in enumerate(specs if isinstance(specs, list) else []):
+        if not isinstance(spec, dict) or "source" not in spec:
+            print(f"[WARN] Kamera-Eintrag {index} ohne 'source' wird ignoriert.")
+            continue
+        spec.setdefault("id", f"kamera-{index + 1}")
+        valid.append(spec)
+
+    ids = [spec["id"] for spec in valid]
+    if len(set(ids)) != len(ids):
+        print(f"[ERROR] Kamera-IDs in {path} sind nicht eindeutig: {ids}")
+        return None
+    return valid or None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Gemeinsamer Detektor
+# ────────────────────────────────────────────────────────────────────────────────
+class UltralyticsDetector:
+    """
+    Detektor auf Basis eines geladenen ultralytics-YOLO-Modells (nur Erkennung, ohne Tracker).
+
+    Das Tracking übernimmt der ByteTrack des jeweiligen ObjectCounters, sodass sich
+    mehrere Kameras ein Modell teilen können, ohne dass sich ihre Tracks mischen.
+
+    Args:
+        model: Geladenes `ultralytics.YOLO`-Modell.
+        classes (tuple[int, ...] | None): Zu behaltende Klassen (Standard: nur Personen).
+        conf (float | None): Konfidenzschwelle (None = ultralytics-Standard).
+        iou (float | None): IoU-Schwelle der NMS (None = ultralytics-Standard).
+        imgsz (int | None): Eingabegröße des Modells (None = Standard des Modells).
+    """
+
+    def __init__(self, model, classes: tuple[int, ...] | None = (0,), conf: float | None = None,
+                 iou: float | None = None, imgsz: int | None = None) -> None:
+        self.model = model
+        self.predict_args = {"classes": list(classes) if classes is not None else None, "verbose": False}
+        for key, value in (("conf", conf), ("iou", iou), ("imgsz", imgsz)):
+            if value is not None:
+                self.predict_args[key] = value
+        self.speed: dict = {}
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list:
+        """
+        Führt die Erkennung für mehrere Frames in einem Modellaufruf aus.
+
+        Args:
+            frames (list[np.ndarray]): BGR-Frames (dürfen unterschiedlich groß sein, z. B. ROI-Ausschnitte).
+
+        Returns:
+            list: Je Frame ein `Boxes`-Objekt (NumPy) mit `xyxy`, `xywh`, `conf` und `cls` für den BYTETracker.
+        """
+        results = self.model.predict(frames, **self.predict_args)
+        # Results.speed enthält ms pro Bild, hier als Summe über den Batch
+        self.speed = {k: v * len(frames) for k, v in (results[0].speed if results else {}).items()}
+        return [r.boxes.cpu().numpy() for r in results]
+
+    def detect(self, frame: np.ndarray):
+        """
+        Führt die Erkennung für einen Frame aus.
+
+        Args:
+            frame (np.ndarray): BGR-Frame.
+
+        Returns:
+            Boxes: Detektionen des Frames.
+        """
+        return self.detect_batch([frame])[0]
+
+
+def detect_batch(detector, frames: list[np.ndarray]) -> tuple[list, dict]:
+    """
+    Erkennung für die Frames mehrerer Kameras mit einem gemeinsamen Detektor.
+
+    Detektoren mit `detect_batch()` erhalten alle Frames in einem Aufruf; andere
+    (z. B. NcnnDetector mit einem Extractor pro Bild) werden direkt nacheinander
+    aufgerufen.
+
+    Args:
+        detector: Detektor mit `detect()` und optional `detect_batch()` sowie `speed`.
+        frames (list[np.ndarray]): Eingabebilder (Vollbild oder ROI-Ausschnitt je Kamera).
+
+    Returns:
+        tuple[list, dict]: Detektionen je Frame und die über alle Frames summierte `speed` (ms je Stufe).
+    """
+    if hasattr(detector, "detect_batch"):
+        detections = detector.detect_batch(frames)
+        return detections, dict(detector.speed)
+
+    detections, speed = [], {}
+    for frame in frames:
+        detections.append(detector.detect(frame))
+        for key, value in (getattr(detector, "speed", None) or {}).items():
+            speed[key] = speed.get(key, 0.0) + value
+    return detections, speed
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📷 Kamerakanal
+# ────────────────────────────────────────────────────────────────────────────────
+class CameraChannel:
+    """
+    Zustand einer Kamera im Mehrkamerabetrieb.
+
+    Args:
+        camera_id (str): Kennung der Kamera (Spalte `camera` in log.db).
+        service: Gestarteter CameraService der Kamera.
+        counter: Eigener ObjectCounter (mit eigenem ByteTrack).
+        entry_angle (int): Eintrittsrichtung in Grad.
+        gate: Optionaler eigener Bewegungsfilter.
+    """
+
+    def __init__(self, camera_id: str, service, counter, entry_angle: int, gate=None) -> None:
+        self.camera_id = camera_id
+        self.service = service
+        self.counter = counter
+        self.entry_angle = entry_angle
+        self.gate = gate
+        self.results = None
+        self.frames = 0
+        self.last_frame_at = 0.0
+
+    def poll(self) -> np.ndarray | None:
+        """
+        Holt den neuesten Frame, falls seit dem letzten Aufruf ein neuer vorliegt (nicht blockierend).
+
+        Returns:
+            np.ndarray | None: Neuer Frame oder None.
+
+        Raises:
+            StopIteration: Wenn die Quelle der Kamera erschöpft ist.
+        """
+        try:
+            frame = self.service.read(timeout=0)
+        except TimeoutError:
+            return None
+        self.frames += 1
+        self.last_frame_at = time.monotonic()
+        return frame
+
+    def describe(self) -> str:
+        """Kurzbeschreibung für Log-Ausgaben."""
+        return f"{self.camera_id} ({self.service.describe()})"
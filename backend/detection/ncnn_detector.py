@@ -0,0 +1,277 @@
+# backend/detection/ncnn_detector.py – Native NCNN-Inferenz für YOLO11
+"""
+Personendetektor, der das exportierte YOLO11-NCNN-Modell direkt über `ncnn.Net`
+ausführt – ohne ultralytics-Predictor und ohne torch.
+
+Ablauf pro Frame:
+- Letterbox-Vorverarbeitung mit NumPy/OpenCV in vorab allokierte Puffer
+- NCNN-Extractor (konfigurierbare Threadanzahl, Light-Mode)
+- Vektorisierte Dekodierung der YOLO11-Ausgabe (4 + Klassen × Anker)
+- Klassenfilter (Standard: nur Klasse 0 = Person) und NMS in NumPy
+
+Die Ergebnisse werden als `Detections` zurückgegeben und können direkt an einen
+ultralytics-BYTETracker übergeben werden (Attribute `conf`, `xywh`, `cls`).
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import os
+import time
+
+import cv2
+import numpy as np
+import ncnn
+
+# ─── Konstanten ────────────────────────────────────────────────────────────────
+PAD_VALUE = 114  # Graufüllung wie bei ultralytics LetterBox
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Detektionsergebnis
+# ────────────────────────────────────────────────────────────────────────────────
+class Detections:
+    """
+    Detektionen eines Frames in Frame-Koordinaten.
+
+    Attributes:
+        xyxy (np.ndarray): Boxen (N, 4) als x1, y1, x2, y2.
+        conf (np.ndarray): Konfidenzen (N,).
+        cls (np.ndarray): Klassenindizes (N,).
+    """
+
+    __slots__ = ("xyxy", "conf", "cls")
+
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray) -> None:
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        """Erzeugt ein leeres Detektionsergebnis."""
+        return cls(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.float32))
+
+    @property
+    def xywh(self) -> np.ndarray:
+        """Boxen (N, 4) als Mittelpunkt x, y, Breite, Höhe (Format des BYTETrackers)."""
+        xywh = np.empty_like(self.xyxy)
+        xywh[:, :2] = (self.xyxy[:, :2] + self.xyxy[:, 2:]) / 2
+        xywh[:, 2:] = self.xyxy[:, 2:] - self.xyxy[:, :2]
+        return xywh
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧮 Non-Maximum Suppression
+# ────────────────────────────────────────────────────────────────────────────────
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float, max_det: int = 300) -> np.ndarray:
+    """
+    Greedy Non-Maximum Suppression in NumPy.
+
+    Args:
+        boxes (np.ndarray): Boxen (N, 4) als x1, y1, x2, y2.
+        scores (np.ndarray): Konfidenzen (N,).
+        iou_threshold (float): Boxen mit höherer Überlappung werden verworfen.
+        max_det (int): Maximale Anzahl zurückgegebener Boxen.
+
+    Returns:
+        np.ndarray: Indizes der behaltenen Boxen, absteigend nach Konfidenz.
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 NcnnDetector
+# ────────────────────────────────────────────────────────────────────────────────
+class NcnnDetector:
+    """
+    YOLO11-Detektor auf Basis von `ncnn.Net`.
+
+    Args:
+        model_dir (str): Verzeichnis mit `model.ncnn.param` und `model.ncnn.bin`.
+        imgsz (int): Quadratische Eingabegröße des Modells.
+        num_threads (int): Anzahl NCNN-Threads.
+        light_mode (bool): Zwischenergebnisse im Extractor sofort freigeben.
+        conf (float): Minimale Konfidenz.
+        iou (float): IoU-Schwelle für die NMS.
+        classes (tuple[int, ...]): Zu behaltende Klassen (Standard: nur Personen).
+        max_det (int): Maximale Anzahl Detektionen pro Frame.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        imgsz: int = 640,
+        num_threads: int = 4,
+        light_mode: bool = True,
+        conf: float = 0.25,
+        iou: float = 0.7,
+        classes: tuple[int, ...] = (0,),
+        max_det: int = 300,
+    ) -> None:
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.classes = np.asarray(classes, dtype=np.int64)
+        self.max_det = max_det
+        self.light_mode = light_mode
+
+        # ── Netz laden ──
+        param_path = os.path.join(model_dir, "model.ncnn.param")
+        bin_path = os.path.join(model_dir, "model.ncnn.bin")
+        self.net = ncnn.Net()
+        self.net.opt.use_vulkan_compute = False
+        self.net.opt.num_threads = num_threads
+        self.net.opt.lightmode = light_mode
+        if self.net.load_param(param_path) != 0 or self.net.load_model(bin_path) != 0:
+            raise RuntimeError(f"NCNN-Modell konnte nicht geladen werden: {model_dir}")
+        self.input_name = self.net.input_names()[0]
+        self.output_name = sorted(self.net.output_names())[0]
+
+        # ── Vorab allokierte Puffer ──
+        self._input = np.full((3, imgsz, imgsz), PAD_VALUE / 255.0, dtype=np.float32)
+        self._resized: np.ndarray | None = None
+        self._src_shape: tuple[int, int] | None = None
+        self._scale = 1.0
+        self._pad = (0, 0)
+
+        # Laufzeiten des letzten Frames in ms (Format wie ultralytics `Results.speed`)
+        self.speed = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+
+    # ── Vorverarbeitung ──
+    def _prepare_buffers(self, height: int, width: int) -> None:
+        """Berechnet Skalierung und Rand für eine Framegröße und allokiert den Resize-Puffer."""
+        scale = min(self.imgsz / height, self.imgsz / width)
+        new_w, new_h = round(width * scale), round(height * scale)
+        left = (self.imgsz - new_w) // 2
+        top = (self.imgsz - new_h) // 2
+
+        self._input.fill(PAD_VALUE / 255.0)
+        self._resized = np.empty((new_h, new_w, 3), dtype=np.uint8)
+        self._src_shape = (height, width)
+        self._scale = scale
+        self._pad = (left, top)
+
+    def preprocess(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Letterbox: Frame (BGR, HWC, uint8) skalieren, zentrieren und als RGB/CHW/float32 ablegen.
+
+        Args:
+            frame (np.ndarray): Kameraframe im BGR-Format.
+
+        Returns:
+            np.ndarray: Eingabepuffer (3, imgsz, imgsz), wird beim nächsten Aufruf überschrieben.
+        """
+        height, width = frame.shape[:2]
+        if self._src_shape != (height, width):
+            self._prepare_buffers(height, width)
+
+        new_h, new_w = self._resized.shape[:2]
+        if (new_h, new_w) == (height, width):
+            self._resized[...] = frame
+        else:
+            cv2.resize(frame, (new_w, new_h), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+
+        left, top = self._pad
+        target = self._input[:, top:top + new_h, left:left + new_w]
+        np.multiply(self._resized[..., ::-1].transpose(2, 0, 1), np.float32(1 / 255.0), out=target)
+        return self._input
+
+    # ── Inferenz ──
+    def infer(self, blob: np.ndarray) -> np.ndarray:
+        """
+        Führt das Netz auf einem vorbereiteten Eingabepuffer aus.
+
+        Args:
+            blob (np.ndarray): Eingabe (3, imgsz, imgsz) als float32.
+
+        Returns:
+            np.ndarray: Rohausgabe (4 + Klassen, Anker).
+        """
+        with self.net.create_extractor() as ex:
+            ex.set_light_mode(self.light_mode)
+            ex.input(self.input_name, ncnn.Mat(blob))
+            _, out = ex.extract(self.output_name)
+            return np.array(out)
+
+    # ── Nachverarbeitung ──
+    def postprocess(self, output: np.ndarray) -> Detections:
+        """
+        Dekodiert die YOLO11-Ausgabe, filtert Klassen, führt NMS aus und rechnet in Frame-Koordinaten um.
+
+        Args:
+            output (np.ndarray): Rohausgabe (4 + Klassen, Anker) mit xywh in Eingabepixeln.
+
+        Returns:
+            Detections: Gefilterte Detektionen in Frame-Koordinaten.
+        """
+        class_scores = output[4 + self.classes]
+        if len(self.classes) == 1:
+            scores = class_scores[0]
+            cls_idx = np.full(scores.shape, self.classes[0])
+        else:
+            best = class_scores.argmax(axis=0)
+            scores = class_scores[best, np.arange(class_scores.shape[1])]
+            cls_idx = self.classes[best]
+
+        mask = scores > self.conf
+        if not mask.any():
+            return Detections.empty()
+
+        cx, cy, w, h = output[:4, mask]
+        boxes = np.stack((cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2), axis=1)
+        scores = scores[mask]
+        cls_idx = cls_idx[mask]
+
+        keep = nms(boxes, scores, self.iou, self.max_det)
+        boxes, scores, cls_idx = boxes[keep], scores[keep], cls_idx[keep]
+
+        # Letterbox rückgängig machen
+        left, top = self._pad
+        boxes[:, 0::2] = (boxes[:, 0::2] - left) / self._scale
+        boxes[:, 1::2] = (boxes[:, 1::2] - top) / self._scale
+        height, width = self._src_shape
+        np.clip(boxes[:, 0::2], 0, width, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, height, out=boxes[:, 1::2])
+
+        return Detections(boxes.astype(np.float32), scores.astype(np.float32), cls_idx.astype(np.float32))
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        """
+        Erkennt Objekte der konfigurierten Klassen in einem Frame.
+
+        Args:
+            frame (np.ndarray): Kameraframe im BGR-Format.
+
+        Returns:
+            Detections: Detektionen in Frame-Koordinaten.
+        """
+        t0 = time.perf_counter()
+        blob = self.preprocess(frame)
+        t1 = time.perf_counter()
+        output = self.infer(blob)
+        t2 = time.perf_counter()
+        detections = self.postprocess(output)
+        t3 = time.perf_counter()
+
+        self.speed = {
+            "preprocess": (t1 - t0) * 1000,
+            "inference": (t2 - t1) * 1000,
+            "postprocess": (t3 - t2) * 1000,
+        }
+        return detections
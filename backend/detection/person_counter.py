@@ -2,19 +2,35 @@
 """
 Startet die Live-Personenzählung mit Kamera und YOLOv11n.
 Verwendet den definierten Zählbereich (Bounding Box) und eine Eintrittsrichtung.
+Mit `backend/config/cameras.json` zählt ein Prozess mehrere Kameras mit einem
+gemeinsam geladenen Modell.
 """
 
 # ─── Imports ───────────────────────────────────────────────────────────────────
 import os
+import sys
 import time
+import signal
 import json
 import datetime
-import sqlite3
 import logging
-from picamera2 import Picamera2
-from ultralytics.solutions import ObjectCounter
+import threading
 import cv2  # Nur für Debug-Visualisierung
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.object_counter import ObjectCounter
+from backend.camera.sources import CameraSource, create_source, DEFAULT_SOURCE
+from backend.camera.camera_service import CameraService
+from backend.control import ControlServer, ModeState, COUNTER_SOCKET_PATH, LOCK_PATH as CONTROL_LOCK_PATH
+from backend.detection.pipeline import CountingPipeline
+from backend.detection.motion_gate import MotionGate
+from backend.detection.multi_camera import CameraChannel, UltralyticsDetector, detect_batch, load_camera_specs
+from backend.detection.stage_stats import StageStats
+from backend.detection.worker_pool import InferenceWorkerPool
+from backend.storage.log_writer import LogWriter
+from backend.storage.retention import RetentionJob
+from backend.storage.live_state import LiveStatePublisher
+
 # ─── Logging Setup (ultralytics Warnungen unterdrücken) ────────────────────────
 logging.getLogger("ultralytics").setLevel(logging.ERROR)
 logging.getLogger("yolo").setLevel(logging.ERROR)
@@ -26,29 +42,91 @@ os.environ["ULTRALYTICS_VERBOSE"] = "False"
 # ─── Konfiguration ─────────────────────────────────────────────────────────────
 # MODEL_PATH = "models/yolo11n.pt"          # PyTorch (3.1 FPS, 310ms)
 MODEL_PATH = "models/yolo11n_ncnn_model"    # NCNN (6.7 FPS, 150ms) ✅
+INFERENCE_ENGINE = "ultralytics"            # "ultralytics" = model.track(), "ncnn" = nativer NCNN-Detektor + ByteTrack
+NCNN_THREADS = 4                            # Threads des nativen NCNN-Extractors
+NCNN_LIGHT_MODE = True                      # Zwischenergebnisse im Extractor sofort freigeben
+NCNN_IMGSZ = 640                            # Eingabegröße des nativen Detektors
 BBOX_CONFIG_PATH = "backend/config/bbox_config.json"
 DIRECTION_CONFIG_PATH = "backend/config/direction_config.json"
+CAMERAS_CONFIG_PATH = "backend/config/cameras.json"  # Mehrere Kameras in einem Prozess (fehlt = eine Kamera)
 EXPORT_PATH = "data/counter.json"
+LIVE_STATE_PATH = "data/counter.bin"   # Datensatz fester Länge (mmap), None = nur JSON
 LOG_DB_PATH = "data/log.db"
-LOCK_PATH = "camera.lock"
+STATS_PATH = "data/stats.json"         # Laufzeiten je Stufe für die Dashboard-Seite „System“
+CAMERA_SOCKET_PATH = COUNTER_SOCKET_PATH  # Steuer-Socket der Zählung (absolut, wie Dashboard/Launcher)
+LOCK_PATH = CONTROL_LOCK_PATH            # Nur noch Fallback, Modus kommt per Socket-Befehl MODE
+LOCK_POLL_INTERVAL = 2.0               # Sekunden zwischen zwei Fallback-Prüfungen der Lock-Datei
 
-HEADLESS_MODE = False  # False = Debug-Modus mit OpenCV-Fenster
+HEADLESS_MODE = False  # False = Debug-Modus mit OpenCV-Fenster, True = nur Tracking + Zählung (ohne Annotation)
+CAMERA_SOURCE = DEFAULT_SOURCE   # "picamera2", "synthetic" oder Pfad zu Video/Bildverzeichnis (Env: EKSPAR_CAMERA_SOURCE)
 FRAME_WIDTH = 1280
 FRAME_HEIGHT = 720
+FRAME_RATE = None                # Ziel-Bildrate der Quelle (None = Standard der Kamera bzw. Datei)
+CAMERA_SERVICE = True            # True = Kamera bleibt auch ohne Zählung aktiv und liefert Standbilder
+
+PIPELINE_MODE = True             # True = Aufnahme, Inferenz und Export parallel
+PIPELINE_QUEUE_SIZE = 1          # Frame-Slot der Inferenz (1 = nur der neueste Frame; Export verwirft nie)
+PIPELINE_STATS_INTERVAL = 30.0   # Sekunden zwischen zwei [PERF]-Ausgaben
+
+INFERENCE_WORKERS = 0            # >0 = Inferenz in so vielen Prozessen (je eigenes Modell, je ein Kern)
+INFERENCE_WORKER_CORES = None    # Kerne der Worker, z. B. [1, 2, 3] (None = alle verfügbaren Kerne)
+INFERENCE_WORKER_SLOTS = 2       # Gleichzeitig ausstehende Frames je Worker
+
+ROI_MODE = False                 # True = Inferenz nur auf Zählbereich + Rand
+ROI_MARGIN = 96                  # Rand um die Bounding Box in Pixeln
+ROI_IMGSZ = None                 # Optionale kleinere Modell-Eingabegröße im ROI-Modus (z. B. 320)
+
+MOTION_GATE = True               # True = Inferenz auf statischen Frames überspringen
+MOTION_REGION_ONLY = True        # Bewegung nur im Zählbereich (+ ROI_MARGIN) prüfen
+MOTION_PIXEL_THRESHOLD = 25      # Grauwertdifferenz, ab der ein Pixel als verändert gilt
+MOTION_AREA_THRESHOLD = 0.002    # Anteil veränderter Pixel, ab dem Bewegung vorliegt
+MOTION_MAX_SKIP_FRAMES = 30      # Spätestens nach so vielen übersprungenen Frames verarbeiten
+MOTION_MAX_SKIP_SECONDS = 1.0    # ... bzw. spätestens nach so vielen Sekunden
+
+TRACK_TTL_FRAMES = 300           # Tracks nach so vielen verarbeiteten Frames ohne Sichtung entfernen
+TRACK_HISTORY_LEN = 30           # Maximale Verlaufspunkte pro Track
+
+LOG_BATCH_SIZE = 50              # Commit nach so vielen gepufferten Zeilen ...
+LOG_FLUSH_INTERVAL = 5.0         # ... oder spätestens nach so vielen Sekunden
+
+RETENTION_JOB = True             # True = alte Zähldaten im Hintergrund löschen und Speicher freigeben
+RETENTION_RAW_DAYS = 7           # Rohzeilen so viele Tage behalten (None = unbegrenzt)
+RETENTION_ROLLUP_DAYS = {"10min": 90, "30min": 90}  # Buckets je Granularität (fehlt = unbegrenzt, z. B. "hourly")
+RETENTION_INTERVAL = 3600.0      # Sekunden zwischen zwei Läufen
+
+STATS_WINDOW = 512               # Messwerte je Stufe im rollierenden Histogramm
+STATS_PUBLISH_INTERVAL = 2.0     # Sekunden zwischen zwei Aktualisierungen von stats.json
+
+_log_writer: LogWriter | None = None
+_retention_job: RetentionJob | None = None
+_live_publisher: LiveStatePublisher | None = None
+_stage_stats: StageStats | None = None
+_mode_state: ModeState | None = None
+_reload_requested = threading.Event()  # Gesetzt per MODE/RELOAD bzw. SIGHUP (neue Konfiguration)
 
 # ─── Kamera-Modus prüfen ───────────────────────────────────────────────────────
+def get_mode_state() -> ModeState:
+    """Liefert den prozessweiten Modus-Zustand (beim ersten Aufruf aus der Lock-Datei gelesen).
+
+    Returns:
+        ModeState: Modus im Speicher, per Socket-Befehl MODE aktualisiert.
+    """
+    global _mode_state
+    if _mode_state is None:
+        _mode_state = ModeState(LOCK_PATH, poll_interval=LOCK_POLL_INTERVAL)
+    return _mode_state
+
 def is_counting_mode() -> bool:
     """Prüft, ob der Zählmodus aktiv ist.
 
-    Gibt True zurück, wenn die Lock-Datei 'camera.lock' den Modus 'counting' enthält.
-    
+    Der Modus wird per Socket-Befehl MODE gesetzt und im Speicher gehalten, sodass
+    die Prüfung pro Frame keinen Dateizugriff kostet. Die Lock-Datei 'camera.lock'
+    wird nur als Fallback alle LOCK_POLL_INTERVAL Sekunden auf Änderungen geprüft.
+
     Returns:
         bool: True wenn Zählmodus aktiv, sonst False.
     """
-    if not os.path.exists(LOCK_PATH):
-        return False
-    with open(LOCK_PATH, "r") as f:
-        return f.read().strip() == "counting"
+    return get_mode_state().current() == "counting"
 
 # ─── Bounding Box laden ────────────────────────────────────────────────────────
 def load_bbox() -> dict | None:
@@ -84,181 +162,1080 @@ def load_direction_config() -> dict | None:
         print(f"[ERROR] Fehler beim Laden der direction_config.json: {e}")
         return None
 
+# ─── Inferenzbereich (ROI) bestimmen ───────────────────────────────────────────
+def compute_roi(bbox: dict, margin: int, frame_width: int, frame_height: int) -> tuple[int, int, int, int]:
+    """Berechnet den Bildausschnitt für die Inferenz: Zählbereich plus Rand, begrenzt auf den Frame.
+
+    Args:
+        bbox (dict): Bounding Box mit 'x', 'y', 'w', 'h'.
+        margin (int): Rand in Pixeln um die Bounding Box.
+        frame_width (int): Framebreite in Pixeln.
+        frame_height (int): Framehöhe in Pixeln.
+
+    Returns:
+        tuple[int, int, int, int]: Ausschnitt als (x1, y1, x2, y2) in Frame-Koordinaten.
+    """
+    x1 = max(0, int(bbox["x"]) - margin)
+    y1 = max(0, int(bbox["y"]) - margin)
+    x2 = min(frame_width, int(bbox["x"] + bbox["w"]) + margin)
+    y2 = min(frame_height, int(bbox["y"] + bbox["h"]) + margin)
+    return x1, y1, x2, y2
+
 # ─── Zähldaten in SQLite schreiben ─────────────────────────────────────────────
+def get_log_writer() -> LogWriter:
+    """Gibt den langlebigen SQLite-Writer zurück und öffnet ihn bei Bedarf.
+
+    Returns:
+        LogWriter: Gepufferter Writer für die Tabelle 'log'.
+    """
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = LogWriter(LOG_DB_PATH, batch_size=LOG_BATCH_SIZE, flush_interval=LOG_FLUSH_INTERVAL)
+    return _log_writer
+
+def close_log_writer() -> None:
+    """Schreibt offene Zeilen in die Datenbank und schließt den Writer."""
+    global _log_writer
+    if _log_writer is None:
+        return
+    try:
+        _log_writer.close()
+        print(f"[PERF] {_log_writer.format_stats()}")
+    except Exception as e:
+        print(f"[ERROR] Fehler beim Schließen der Datenbank: {e}")
+    finally:
+        _log_writer = None
+
+def start_retention_job() -> None:
+    """Startet die Aufbewahrung (RETENTION_*) als Hintergrund-Thread, sofern aktiviert."""
+    global _retention_job
+    if not RETENTION_JOB or _retention_job is not None:
+        return
+    try:
+        get_log_writer()  # Legt das Schema an bzw. stellt es um, bevor der Job die Datenbank öffnet
+        _retention_job = RetentionJob(LOG_DB_PATH, RETENTION_RAW_DAYS, RETENTION_ROLLUP_DAYS, RETENTION_INTERVAL)
+        _retention_job.start()
+    except Exception as e:
+        print(f"[ERROR] Aufbewahrung konnte nicht gestartet werden: {e}")
+        _retention_job = None
+
+def stop_retention_job() -> None:
+    """Stoppt den Aufbewahrungs-Thread (ein laufender Lauf endet nach dem aktuellen Block)."""
+    global _retention_job
+    if _retention_job is not None:
+        _retention_job.stop()
+        _retention_job = None
+
 def log_to_db(data: dict) -> None:
     """Schreibt Zähldaten in die lokale SQLite-Datenbank.
 
-    Erstellt die Tabelle 'log' bei Bedarf und speichert einen neuen Eintrag.
+    Die Zeile wird vom langlebigen Writer gepuffert und gebündelt (nach
+    LOG_BATCH_SIZE Zeilen bzw. LOG_FLUSH_INTERVAL Sekunden) committet.
 
     Args:
         data (dict): Zähldaten im Format mit Schlüsseln
             'timestamp', 'in', 'out', 'current', 'total_tracks'.
     """
     try:
-        conn = sqlite3.connect(LOG_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS log (
-                timestamp TEXT,
-                in_count INTEGER,
-                out_count INTEGER,
-                current_count INTEGER,
-                total_tracks INTEGER
-            )
-        """)
-        cursor.execute("""
-            INSERT INTO log (timestamp, in_count, out_count, current_count, total_tracks)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            data["timestamp"],
-            data["in"],
-            data["out"],
-            data["current"],
-            data["total_tracks"]
-        ))
-        conn.commit()
-        conn.close()
+        get_log_writer().write(data)
     except Exception as e:
         print(f"[ERROR] Fehler beim Schreiben in die Datenbank: {e}")
 
+# ─── Live-Zählerstand veröffentlichen ──────────────────────────────────────────
+def get_live_publisher() -> LiveStatePublisher:
+    """Gibt den Publisher für den Live-Zählerstand zurück und öffnet ihn bei Bedarf.
+
+    Returns:
+        LiveStatePublisher: Schreibt counter.json (und optional counter.bin) nur bei Änderungen.
+    """
+    global _live_publisher
+    if _live_publisher is None:
+        _live_publisher = LiveStatePublisher(EXPORT_PATH, mmap_path=LIVE_STATE_PATH)
+    return _live_publisher
+
+def close_live_publisher() -> None:
+    """Gibt die Ressourcen des Live-Publishers frei."""
+    global _live_publisher
+    if _live_publisher is None:
+        return
+    print(f"[PERF] Live-Zähler: {_live_publisher.writes} Schreibvorgänge, "
+          f"{_live_publisher.skipped} unveränderte Frames übersprungen")
+    _live_publisher.close()
+    _live_publisher = None
+
+# ─── Laufzeitmessung je Stufe ──────────────────────────────────────────────────
+def get_stage_stats() -> StageStats:
+    """Gibt die Laufzeitmessung der Pipeline-Stufen zurück und legt sie bei Bedarf an.
+
+    Returns:
+        StageStats: Rollierende Histogramme je Stufe, veröffentlicht nach STATS_PATH.
+    """
+    global _stage_stats
+    if _stage_stats is None:
+        _stage_stats = StageStats(STATS_PATH, window=STATS_WINDOW, publish_interval=STATS_PUBLISH_INTERVAL)
+    return _stage_stats
+
+def publish_stage_stats(counter: ObjectCounter, gate: MotionGate | None = None,
+                        pipeline: CountingPipeline | None = None, force: bool = False,
+                        extra: dict | None = None) -> None:
+    """Veröffentlicht die Stufen-Laufzeiten samt Writer-, Pipeline- und Tracker-Kennzahlen.
+
+    Geschrieben wird höchstens alle STATS_PUBLISH_INTERVAL Sekunden (außer bei force=True).
+
+    Args:
+        counter (ObjectCounter): Initialisierter ObjectCounter.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        pipeline (CountingPipeline | None): Laufende Pipeline (nur im Pipeline-Modus).
+        force (bool): Unabhängig vom Intervall schreiben (z. B. beim Beenden).
+        extra (dict | None): Weitere Kennzahlen (z. B. je Kamera im Mehrkamerabetrieb).
+    """
+    stats = get_stage_stats()
+    if not force and not stats.publish_due():
+        return
+    try:
+        extra = dict(extra or {})
+        extra["tracks"] = counter.track_stats()
+        if _log_writer is not None:
+            extra["db"] = _log_writer.stats()
+        if pipeline is not None:
+            extra["pipeline"] = pipeline.stats()
+        if gate is not None:
+            extra["motion_gate"] = {"processed": gate.processed, "skipped": gate.skipped}
+        stats.publish(extra)
+    except Exception as e:
+        print(f"[ERROR] Fehler beim Schreiben der Laufzeitstatistik: {e}")
+
+def capture_frame(source: CameraSource):
+    """Nimmt einen Frame auf und misst die Wartezeit auf die Kamera.
+
+    Args:
+        source (CameraSource): Gestartete Bildquelle.
+
+    Returns:
+        Kameraframe als NumPy-Array.
+
+    Raises:
+        StopIteration: Wenn eine dateibasierte Quelle erschöpft ist.
+    """
+    start = time.perf_counter()
+    frame = source.read()
+    get_stage_stats().record("capture", time.perf_counter() - start)
+    return frame
+
 # ─── Zähldaten exportieren (JSON + DB) ─────────────────────────────────────────
-def export_counts(results) -> None:
+def build_record(results, camera: str | None = None, captured_at: float | None = None) -> dict:
+    """Erstellt den Datensatz für Live-Zähler und Datenbank aus einem Zählergebnis.
+
+    Args:
+        results: Ergebnisobjekt von ObjectCounter mit Attributen
+            'in_count', 'out_count', 'total_tracks'.
+        camera (str | None): Kennung der Kamera (nur im Mehrkamerabetrieb).
+        captured_at (float | None): Aufnahmezeitpunkt des Frames (`time.time()`);
+            ohne Angabe gilt der aktuelle Zeitpunkt.
+
+    Returns:
+        dict: Zähldaten mit 'timestamp' (ISO), 'ts' (Epoch-ms), 'in', 'out', 'current',
+            'total_tracks' (und ggf. 'camera').
+    """
+    in_count = getattr(results, "in_count", 0)
+    out_count = getattr(results, "out_count", 0)
+    now = time.time() if captured_at is None else captured_at
+    data = {
+        "timestamp": datetime.datetime.fromtimestamp(now).isoformat(),
+        "ts": int(now * 1000),
+        "in": in_count,
+        "out": out_count,
+        "current": max(0, in_count - out_count),
+        "total_tracks": getattr(results, "total_tracks", 0)
+    }
+    if camera is not None:
+        data["camera"] = camera
+    return data
+
+def export_counts(results, captured_at: float | None = None) -> None:
     """Exportiert Zähldaten aus einem Detection-Ergebnis.
 
     Erstellt ein JSON-Dokument mit Zeitstempel und Zählwerten und speichert zusätzlich in SQLite.
+    Der Live-Zählerstand wird nur bei geänderten Werten (atomar) neu geschrieben.
+    Die Dauer wird als Stufe 'export' erfasst (inkl. gebündelter DB-Commits).
 
     Args:
         results: Ergebnisobjekt von ObjectCounter mit Attributen
             'in_count', 'out_count', 'total_tracks'.
+        captured_at (float | None): Aufnahmezeitpunkt des Frames (`time.time()`), z. B.
+            aus der Pipeline; ohne Angabe wird der Exportzeitpunkt verwendet.
     """
+    start = time.perf_counter()
     try:
-        in_count = getattr(results, "in_count", 0)
-        out_count = getattr(results, "out_count", 0)
-        current = max(0, in_count - out_count)
-
-        data = {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "in": in_count,
-            "out": out_count,
-            "current": current,
-            "total_tracks": getattr(results, "total_tracks", 0)
-        }
-
-        with open(EXPORT_PATH, "w") as f:
-            json.dump(data, f, indent=2)
-
+        data = build_record(results, captured_at=captured_at)
+        get_live_publisher().publish(data)
         log_to_db(data)
 
     except Exception as e:
         print(f"[ERROR] Fehler beim Exportieren der Zähldaten: {e}")
 
-# ─── Hauptfunktion ─────────────────────────────────────────────────────────────
-def main() -> None:
-    """Startet die Live-Personenzählung mit Kamera und ObjectCounter.
-
-    Ablauf:
-    - Lädt Bounding Box und Richtungskonfiguration
-    - Initialisiert Kamera und ObjectCounter
-    - Führt kontinuierliche Erkennung durch
-    - Exportiert Zähldaten als JSON + SQLite
-    - Unterstützt Debug-Modus mit OpenCV-Vorschau (optional)
-    """
-    print("[INFO] Starte Personenzählung mit direkter Kamera...")
-
-    # ── Konfiguration laden ──
-    bbox = load_bbox()
-    if not bbox:
-        print("[ERROR] Kein Zählbereich definiert.")
-        return
+    get_stage_stats().record("export", time.perf_counter() - start)
 
-    direction = load_direction_config()
-    if not direction or "angle" not in direction:
-        print("[ERROR] Keine gültige Richtungskonfiguration gefunden.")
-        return
+# ─── ObjectCounter & Bewegungsfilter erstellen ─────────────────────────────────
+def bbox_to_region(bbox: dict) -> list[tuple[int, int]]:
+    """Wandelt die Bounding Box in die vier Eckpunkte der Zählregion um.
 
-    entry_angle = direction["angle"]
-    opposite_angle = (entry_angle + 180) % 360
-    print(f"[INFO] Eintrittsrichtung: {entry_angle}° → Gegenrichtung: {opposite_angle}°")
+    Args:
+        bbox (dict): Bounding Box mit 'x', 'y', 'w', 'h'.
 
-    # ── Region definieren ──
-    region = [
+    Returns:
+        list[tuple[int, int]]: Eckpunkte im Uhrzeigersinn, beginnend oben links.
+    """
+    return [
         (bbox["x"], bbox["y"]),
         (bbox["x"] + bbox["w"], bbox["y"]),
         (bbox["x"] + bbox["w"], bbox["y"] + bbox["h"]),
         (bbox["x"], bbox["y"] + bbox["h"])
     ]
 
+def create_ncnn_detector():
+    """Erstellt den nativen NCNN-Detektor gemäß Konfiguration.
+
+    Returns:
+        NcnnDetector: Detektor mit NCNN_THREADS Threads (nur Klasse 0 = Personen).
+    """
+    from backend.detection.ncnn_detector import NcnnDetector
+    detector = NcnnDetector(
+        MODEL_PATH,
+        imgsz=ROI_IMGSZ if ROI_MODE and ROI_IMGSZ else NCNN_IMGSZ,
+        num_threads=NCNN_THREADS,
+        light_mode=NCNN_LIGHT_MODE,
+        classes=(0,)  # Klasse 0 = Personen
+    )
+    print(f"[INFO] Native NCNN-Inferenz aktiv ({NCNN_THREADS} Threads).")
+    return detector
+
+def create_shared_detector():
+    """Lädt Modell und Detektor einmalig für alle Kameras (Mehrkamerabetrieb).
+
+    Returns:
+        tuple: (YOLO-Modell für Klassennamen bzw. Inferenz, Detektor mit `detect()`/`detect_batch()`).
+    """
+    from ultralytics import YOLO
+    model = YOLO(MODEL_PATH)
+    if INFERENCE_ENGINE == "ncnn":
+        return model, create_ncnn_detector()
+    print("[INFO] Gemeinsames ultralytics-Modell für alle Kameras (Batch-Inferenz).")
+    return model, UltralyticsDetector(model, classes=(0,), imgsz=ROI_IMGSZ if ROI_MODE else None)
+
+def create_worker_pool(num_workers: int | None = None, cores: list[int] | None = None,
+                       max_frame_shape: tuple[int, int, int] | None = None) -> InferenceWorkerPool:
+    """Startet den Pool aus Inferenz-Prozessen (je ein Modell, je ein Kern).
+
+    Args:
+        num_workers (int | None): Anzahl Worker (None = INFERENCE_WORKERS).
+        cores (list[int] | None): Kerne der Worker (None = INFERENCE_WORKER_CORES).
+        max_frame_shape (tuple[int, int, int] | None): Größtes Eingabebild (None = FRAME_HEIGHT x FRAME_WIDTH).
+
+    Returns:
+        InferenceWorkerPool: Gestarteter Pool; alle Modelle sind geladen.
+    """
+    detector_args = {"classes": (0,)}  # Klasse 0 = Personen
+    if INFERENCE_ENGINE == "ncnn":
+        detector_args.update(imgsz=ROI_IMGSZ if ROI_MODE and ROI_IMGSZ else NCNN_IMGSZ, light_mode=NCNN_LIGHT_MODE)
+    elif ROI_MODE and ROI_IMGSZ:
+        detector_args["imgsz"] = ROI_IMGSZ
+
+    pool = InferenceWorkerPool(
+        MODEL_PATH,
+        engine=INFERENCE_ENGINE,
+        num_workers=num_workers or INFERENCE_WORKERS,
+        cores=cores or INFERENCE_WORKER_CORES,
+        slots_per_worker=INFERENCE_WORKER_SLOTS,
+        max_frame_shape=max_frame_shape or (FRAME_HEIGHT, FRAME_WIDTH, 3),
+        detector_args=detector_args
+    )
+    pool.start()
+    print(f"[INFO] {pool.num_workers} Inferenz-Worker ({INFERENCE_ENGINE}) auf Kernen {pool.cores}.")
+    return pool
+
+def create_counter(bbox: dict, entry_angle: int, headless: bool | None = None,
+                   model=None, detector=None) -> ObjectCounter:
+    """Erstellt den ObjectCounter gemäß Konfiguration (Region, ROI, Inferenz-Engine, Track-Speicher).
+
+    Args:
+        bbox (dict): Bounding Box mit 'x', 'y', 'w', 'h'.
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+        headless (bool | None): Annotation überspringen; None = HEADLESS_MODE.
+        model: Bereits geladenes YOLO-Modell, das mehrere Counter teilen (None = MODEL_PATH laden).
+        detector: Gemeinsamer Detektor; der Counter erhält dann nur einen eigenen ByteTrack
+            (None = gemäß INFERENCE_ENGINE).
+
+    Returns:
+        ObjectCounter: Initialisierter ObjectCounter.
+    """
+    # ── Region definieren ──
+    region = bbox_to_region(bbox)
+
+    # ── Inferenzbereich (optional) ──
+    roi = None
+    if ROI_MODE:
+        roi = compute_roi(bbox, ROI_MARGIN, FRAME_WIDTH, FRAME_HEIGHT)
+        print(f"[INFO] ROI-Inferenz aktiv: {roi} (Rand {ROI_MARGIN}px, imgsz {ROI_IMGSZ or 'Standard'})")
+
+    # ── Detektor wählen ──
+    if detector is None and INFERENCE_ENGINE == "ncnn":
+        detector = create_ncnn_detector()
+
     # ── ObjectCounter initialisieren ──
-    counter = ObjectCounter(
-        model=MODEL_PATH,
+    return ObjectCounter(
+        model=model if model is not None else MODEL_PATH,
         classes=[0],  # Klasse 0 = Personen
         region=region,
         show=False,
         up_angle=entry_angle,
-        down_angle=opposite_angle
+        down_angle=(entry_angle + 180) % 360,
+        headless=HEADLESS_MODE if headless is None else headless,  # Keine Annotation ohne Vorschau
+        roi=roi,
+        imgsz=ROI_IMGSZ if ROI_MODE else None,
+        detector=detector,
+        history_len=TRACK_HISTORY_LEN,
+        track_ttl_frames=TRACK_TTL_FRAMES,
+        stage_stats=get_stage_stats()
+    )
+
+def create_motion_gate(bbox: dict) -> MotionGate:
+    """Erstellt den Bewegungsfilter gemäß Konfiguration.
+
+    Args:
+        bbox (dict): Bounding Box mit 'x', 'y', 'w', 'h'.
+
+    Returns:
+        MotionGate: Bewegungsfilter (optional auf den Zählbereich + ROI_MARGIN begrenzt).
+    """
+    return MotionGate(
+        pixel_threshold=MOTION_PIXEL_THRESHOLD,
+        area_threshold=MOTION_AREA_THRESHOLD,
+        max_skip_frames=MOTION_MAX_SKIP_FRAMES,
+        max_skip_seconds=MOTION_MAX_SKIP_SECONDS,
+        region=compute_roi(bbox, ROI_MARGIN, FRAME_WIDTH, FRAME_HEIGHT) if MOTION_REGION_ONLY else None
     )
 
-    # ── Kamera konfigurieren ──
-    picam2 = Picamera2()
-    picam2.preview_configuration.main.size = (FRAME_WIDTH, FRAME_HEIGHT)
-    picam2.preview_configuration.main.format = "RGB888"
-    picam2.preview_configuration.align()
-    picam2.configure("preview")
-    picam2.start()
+# ─── Einzelframe verarbeiten ───────────────────────────────────────────────────
+def process_frame(counter: ObjectCounter, frame, entry_angle: int,
+                  gate: MotionGate | None = None, last_results=None):
+    """Führt Erkennung, Tracking und Zählung für einen Frame aus.
+
+    Meldet der Bewegungsfilter keinen Unterschied zum zuletzt verarbeiteten Frame,
+    werden Inferenz und Tracking übersprungen und das letzte Ergebnis (unveränderte
+    Zählerstände) zurückgegeben. Der Tracker-Zustand bleibt dabei unangetastet.
+    Jeder Frame wird für FPS und übersprungene Frames in der Laufzeitmessung vermerkt.
+
+    Args:
+        counter (ObjectCounter): Initialisierter ObjectCounter.
+        frame: Kameraframe als NumPy-Array.
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        last_results: Ergebnis des zuletzt verarbeiteten Frames.
+
+    Returns:
+        Ergebnisobjekt mit 'in_count', 'out_count', 'total_tracks' und 'plot_im'.
+    """
+    if skip_static_frame(gate, frame, last_results):
+        return last_results
+
+    results = counter.process(frame)
+    get_stage_stats().frame_done()
+
+    # Spezialfall: Richtung 180° → Zählung umkehren
+    if entry_angle == 180:
+        results.in_count, results.out_count = results.out_count, results.in_count
+
+    return results
+
+def skip_static_frame(gate: MotionGate | None, frame, last_results) -> bool:
+    """Prüft per Bewegungsfilter, ob ein Frame ohne Inferenz übersprungen werden kann.
+
+    Übersprungene Frames werden in der Laufzeitmessung vermerkt.
+
+    Args:
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        frame: Kameraframe als NumPy-Array.
+        last_results: Ergebnis des zuletzt verarbeiteten Frames (ohne Ergebnis wird nie übersprungen).
+
+    Returns:
+        bool: True, wenn der Frame übersprungen werden kann.
+    """
+    if gate is None:
+        return False
+    stats = get_stage_stats()
+    start = time.perf_counter()
+    motion = gate.should_process(frame)
+    stats.record("motion_gate", time.perf_counter() - start)
+    if not motion and last_results is not None:
+        stats.frame_done(processed=False)
+        return True
+    return False
+
+def process_detections(counter: ObjectCounter, frame, detections, speed: dict, entry_angle: int):
+    """Tracking und Zählung für bereits (im Worker-Pool) berechnete Detektionen.
+
+    Args:
+        counter (ObjectCounter): ObjectCounter mit eigenem ByteTrack.
+        frame: Kameraframe als NumPy-Array.
+        detections: Detektionen für `counter.inference_input(frame)`.
+        speed (dict): Laufzeiten der Erkennung in ms (preprocess, inference, postprocess).
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+
+    Returns:
+        Ergebnisobjekt mit 'in_count', 'out_count', 'total_tracks' und 'plot_im'.
+    """
+    stats = get_stage_stats()
+    stats.record("preprocess", speed.get("preprocess", 0.0) / 1000)
+    stats.record("inference", (speed.get("inference", 0.0) + speed.get("postprocess", 0.0)) / 1000)
+    results = counter.process(frame, detections=detections)
+    stats.frame_done()
+
+    # Spezialfall: Richtung 180° → Zählung umkehren
+    if entry_angle == 180:
+        results.in_count, results.out_count = results.out_count, results.in_count
+
+    return results
+
+# ─── Tracker-Speicher ──────────────────────────────────────────────────────────
+def format_track_stats(counter: ObjectCounter) -> str:
+    """Formatiert die Größe des Track-Speichers als einzeilige Log-Ausgabe.
+
+    Args:
+        counter (ObjectCounter): Initialisierter ObjectCounter.
+
+    Returns:
+        str: Aktive und entfernte Tracks, gezählte IDs und gespeicherte Verlaufspunkte.
+    """
+    s = counter.track_stats()
+    return (f"Tracks: {s['live_tracks']} aktiv, {s['evicted_tracks']} entfernt, "
+            f"{s['counted_ids']} gezählte IDs, {s['history_points']} Verlaufspunkte")
+
+# ─── Debug-Vorschau ────────────────────────────────────────────────────────────
+def show_preview(results) -> bool:
+    """Zeigt das annotierte Bild im OpenCV-Fenster an (nur Debug-Modus).
+
+    Args:
+        results: Ergebnisobjekt mit Attribut 'plot_im'.
+
+    Returns:
+        bool: False, wenn die Vorschau mit 'q' beendet wurde, sonst True.
+    """
+    if HEADLESS_MODE:
+        return True
+
+    if "window_initialized" not in globals():
+        cv2.namedWindow("Zählung", cv2.WINDOW_NORMAL)
+        globals()["window_initialized"] = True
+
+    cv2.imshow("Zählung", results.plot_im)
+    return not (cv2.waitKey(1) & 0xFF == ord("q"))
 
-    # ── Performance-Tracking (auskommentiert nach Benchmark) ──
-    # frame_count = 0
-    # start_time = time.time()
-    # inference_times = []
+# ─── Konfiguration zur Laufzeit ────────────────────────────────────────────────
+def load_config() -> tuple[dict, int] | None:
+    """Lädt Zählbereich und Eintrittsrichtung, sofern beide vollständig vorhanden sind.
+
+    Returns:
+        tuple[dict, int] | None: (Bounding Box, Eintrittswinkel) oder None.
+    """
+    if not os.path.exists(BBOX_CONFIG_PATH) or not os.path.exists(DIRECTION_CONFIG_PATH):
+        return None
+    bbox = load_bbox()
+    direction = load_direction_config()
+    if not bbox or not direction or "angle" not in direction:
+        return None
+    return bbox, direction["angle"]
+
+def wait_for_config() -> tuple[dict, int]:
+    """Wartet, bis eine vollständige Konfiguration vorliegt und der Zählmodus aktiv ist.
+
+    Der Kameradienst läuft währenddessen weiter und beantwortet Standbild-Anfragen.
+    Geprüft wird nach jedem MODE-/RELOAD-Befehl, ohne Befehl nur im Fallback-Intervall.
+
+    Returns:
+        tuple[dict, int]: (Bounding Box, Eintrittswinkel).
+    """
+    print("[INFO] Warte auf Konfiguration – Kamera bleibt für Standbilder aktiv.")
+    while True:
+        config = load_config()
+        if config is not None and is_counting_mode():
+            return config
+        _reload_requested.wait(LOCK_POLL_INTERVAL)
+        _reload_requested.clear()
+
+def handle_reload_command(args: str) -> str:
+    """Socket-Befehl RELOAD: Konfiguration beim nächsten Frame neu laden.
+
+    Args:
+        args (str): Argumente der Befehlszeile (ungenutzt).
+
+    Returns:
+        str: Antwortzeile.
+    """
+    _reload_requested.set()
+    return "OK"
+
+def handle_mode_command(args: str) -> str:
+    """Socket-Befehl MODE <counting|config|none>: Modus umschalten.
+
+    Weckt wartende bzw. laufende Schleifen sofort auf; beim Wechsel in den
+    Zählmodus wird dabei auch die Konfiguration neu geladen.
+
+    Args:
+        args (str): Neuer Modus.
+
+    Returns:
+        str: Antwortzeile.
+    """
+    reply = get_mode_state().handle_command(args)
+    _reload_requested.set()
+    return reply
+
+def apply_config(counter: ObjectCounter, gate: MotionGate | None, bbox: dict) -> None:
+    """Übernimmt einen neuen Zählbereich ohne Modell-Neuladen und ohne Kamera-Neustart.
+
+    Zählerstände und bereits gezählte Track-IDs bleiben erhalten.
+
+    Args:
+        counter (ObjectCounter): Laufender ObjectCounter.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        bbox (dict): Neue Bounding Box mit 'x', 'y', 'w', 'h'.
+    """
+    roi = compute_roi(bbox, ROI_MARGIN, FRAME_WIDTH, FRAME_HEIGHT)
+    counter.update_region(bbox_to_region(bbox), roi=roi if ROI_MODE else None)
+    if gate is not None:
+        gate.reset(region=roi if MOTION_REGION_ONLY else None)
+    print(f"[INFO] Neuer Zählbereich übernommen: {bbox}")
+
+def reload_config(counter: ObjectCounter, gate: MotionGate | None, entry_angle: int) -> int:
+    """Lädt die Konfiguration nach einem RELOAD-Befehl neu und wendet sie an.
+
+    Args:
+        counter (ObjectCounter): Laufender ObjectCounter.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        entry_angle (int): Bisherige Eintrittsrichtung (bleibt bei ungültiger Konfiguration).
+
+    Returns:
+        int: Gültige Eintrittsrichtung in Grad.
+    """
+    _reload_requested.clear()
+    config = load_config()
+    if config is None:
+        print("[WARN] Neu laden angefordert, aber Konfiguration unvollständig – behalte bisherige.")
+        return entry_angle
+    bbox, entry_angle = config
+    apply_config(counter, gate, bbox)
+    print(f"[INFO] Eintrittsrichtung: {entry_angle}°")
+    return entry_angle
+
+# ─── Zählschleifen ─────────────────────────────────────────────────────────────
+def run_sequential(source: CameraSource | CameraService, counter: ObjectCounter, entry_angle: int,
+                   gate: MotionGate | None = None) -> bool:
+    """Aufnahme, Inferenz und Export strikt nacheinander (ursprünglicher Ablauf).
+
+    Args:
+        source (CameraSource | CameraService): Gestartete Bildquelle bzw. Kameradienst.
+        counter (ObjectCounter): Initialisierter ObjectCounter.
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+
+    Returns:
+        bool: True, wenn die Zählung wegen des Konfigurationsmodus pausiert wurde.
+    """
+    results = None
+    while True:
+        # Prüfen, ob der Modus gewechselt wurde bzw. neu geladen werden soll
+        if not is_counting_mode():
+            print("[INFO] Konfigurationsmodus erkannt – Zählung wird gestoppt.")
+            return True
+        if _reload_requested.is_set():
+            entry_angle = reload_config(counter, gate, entry_angle)
+
+        # Frame aufnehmen, verarbeiten und exportieren
+        try:
+            frame = capture_frame(source)
+        except StopIteration:
+            print("[INFO] Bildquelle erschöpft – Zählung wird beendet.")
+            return False
+        captured_at = time.time()
+        results = process_frame(counter, frame, entry_angle, gate, results)
+        export_counts(results, captured_at)
+        publish_stage_stats(counter, gate)
+
+        if not show_preview(results):
+            return False
+
+def run_pipelined(source: CameraSource | CameraService, counter: ObjectCounter, entry_angle: int,
+                  gate: MotionGate | None = None) -> bool:
+    """Aufnahme und Export laufen in eigenen Threads, die Inferenz im Hauptthread.
+
+    Die Aufnahme legt Frames in einen Slot, den jeder neue Frame überschreibt, sodass
+    die Inferenz immer den aktuellsten Frame verarbeitet; Zählergebnisse gehen
+    verlustfrei an den Export. Queue-Tiefen und verworfene Frames werden
+    regelmäßig als [PERF]-Zeile ausgegeben.
+
+    Args:
+        source (CameraSource | CameraService): Gestartete Bildquelle bzw. Kameradienst.
+        counter (ObjectCounter): Initialisierter ObjectCounter.
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+
+    Returns:
+        bool: True, wenn die Zählung wegen des Konfigurationsmodus pausiert wurde.
+    """
+    pipeline = CountingPipeline(
+        capture_fn=lambda: capture_frame(source),
+        export_fn=export_counts,
+        queue_size=PIPELINE_QUEUE_SIZE
+    )
+    pipeline.start()
+    last_report = time.monotonic()
+    results = None
+    paused = False
 
     try:
-        while True:
-            # Prüfen, ob der Modus gewechselt wurde
+        while pipeline.running:
+            # Prüfen, ob der Modus gewechselt wurde bzw. neu geladen werden soll
             if not is_counting_mode():
                 print("[INFO] Konfigurationsmodus erkannt – Zählung wird gestoppt.")
+                paused = True
+                break
+            if _reload_requested.is_set():
+                entry_angle = reload_config(counter, gate, entry_angle)
+
+            item = pipeline.get_frame(timeout=1.0)
+            if item is None:
+                continue
+
+            seq, captured_at, frame = item
+            results = process_frame(counter, frame, entry_angle, gate, results)
+            pipeline.publish(seq, captured_at, results)
+            publish_stage_stats(counter, gate, pipeline)
+
+            if time.monotonic() - last_report >= PIPELINE_STATS_INTERVAL:
+                print(f"[PERF] {pipeline.format_stats()}")
+                print(f"[PERF] {get_stage_stats().format_stats()}")
+                if gate is not None:
+                    print(f"[PERF] {gate.format_stats()}")
+                print(f"[PERF] {format_track_stats(counter)}")
+                last_report = time.monotonic()
+
+            if not show_preview(results):
                 break
 
-            # Frame aufnehmen und verarbeiten
-            frame = picam2.capture_array()
-            
-            # Performance-Messung (auskommentiert nach Benchmark)
-            # inference_start = time.time()
-            results = counter.process(frame)
-            # inference_end = time.time()
-            
-            # Statistiken sammeln (auskommentiert nach Benchmark)
-            # frame_count += 1
-            # inference_time = inference_end - inference_start
-            # inference_times.append(inference_time)
-            
-            # Alle 30 Frames: Performance ausgeben (auskommentiert nach Benchmark)
-            # if frame_count % 30 == 0:
-            #     elapsed = time.time() - start_time
-            #     fps = frame_count / elapsed
-            #     avg_inference = sum(inference_times[-30:]) / min(30, len(inference_times))
-            #     print(f"[PERF] FPS: {fps:.1f} | Avg Inference: {avg_inference*1000:.0f}ms | Model: {MODEL_PATH}")
-            #     
-            #     # Memory-sparend: nur letzte 100 Zeiten behalten
-            #     if len(inference_times) > 100:
-            #         inference_times = inference_times[-100:]
-
-            # Spezialfall: Richtung 180° → Zählung umkehren
-            if entry_angle == 180:
+        if isinstance(pipeline.error, StopIteration):
+            print("[INFO] Bildquelle erschöpft – Zählung wird beendet.")
+        elif pipeline.error is not None:
+            raise pipeline.error
+    finally:
+        pipeline.stop()
+        print(f"[PERF] {pipeline.format_stats()}")
+    return paused
+
+def run_pooled(source: CameraSource | CameraService, counter: ObjectCounter, entry_angle: int,
+               gate: MotionGate | None, pool: InferenceWorkerPool) -> bool:
+    """Inferenz im Worker-Pool, Tracking und Zählung im Hauptprozess.
+
+    Bis zu `pool.capacity` Frames sind gleichzeitig in Arbeit (je Worker-Prozess
+    ein eigener Kern). Die Ergebnisse werden in Aufnahmereihenfolge an den Tracker
+    übergeben, sodass die Zählung identisch zum Einzelprozess bleibt. Vor einem
+    Konfigurationswechsel bzw. einer Pause werden ausstehende Frames abgearbeitet.
+
+    Args:
+        source (CameraSource | CameraService): Gestartete Bildquelle bzw. Kameradienst.
+        counter (ObjectCounter): ObjectCounter mit eigenem ByteTrack (erstellt mit `detector=pool`).
+        entry_angle (int): Konfigurierte Eintrittsrichtung in Grad.
+        gate (MotionGate | None): Optionaler Bewegungsfilter.
+        pool (InferenceWorkerPool): Gestarteter Worker-Pool.
+
+    Returns:
+        bool: True, wenn die Zählung wegen des Konfigurationsmodus pausiert wurde.
+    """
+    frames = {}  # Sequenznummer → (Vollbild, Aufnahmezeitpunkt) für Zählung, Vorschau und Export
+    results = None
+    last_report = time.monotonic()
+
+    def handle(item) -> bool:
+        nonlocal results
+        seq, detections, speed = item
+        frame, captured_at = frames.pop(seq)
+        results = process_detections(counter, frame, detections, speed, entry_angle)
+        export_counts(results, captured_at)
+        publish_stage_stats(counter, gate, extra={"workers": pool.stats()})
+        return show_preview(results)
+
+    def drain() -> bool:
+        while pool.in_flight:
+            item = pool.get(timeout=None)
+            if item is not None and not handle(item):
+                return False
+        return True
+
+    while True:
+        # Prüfen, ob der Modus gewechselt wurde bzw. neu geladen werden soll
+        if not is_counting_mode():
+            drain()
+            print("[INFO] Konfigurationsmodus erkannt – Zählung wird gestoppt.")
+            return True
+        if _reload_requested.is_set():
+            if not drain():
+                return False
+            entry_angle = reload_config(counter, gate, entry_angle)
+
+        # Nächsten Frame reihum verteilen bzw. auf den ältesten ausstehenden warten
+        if pool.has_capacity():
+            try:
+                frame = capture_frame(source)
+            except StopIteration:
+                drain()
+                print("[INFO] Bildquelle erschöpft – Zählung wird beendet.")
+                return False
+            if not skip_static_frame(gate, frame, results):
+                frames[pool.submit(counter.inference_input(frame))] = (frame, time.time())
+        else:
+            item = pool.get(timeout=1.0)
+            if item is not None and not handle(item):
+                return False
+
+        # Fertige Ergebnisse in Reihenfolge zählen
+        item = pool.get(timeout=0)
+        while item is not None:
+            if not handle(item):
+                return False
+            item = pool.get(timeout=0)
+
+        if time.monotonic() - last_report >= PIPELINE_STATS_INTERVAL:
+            print(f"[PERF] {pool.format_stats()}")
+            print(f"[PERF] {get_stage_stats().format_stats()}")
+            print(f"[PERF] {format_track_stats(counter)}")
+            last_report = time.monotonic()
+
+# ─── Mehrere Kameras ───────────────────────────────────────────────────────────
+def resolve_camera_config(spec: dict) -> tuple[dict, int] | None:
+    """Bestimmt Zählbereich und Richtung einer Kamera aus der Kameraliste.
+
+    Fehlende Angaben werden aus bbox_config.json bzw. direction_config.json ergänzt.
+
+    Args:
+        spec (dict): Eintrag aus cameras.json.
+
+    Returns:
+        tuple[dict, int] | None: (Bounding Box, Eintrittswinkel) oder None bei unvollständiger Konfiguration.
+    """
+    bbox, angle = spec.get("bbox"), spec.get("angle")
+    if bbox is None or angle is None:
+        fallback = load_config()
+        if fallback is None:
+            return None
+        bbox = bbox if bbox is not None else fallback[0]
+        angle = angle if angle is not None else fallback[1]
+    return bbox, angle
+
+def reload_camera_configs(channels: list[CameraChannel]) -> None:
+    """Übernimmt geänderte Zählbereiche und Richtungen aller Kameras ohne Neustart.
+
+    Args:
+        channels (list[CameraChannel]): Laufende Kamerakanäle.
+    """
+    _reload_requested.clear()
+    specs = {spec["id"]: spec for spec in load_camera_specs(CAMERAS_CONFIG_PATH) or []}
+    for channel in channels:
+        config = resolve_camera_config(specs[channel.camera_id]) if channel.camera_id in specs else None
+        if config is None:
+            print(f"[WARN] Kamera {channel.camera_id}: Konfiguration unvollständig – behalte bisherige.")
+            continue
+        bbox, channel.entry_angle = config
+        apply_config(channel.counter, channel.gate, bbox)
+
+def export_multi_counts(processed: list[CameraChannel], channels: list[CameraChannel]) -> None:
+    """Schreibt je verarbeiteter Kamera eine Zeile in die Datenbank und veröffentlicht die Summe als Live-Zähler.
+
+    Args:
+        processed (list[CameraChannel]): Kameras mit neuem Ergebnis in diesem Durchlauf.
+        channels (list[CameraChannel]): Alle Kameras (für die Summe).
+    """
+    start = time.perf_counter()
+    try:
+        for channel in processed:
+            log_to_db(build_record(channel.results, camera=channel.camera_id))
+
+        records = [build_record(channel.results) for channel in channels if channel.results is not None]
+        now = time.time()
+        get_live_publisher().publish({
+            "timestamp": datetime.datetime.fromtimestamp(now).isoformat(),
+            "ts": int(now * 1000),
+            "in": sum(r["in"] for r in records),
+            "out": sum(r["out"] for r in records),
+            "current": sum(r["current"] for r in records),
+            "total_tracks": sum(r["total_tracks"] for r in records)
+        })
+    except Exception as e:
+        print(f"[ERROR] Fehler beim Exportieren der Zähldaten: {e}")
+    get_stage_stats().record("export", time.perf_counter() - start)
+
+def camera_stats(channels: list[CameraChannel]) -> dict:
+    """Kennzahlen je Kamera für stats.json.
+
+    Args:
+        channels (list[CameraChannel]): Kamerakanäle.
+
+    Returns:
+        dict: Je Kamera-ID Frames, Zählerstände und Track-Speicher.
+    """
+    return {
+        channel.camera_id: {
+            "frames": channel.frames,
+            "in": getattr(channel.results, "in_count", 0),
+            "out": getattr(channel.results, "out_count", 0),
+            "tracks": channel.counter.track_stats()
+        }
+        for channel in channels
+    }
+
+def run_multi_camera(channels: list[CameraChannel], detector, frame_ready: threading.Event) -> bool:
+    """Zählt mehrere Kameras mit einem gemeinsamen Detektor.
+
+    Jeder Kameradienst nimmt in einem eigenen Thread auf. Sobald mindestens eine
+    Kamera einen neuen Frame hat, werden die neuesten Frames aller Kameras
+    eingesammelt, je Kamera durch den Bewegungsfilter geschickt und gemeinsam als
+    Batch erkannt. Tracking und Zählung laufen je Kamera mit eigenem ByteTrack.
+
+    Args:
+        channels (list[CameraChannel]): Kamerakanäle mit gestarteten Kameradiensten.
+        detector: Gemeinsamer Detektor (siehe `detect_batch`).
+        frame_ready (threading.Event): Von allen Kameradiensten bei neuen Frames gesetzt.
+
+    Returns:
+        bool: True, wenn die Zählung wegen des Konfigurationsmodus pausiert wurde.
+    """
+    stats = get_stage_stats()
+    active = list(channels)
+    last_report = time.monotonic()
+
+    while active:
+        # Prüfen, ob der Modus gewechselt wurde bzw. neu geladen werden soll
+        if not is_counting_mode():
+            print("[INFO] Konfigurationsmodus erkannt – Zählung wird gestoppt.")
+            return True
+        if _reload_requested.is_set():
+            reload_camera_configs(channels)
+
+        start = time.perf_counter()
+        frame_ready.wait(1.0)
+        frame_ready.clear()
+        stats.record("capture", time.perf_counter() - start)
+
+        # ── Neueste Frames einsammeln, statische Szenen überspringen ──
+        batch = []
+        for channel in list(active):
+            try:
+                frame = channel.poll()
+            except StopIteration:
+                print(f"[INFO] Bildquelle erschöpft – Kamera {channel.camera_id} beendet.")
+                active.remove(channel)
+                continue
+            if frame is None or skip_static_frame(channel.gate, frame, channel.results):
+                continue
+            batch.append((channel, frame))
+        if not batch:
+            continue
+
+        # ── Gemeinsame Inferenz, dann Tracking & Zählung je Kamera ──
+        detections, speed = detect_batch(detector, [c.counter.inference_input(f) for c, f in batch])
+        stats.record("preprocess", speed.get("preprocess", 0.0) / 1000)
+        stats.record("inference", (speed.get("inference", 0.0) + speed.get("postprocess", 0.0)) / 1000)
+
+        for (channel, frame), dets in zip(batch, detections):
+            results = channel.counter.process(frame, detections=dets)
+            if channel.entry_angle == 180:  # Spezialfall: Richtung 180° → Zählung umkehren
                 results.in_count, results.out_count = results.out_count, results.in_count
+            channel.results = results
+            stats.frame_done()
+
+        export_multi_counts([channel for channel, _ in batch], channels)
+        publish_stage_stats(channels[0].counter, extra={"cameras": camera_stats(channels)})
+
+        if time.monotonic() - last_report >= PIPELINE_STATS_INTERVAL:
+            print(f"[PERF] {get_stage_stats().format_stats()}")
+            for channel in channels:
+                print(f"[PERF] {channel.camera_id}: {format_track_stats(channel.counter)}")
+            last_report = time.monotonic()
+
+    print("[INFO] Alle Bildquellen erschöpft – Zählung wird beendet.")
+    return False
 
-            # Zähldaten exportieren
-            export_counts(results)
+def main_multi_camera(specs: list[dict]) -> None:
+    """Mehrkamerabetrieb: ein Prozess, ein geladenes Modell, je Kamera eigener Counter.
 
-            # Debug-Vorschau (optional)
-            if not HEADLESS_MODE:
-                frame_to_show = results.plot_im
-                if "window_initialized" not in globals():
-                    cv2.namedWindow("Zählung", cv2.WINDOW_NORMAL)
-                    globals()["window_initialized"] = True
+    Die Kameradienste laufen dauerhaft; der Steuer-Socket liefert Standbilder der
+    ersten Kamera (Konfiguration im Dashboard) und nimmt MODE/RELOAD entgegen.
+
+    Args:
+        specs (list[dict]): Einträge aus cameras.json.
+    """
+    frame_ready = threading.Event()
+    services = {}
+    for spec in specs:
+        source = create_source(spec["source"], FRAME_WIDTH, FRAME_HEIGHT, FRAME_RATE,
+                               realtime=True, drop_late=True, num_buffers=PIPELINE_QUEUE_SIZE + 2)
+        services[spec["id"]] = CameraService(source, notify=frame_ready)
+
+    control = ControlServer(CAMERA_SOCKET_PATH)
+    control.on("MODE", handle_mode_command)
+    control.on("RELOAD", handle_reload_command)
+    next(iter(services.values())).register_commands(control)
+    for camera_id, service in services.items():
+        service.start()
+        print(f"[INFO] Kamera {camera_id}: {service.describe()}")
+    control.start()
+    start_retention_job()
+
+    model, detector = None, None
+    channels: list[CameraChannel] = []
+    try:
+        while True:
+            # Warten, bis der Zählmodus aktiv und mindestens eine Kamera konfiguriert ist
+            print("[INFO] Warte auf Konfiguration – Kameras bleiben für Standbilder aktiv.")
+            configs = {}
+            while True:
+                if is_counting_mode():
+                    configs = {spec["id"]: resolve_camera_config(spec) for spec in specs}
+                    configs = {camera_id: c for camera_id, c in configs.items() if c is not None}
+                    if configs:
+                        break
+                _reload_requested.wait(LOCK_POLL_INTERVAL)
+                _reload_requested.clear()
+            _reload_requested.clear()
+
+            # Modell nur einmal laden; je Kamera eigener Counter mit eigenem ByteTrack
+            if detector is None:
+                model, detector = create_shared_detector()
+            known = {channel.camera_id for channel in channels}
+            for camera_id, (bbox, entry_angle) in configs.items():
+                if camera_id in known:
+                    continue
+                counter = create_counter(bbox, entry_angle, headless=True, model=model, detector=detector)
+                gate = create_motion_gate(bbox) if MOTION_GATE else None
+                channels.append(CameraChannel(camera_id, services[camera_id], counter, entry_angle, gate))
+                print(f"[INFO] Kamera {camera_id}: Zählbereich {bbox}, Eintrittsrichtung {entry_angle}°")
+            if known:
+                reload_camera_configs(channels)  # Bereits laufende Kameras: Änderungen während der Pause übernehmen
+
+            if not run_multi_camera(channels, detector, frame_ready):
+                break
 
-                cv2.imshow("Zählung", frame_to_show)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    break
+    except KeyboardInterrupt:
+        print("\n[INFO] Abbruch durch Benutzer.")
+
+    except Exception as e:
+        print(f"[ERROR] Unerwarteter Fehler: {e}")
+
+    finally:
+        control.stop()
+        for service in services.values():
+            service.stop()
+        for channel in channels:
+            print(f"[PERF] {channel.camera_id}: {format_track_stats(channel.counter)}")
+        if channels:
+            publish_stage_stats(channels[0].counter, force=True, extra={"cameras": camera_stats(channels)})
+            print(f"[PERF] {get_stage_stats().format_stats()}")
+        stop_retention_job()
+        close_log_writer()
+        close_live_publisher()
+        print("[INFO] Personenzählung gestoppt.")
+
+# ─── Beenden per SIGTERM ───────────────────────────────────────────────────────
+def handle_sigterm(signum, frame) -> None:
+    """Beendet die Zählung geordnet, damit gepufferte Datenbankzeilen geschrieben werden.
+
+    Args:
+        signum (int): Signalnummer.
+        frame: Aktueller Stack-Frame (ungenutzt).
+    """
+    raise SystemExit(0)
+
+def handle_sighup(signum, frame) -> None:
+    """Konfiguration neu laden (gleichwertig zum Socket-Befehl RELOAD).
+
+    Args:
+        signum (int): Signalnummer.
+        frame: Aktueller Stack-Frame (ungenutzt).
+    """
+    _reload_requested.set()
+
+# ─── Hauptfunktion ─────────────────────────────────────────────────────────────
+def main() -> None:
+    """Startet die Live-Personenzählung mit Kamera und ObjectCounter.
+
+    Ablauf:
+    - Startet den Kameradienst (Bildquelle CAMERA_SOURCE) und den Steuer-Socket
+      (MODE, RELOAD, Standbilder)
+    - Lädt Bounding Box und Richtungskonfiguration (wartet ggf. darauf)
+    - Initialisiert den ObjectCounter einmalig; neue Konfigurationen per RELOAD ohne Neustart
+    - Führt kontinuierliche Erkennung durch
+    - Exportiert Zähldaten als JSON + SQLite
+    - Unterstützt Debug-Modus mit OpenCV-Vorschau (optional)
+    """
+    print("[INFO] Starte Personenzählung mit direkter Kamera...")
+    signal.signal(signal.SIGTERM, handle_sigterm)  # ekspar.py beendet per terminate()
+    signal.signal(signal.SIGHUP, handle_sighup)    # kill -HUP: Konfiguration neu laden
+
+    # ── Mehrere Kameras (cameras.json) ──
+    camera_specs = load_camera_specs(CAMERAS_CONFIG_PATH)
+    if camera_specs:
+        print(f"[INFO] Mehrkamerabetrieb: {len(camera_specs)} Kameras, ein gemeinsames Modell.")
+        main_multi_camera(camera_specs)
+        return
+
+    # ── Konfiguration laden ──
+    config = load_config()
+    if config is None and not CAMERA_SERVICE:
+        print("[ERROR] Kein Zählbereich bzw. keine gültige Richtungskonfiguration definiert.")
+        return
+
+    # ── Kameradienst starten (Kamera, Video, Bildverzeichnis oder synthetisch) ──
+    source = create_source(CAMERA_SOURCE, FRAME_WIDTH, FRAME_HEIGHT, FRAME_RATE,
+                           realtime=True, drop_late=True, num_buffers=PIPELINE_QUEUE_SIZE + 2)
+    service = CameraService(source)
+    control = ControlServer(CAMERA_SOCKET_PATH)
+    control.on("MODE", handle_mode_command)
+    control.on("RELOAD", handle_reload_command)
+    if CAMERA_SERVICE:
+        service.register_commands(control)
+    service.start()
+    control.start()
+    start_retention_job()
+    print(f"[INFO] Bildquelle: {service.describe()}")
+
+    counter = None
+    gate = None
+    pool = None
+    try:
+        while True:
+            if config is None or not is_counting_mode():
+                config = wait_for_config()
+            bbox, entry_angle = config
+            print(f"[INFO] Eintrittsrichtung: {entry_angle}° → Gegenrichtung: {(entry_angle + 180) % 360}°")
+
+            # Modell nur einmal laden, bei späteren Konfigurationen nur den Zählbereich tauschen
+            _reload_requested.clear()
+            if counter is None:
+                pool = create_worker_pool() if INFERENCE_WORKERS > 0 else None
+                counter = create_counter(bbox, entry_angle, detector=pool)
+                gate = create_motion_gate(bbox) if MOTION_GATE else None
+            else:
+                apply_config(counter, gate, bbox)
+
+            if pool is not None:
+                paused = run_pooled(service, counter, entry_angle, gate, pool)
+            elif PIPELINE_MODE:
+                paused = run_pipelined(service, counter, entry_angle, gate)
+            else:
+                paused = run_sequential(service, counter, entry_angle, gate)
+
+            if not paused or not CAMERA_SERVICE:
+                break
+            config = None
 
     except KeyboardInterrupt:
         print("\n[INFO] Abbruch durch Benutzer.")
@@ -267,7 +1244,23 @@ def main() -> None:
         print(f"[ERROR] Unerwarteter Fehler: {e}")
 
     finally:
-        picam2.stop()
+        control.stop()
+        service.stop()
+        if pool is not None:
+            print(f"[PERF] {pool.format_stats()}")
+            pool.stop()
+        if gate is not None:
+            print(f"[PERF] {gate.format_stats()}")
+        if counter is not None:
+            print(f"[PERF] {format_track_stats(counter)}")
+            publish_stage_stats(counter, gate, force=True,
+                                extra={"workers": pool.stats()} if pool is not None else None)
+            print(f"[PERF] {get_stage_stats().format_stats()}")
+        if service.snapshots:
+            print(f"[PERF] Kameradienst: {service.snapshots} Standbilder (zuletzt {service.last_snapshot_ms:.0f}ms)")
+        stop_retention_job()
+        close_log_writer()
+        close_live_publisher()
         if not HEADLESS_MODE:
             cv2.destroyAllWindows()
         print("[INFO] Personenzählung gestoppt.")
@@ -0,0 +1,241 @@
+# backend/detection/pipeline.py – Pipeline-Stufen für die Live-Zählung
+"""
+Entkoppelt Bildaufnahme, Inferenz/Tracking und Export der Zähldaten.
+
+Die Aufnahme und der Export laufen in eigenen Threads. Die Aufnahme legt Frames
+in einen Slot für genau einen Frame ab, ein neuer Frame verdrängt den alten – die
+Inferenz arbeitet so immer auf dem aktuellsten Frame. Zählergebnisse gehen über eine
+unbegrenzte Queue an den Export und werden nie verworfen (ein langsamer Commit
+verzögert den Export nur, ohne Zeilen zu verlieren). Jedes Ergebnis trägt den
+Aufnahmezeitpunkt (Wanduhr) seines Frames bis zum Export mit – auch wenn sich nach
+einem Stau viele Ergebnisse kurz hintereinander entladen, behalten die Datensätze
+so ihren zeitlichen Abstand.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Begrenzte Queue mit Drop-Oldest-Strategie
+# ────────────────────────────────────────────────────────────────────────────────
+class DropOldestQueue:
+    """
+    Thread-sichere, begrenzte Queue, die bei Überlauf das älteste Element verwirft.
+
+    Attributes:
+        maxsize (int): Maximale Anzahl gepufferter Elemente.
+        dropped (int): Anzahl der bisher verworfenen Elemente.
+    """
+
+    def __init__(self, maxsize: int = 2) -> None:
+        self.maxsize = max(1, maxsize)
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item: Any) -> None:
+        """
+        Legt ein Element ab und verdrängt bei voller Queue das älteste.
+
+        Args:
+            item (Any): Abzulegendes Element.
+        """
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None) -> Any | None:
+        """
+        Entnimmt das älteste Element und wartet bei Bedarf darauf.
+
+        Args:
+            timeout (float | None): Maximale Wartezeit in Sekunden.
+
+        Returns:
+            Any | None: Element oder None bei Timeout bzw. geschlossener Queue.
+        """
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def qsize(self) -> int:
+        """Gibt die aktuelle Füllhöhe der Queue zurück."""
+        with self._cond:
+            return len(self._items)
+
+    def close(self) -> None:
+        """Schließt die Queue und weckt alle wartenden Konsumenten."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔁 Zähl-Pipeline (Aufnahme → Inferenz → Export)
+# ────────────────────────────────────────────────────────────────────────────────
+class CountingPipeline:
+    """
+    Führt Aufnahme und Export in Hintergrund-Threads aus.
+
+    Die Inferenz selbst läuft im aufrufenden Thread (z. B. für die OpenCV-Vorschau):
+    Frames werden mit `get_frame()` abgeholt und Ergebnisse mit `publish()` an den
+    Export übergeben.
+
+    Args:
+        capture_fn (Callable[[], Any]): Liefert den nächsten Kameraframe (blockierend).
+        export_fn (Callable[[Any, float], None]): Exportiert ein Zählergebnis mit dem
+            Aufnahmezeitpunkt seines Frames (`time.time()`).
+        queue_size (int): Kapazität des Frame-Slots (1 = nur der neueste Frame).
+    """
+
+    def __init__(
+        self,
+        capture_fn: Callable[[], Any],
+        export_fn: Callable[[Any, float], None],
+        queue_size: int = 1,
+    ) -> None:
+        self.capture_fn = capture_fn
+        self.export_fn = export_fn
+        self.frame_queue = DropOldestQueue(queue_size)
+        self.export_queue: queue.Queue = queue.Queue()  # Unbegrenzt: Zählzeilen gehen nie verloren
+        self.error: Exception | None = None
+
+        self._running = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._captured = 0
+        self._processed = 0
+        self._exported = 0
+        self._latency_sum = 0.0
+        self._started_at = 0.0
+
+    # ── Lebenszyklus ──
+    def start(self) -> None:
+        """Startet den Aufnahme- und den Export-Thread."""
+        self._running.set()
+        self._started_at = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="ekspar-capture", daemon=True),
+            threading.Thread(target=self._export_loop, name="ekspar-export", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Stoppt alle Stufen; bereits übergebene Ergebnisse werden noch exportiert.
+
+        Args:
+            timeout (float): Maximale Wartezeit pro Thread in Sekunden.
+        """
+        self._running.clear()
+        self.frame_queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        """True, solange die Pipeline läuft und kein Stufenfehler aufgetreten ist."""
+        return self._running.is_set() and self.error is None
+
+    # ── Schnittstelle für die Inferenz-Stufe ──
+    def get_frame(self, timeout: float = 1.0) -> tuple[int, float, Any] | None:
+        """
+        Holt den aktuellsten aufgenommenen Frame.
+
+        Args:
+            timeout (float): Maximale Wartezeit in Sekunden.
+
+        Returns:
+            tuple | None: (Sequenznummer, Aufnahmezeitpunkt, Frame) oder None bei Timeout.
+        """
+        return self.frame_queue.get(timeout)
+
+    def publish(self, seq: int, captured_at: float, results: Any) -> None:
+        """
+        Übergibt ein Zählergebnis an die Export-Stufe.
+
+        Args:
+            seq (int): Sequenznummer des zugehörigen Frames.
+            captured_at (float): Aufnahmezeitpunkt (`time.time()`).
+            results: Ergebnisobjekt des ObjectCounters.
+        """
+        with self._lock:
+            self._processed += 1
+        self.export_queue.put((seq, captured_at, results))
+
+    # ── Stufen ──
+    def _capture_loop(self) -> None:
+        """Nimmt fortlaufend Frames auf und legt sie in die Frame-Queue."""
+        try:
+            while self._running.is_set():
+                frame = self.capture_fn()
+                captured_at = time.time()  # Wanduhr: dient zugleich als Zeitstempel des Datensatzes
+                with self._lock:
+                    self._seq += 1
+                    self._captured += 1
+                    seq = self._seq
+                self.frame_queue.put((seq, captured_at, frame))
+        except Exception as e:
+            self.error = e
+            self.frame_queue.close()
+
+    def _export_loop(self) -> None:
+        """Exportiert übergebene Ergebnisse, bis die Pipeline gestoppt und die Queue leer ist."""
+        while True:
+            try:
+                item = self.export_queue.get(timeout=0.5)
+            except queue.Empty:
+                if not self._running.is_set():
+                    break
+                continue
+            _, captured_at, results = item
+            self.export_fn(results, captured_at)
+            with self._lock:
+                self._exported += 1
+                self._latency_sum += max(0.0, time.time() - captured_at)
+
+    # ── Statistiken ──
+    def stats(self) -> dict:
+        """
+        Liefert Durchsatz, Latenz, Queue-Tiefen und verworfene Frames der Pipeline.
+
+        Returns:
+            dict: Kennzahlen je Stufe.
+        """
+        with self._lock:
+            elapsed = max(time.perf_counter() - self._started_at, 1e-6)
+            exported = self._exported
+            return {
+                "captured": self._captured,
+                "processed": self._processed,
+                "exported": exported,
+                "fps": self._processed / elapsed,
+                "avg_latency_ms": (self._latency_sum / exported * 1000) if exported else 0.0,
+                "capture_queue_depth": self.frame_queue.qsize(),
+                "capture_drops": self.frame_queue.dropped,
+                "export_queue_depth": self.export_queue.qsize(),
+            }
+
+    def format_stats(self) -> str:
+        """Formatiert die Kennzahlen als einzeilige Log-Ausgabe."""
+        s = self.stats()
+        return (
+            f"FPS: {s['fps']:.1f} | Latenz: {s['avg_latency_ms']:.0f}ms | "
+            f"Aufnahme: {s['captured']} (Queue {s['capture_queue_depth']}, Drops {s['capture_drops']}) | "
+            f"Export: {s['exported']} (Queue {s['export_queue_depth']})"
+        )
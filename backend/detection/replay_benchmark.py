@@ -0,0 +1,315 @@
+# backend/detection/replay_benchmark.py – Offline-Benchmark der Zählpipeline
+"""
+Spielt ein Video, ein Verzeichnis mit Einzelbildern oder synthetische Frames
+(`backend/camera/sources.py`) durch denselben ObjectCounter und denselben
+Exportpfad wie die Live-Zählung – ohne Kamera.
+
+Gemessen werden FPS, p50/p95/p99-Latenzen je Stufe (Lesen, Verarbeitung,
+Export), der maximale Speicherbedarf (RSS) und die finalen IN/OUT-Zahlen.
+Frames, die der Bewegungsfilter ohne Inferenz überspringt, werden getrennt
+gezählt; `fps_inferred` bezieht sich nur auf Frames mit Inferenz.
+Das Ergebnis wird als JSON ausgegeben.
+
+Beispiele:
+    python backend/detection/replay_benchmark.py --source aufnahme.mp4 --realtime
+
+    # Einzelprozess vs. vier Inferenz-Worker (je ein Kern) vergleichen
+    python backend/detection/replay_benchmark.py --source aufnahme.mp4 --engine ncnn --workers 0
+    python backend/detection/replay_benchmark.py --source aufnahme.mp4 --engine ncnn --workers 4
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.detection import person_counter as pc
+from backend.camera.sources import CameraSource, create_source
+from backend.detection.pipeline import CountingPipeline
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Auswertung
+# ────────────────────────────────────────────────────────────────────────────────
+def summarize(samples: list[float]) -> dict:
+    """
+    Berechnet Perzentile einer Latenzreihe in Millisekunden.
+
+    Args:
+        samples (list[float]): Messwerte in Sekunden.
+
+    Returns:
+        dict: Anzahl, Mittelwert und p50/p95/p99 in ms.
+    """
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    arr = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": len(samples),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Maximaler Speicherbedarf (RSS) des Prozesses in MB (Linux: ru_maxrss in KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ▶️ Replay
+# ────────────────────────────────────────────────────────────────────────────────
+def run_replay(source: CameraSource, bbox: dict, entry_angle: int, pipelined: bool = False,
+               motion_gate: bool = False, workers: int = 0, cores: list[int] | None = None) -> dict:
+    """
+    Verarbeitet alle Frames der Quelle mit ObjectCounter und Export der Live-Zählung.
+
+    Args:
+        source (CameraSource): Gestartete Bildquelle.
+        bbox (dict): Zählbereich mit 'x', 'y', 'w', 'h'.
+        entry_angle (int): Eintrittsrichtung in Grad.
+        pipelined (bool): True = Pipeline-Modus (Lesen/Export in eigenen Threads).
+        motion_gate (bool): True = Bewegungsfilter vor der Inferenz.
+        workers (int): >0 = Inferenz in so vielen Worker-Prozessen (InferenceWorkerPool).
+        cores (list[int] | None): Kerne der Worker (None = alle verfügbaren Kerne).
+
+    Returns:
+        dict: Benchmark-Ergebnis.
+    """
+    load_start = time.perf_counter()
+    pool = None
+    if workers > 0:
+        # Slots für die Ausgabegröße der Quelle; bei nativer Auflösung bis 4K
+        max_shape = (source.height, source.width, 3) if source.width and source.height else (2160, 3840, 3)
+        pool = pc.create_worker_pool(workers, cores, max_frame_shape=max_shape)
+    counter = pc.create_counter(bbox, entry_angle, headless=True, detector=pool)
+    gate = pc.create_motion_gate(bbox) if motion_gate else None
+    load_time = time.perf_counter() - load_start
+
+    read_times: list[float] = []
+    process_times: list[float] = []  # Nur Frames mit Inferenz
+    skip_times: list[float] = []     # Vom Bewegungsfilter ohne Inferenz übersprungene Frames
+    export_times: list[float] = []
+
+    def timed_read():
+        frame = source.read()
+        read_times.append(source.last_read_s)  # Ohne Wartezeit der Echtzeit-Taktung
+        return frame
+
+    def timed_export(results, captured_at: float | None = None) -> None:
+        start = time.perf_counter()
+        pc.export_counts(results, captured_at)
+        export_times.append(time.perf_counter() - start)
+
+    def timed_skip(frame, last_results) -> bool:
+        start = time.perf_counter()
+        skipped = pc.skip_static_frame(gate, frame, last_results)
+        if skipped:
+            skip_times.append(time.perf_counter() - start)
+        return skipped
+
+    def timed_process(frame, last_results):
+        start = time.perf_counter()
+        if timed_skip(frame, last_results):
+            return last_results
+        results = pc.process_frame(counter, frame, entry_angle, None, last_results)  # Filter bereits geprüft
+        process_times.append(time.perf_counter() - start)
+        return results
+
+    def timed_process_detections(item):
+        seq, detections, speed = item
+        start = time.perf_counter()
+        results = pc.process_detections(counter, frames.pop(seq), detections, speed, entry_angle)
+        process_times.append(time.perf_counter() - start)
+        timed_export(results)
+        return results
+
+    results = None
+    pipeline_stats = None
+    frames = {}  # Sequenznummer → Vollbild (nur mit Worker-Pool)
+    start = time.perf_counter()
+    try:
+        if pool is not None:
+            while True:
+                if pool.has_capacity():
+                    try:
+                        frame = timed_read()
+                    except StopIteration:
+                        break
+                    if not timed_skip(frame, results):
+                        if source.reuses_buffers:
+                            frame = frame.copy()  # Ringpuffer: Frame bleibt bis zur Zählung in Arbeit
+                        frames[pool.submit(counter.inference_input(frame))] = frame
+                else:
+                    item = pool.get(timeout=None)
+                    if item is not None:
+                        results = timed_process_detections(item)
+                item = pool.get(timeout=0)
+                while item is not None:
+                    results = timed_process_detections(item)
+                    item = pool.get(timeout=0)
+            while pool.in_flight:
+                item = pool.get(timeout=None)
+                if item is not None:
+                    results = timed_process_detections(item)
+        elif pipelined:
+            pipeline = CountingPipeline(capture_fn=timed_read, export_fn=timed_export,
+                                        queue_size=pc.PIPELINE_QUEUE_SIZE)
+            pipeline.start()
+            try:
+                while True:
+                    item = pipeline.get_frame(timeout=1.0)
+                    if item is None:
+                        if not pipeline.running:  # Quelle erschöpft, Queue geleert
+                            break
+                        continue
+                    seq, captured_at, frame = item
+                    results = timed_process(frame, results)
+                    pipeline.publish(seq, captured_at, results)
+            finally:
+                pipeline.stop()
+            if pipeline.error is not None and not isinstance(pipeline.error, StopIteration):
+                raise pipeline.error
+            pipeline_stats = pipeline.stats()
+        else:
+            while True:
+                try:
+                    frame = timed_read()
+                except StopIteration:
+                    break
+                results = timed_process(frame, results)
+                timed_export(results)
+    finally:
+        pc.publish_stage_stats(counter, gate, force=True)
+        pc.close_log_writer()
+        pc.close_live_publisher()
+        if pool is not None:
+            pool_stats = pool.stats()
+            pool.stop()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "frames_read": source.frames_read,
+        "frames_inferred": len(process_times),
+        "frames_skipped_motion": len(skip_times),
+        "frames_skipped_realtime": source.frames_skipped,
+        "elapsed_s": round(elapsed, 3),
+        "fps_inferred": round(len(process_times) / elapsed, 2) if elapsed > 0 else 0.0,
+        "model_load_s": round(load_time, 3),
+        "stages": {
+            "read": summarize(read_times),
+            "process": summarize(process_times),
+            "motion_skip": summarize(skip_times),
+            "export": summarize(export_times),
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "in_count": getattr(results, "in_count", 0),
+        "out_count": getattr(results, "out_count", 0),
+        "track_stats": counter.track_stats(),
+        "stage_stats": pc.get_stage_stats().snapshot()["stages"],
+    }
+    if gate is not None:
+        report["motion_gate"] = {"processed": gate.processed, "skipped": gate.skipped}
+    if pipeline_stats is not None:
+        report["pipeline_stats"] = pipeline_stats
+    if pool is not None:
+        report["workers"] = pool_stats
+    return report
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    """Liest die Kommandozeilenargumente."""
+    parser = argparse.ArgumentParser(description="Offline-Benchmark der EKSPAR-Zählpipeline")
+    parser.add_argument("--source", required=True, help="Videodatei, Verzeichnis mit Bildern oder 'synthetic'")
+    parser.add_argument("--realtime", action="store_true", help="In Echtzeit takten statt maximaler Geschwindigkeit")
+    parser.add_argument("--fps", type=float, default=None, help="Wiedergaberate (Standard: Rate des Videos)")
+    parser.add_argument("--native-size", action="store_true",
+                        help="Frames nicht auf FRAME_WIDTH x FRAME_HEIGHT skalieren")
+    parser.add_argument("--max-frames", type=int, default=None, help="Maximale Anzahl Frames")
+    parser.add_argument("--bbox", default=None, help="Zählbereich als x,y,w,h (Standard: bbox_config.json)")
+    parser.add_argument("--angle", type=int, default=None, help="Eintrittsrichtung (Standard: direction_config.json)")
+    parser.add_argument("--model", default=None, help="Modellpfad (Standard: MODEL_PATH)")
+    parser.add_argument("--engine", choices=["ultralytics", "ncnn"], default=None, help="Inferenz-Engine")
+    parser.add_argument("--pipeline", action="store_true", help="Pipeline-Modus (Lesen/Export in Threads)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Inferenz in N Worker-Prozessen, je einer pro Kern (0 = im Hauptprozess)")
+    parser.add_argument("--cores", default=None, help="Kerne der Worker als Liste, z. B. 1,2,3 (Standard: alle)")
+    parser.add_argument("--motion-gate", action="store_true", help="Bewegungsfilter aktivieren")
+    parser.add_argument("--export-dir", default=None, help="Zielverzeichnis für counter.json/log.db (Standard: temp)")
+    parser.add_argument("--output", default=None, help="Ergebnis zusätzlich als JSON-Datei speichern")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Startet den Replay-Benchmark und gibt das Ergebnis als JSON aus."""
+    args = parse_args()
+
+    # ── Zählbereich & Richtung ──
+    if args.bbox:
+        x, y, w, h = (int(v) for v in args.bbox.split(","))
+        bbox = {"x": x, "y": y, "w": w, "h": h}
+    else:
+        bbox = pc.load_bbox()
+    if not bbox:
+        print("[ERROR] Kein Zählbereich definiert (--bbox oder bbox_config.json).")
+        sys.exit(1)
+
+    if args.angle is not None:
+        entry_angle = args.angle
+    else:
+        direction = pc.load_direction_config() or {}
+        entry_angle = direction.get("angle", 0)
+
+    # ── Export in separates Verzeichnis umleiten (keine Produktionsdaten überschreiben) ──
+    export_dir = args.export_dir or tempfile.mkdtemp(prefix="ekspar_replay_")
+    os.makedirs(export_dir, exist_ok=True)
+    pc.EXPORT_PATH = os.path.join(export_dir, "counter.json")
+    pc.LIVE_STATE_PATH = os.path.join(export_dir, "counter.bin")
+    pc.LOG_DB_PATH = os.path.join(export_dir, "log.db")
+    pc.STATS_PATH = os.path.join(export_dir, "stats.json")
+    if args.model:
+        pc.MODEL_PATH = args.model
+    if args.engine:
+        pc.INFERENCE_ENGINE = args.engine
+
+    width, height = (None, None) if args.native_size else (pc.FRAME_WIDTH, pc.FRAME_HEIGHT)
+    source = create_source(args.source, width, height, args.fps, realtime=args.realtime, drop_late=True,
+                           max_frames=args.max_frames, num_buffers=pc.PIPELINE_QUEUE_SIZE + 2)
+    cores = [int(c) for c in args.cores.split(",")] if args.cores else None
+    source.start()
+    try:
+        report = run_replay(source, bbox, entry_angle, pipelined=args.pipeline, motion_gate=args.motion_gate,
+                            workers=args.workers, cores=cores)
+    finally:
+        source.stop()
+
+    report.update({
+        "source": source.describe(),
+        "engine": pc.INFERENCE_ENGINE,
+        "model": pc.MODEL_PATH,
+        "realtime": args.realtime,
+        "pipeline": args.pipeline,
+        "export_dir": export_dir,
+    })
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
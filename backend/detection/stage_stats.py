@@ -0,0 +1,221 @@
+# backend/detection/stage_stats.py – Laufzeitmessung je Pipeline-Stufe
+"""
+Dauerhaft aktive, leichtgewichtige Zeitmessung der Zählpipeline.
+
+Für jede Stufe (Aufnahme, Bewegungsfilter, Vorverarbeitung, Inferenz, Tracking,
+Zählung, Export) werden die letzten Messwerte in einem Ringpuffer fester Größe
+gehalten. Daraus werden bei Bedarf Perzentile und ein Histogramm mit festen
+Klassengrenzen berechnet und periodisch atomar als JSON-Datei veröffentlicht
+(z. B. `data/stats.json`), die das Dashboard auf der Seite „System“ anzeigt.
+
+Das Aufzeichnen kostet pro Messwert nur einen Eintrag in ein vorab allokiertes
+Array; Auswertung und Schreiben erfolgen höchstens alle paar Sekunden.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import datetime
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# ─── Konstanten ────────────────────────────────────────────────────────────────
+STAGES = ("capture", "motion_gate", "preprocess", "inference", "tracking", "counting", "export")
+BUCKET_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)  # Letzte Klasse: ≥ 1000 ms
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Rollierendes Histogramm
+# ────────────────────────────────────────────────────────────────────────────────
+class RollingHistogram:
+    """
+    Hält die letzten `size` Messwerte (ms) einer Stufe in einem Ringpuffer.
+
+    Args:
+        size (int): Anzahl der berücksichtigten Messwerte.
+    """
+
+    def __init__(self, size: int = 512) -> None:
+        self.size = max(1, size)
+        self.total = 0          # Messwerte seit Start
+        self.total_ms = 0.0     # Summe seit Start
+        self._values = np.zeros(self.size, dtype=np.float32)
+        self._index = 0
+
+    def add(self, value_ms: float) -> None:
+        """Legt einen Messwert ab und überschreibt bei vollem Puffer den ältesten."""
+        self._values[self._index] = value_ms
+        self._index = (self._index + 1) % self.size
+        self.total += 1
+        self.total_ms += value_ms
+
+    def summary(self) -> dict:
+        """
+        Wertet das aktuelle Fenster aus.
+
+        Returns:
+            dict: Anzahl, Mittelwert, p50/p95/p99, Maximum (ms) und Histogramm über BUCKET_EDGES_MS.
+        """
+        n = min(self.total, self.size)
+        if n == 0:
+            return {"count": 0, "total": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0,
+                    "p99_ms": 0.0, "max_ms": 0.0, "histogram": [0] * (len(BUCKET_EDGES_MS) + 1)}
+        values = self._values[:n]
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        buckets = np.bincount(np.searchsorted(BUCKET_EDGES_MS, values, side="right"),
+                              minlength=len(BUCKET_EDGES_MS) + 1)
+        return {
+            "count": int(n),
+            "total": self.total,
+            "mean_ms": round(float(values.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(values.max()), 3),
+            "histogram": buckets.tolist(),
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱ StageStats
+# ────────────────────────────────────────────────────────────────────────────────
+class StageStats:
+    """
+    Sammelt Laufzeiten je Stufe und veröffentlicht sie periodisch als JSON-Datei.
+
+    Thread-sicher: Aufnahme- und Export-Thread der Pipeline zeichnen parallel zur Inferenz auf.
+
+    Args:
+        path (str | None): Zieldatei (z. B. data/stats.json); None = nur im Speicher.
+        window (int): Messwerte pro Stufe im rollierenden Fenster.
+        publish_interval (float): Mindestabstand zwischen zwei Veröffentlichungen in Sekunden.
+    """
+
+    def __init__(self, path: str | None = None, window: int = 512, publish_interval: float = 2.0) -> None:
+        self.path = path
+        self.window = window
+        self.publish_interval = publish_interval
+
+        self._lock = threading.Lock()
+        self._stages = {name: RollingHistogram(window) for name in STAGES}
+        self._frame_times = deque(maxlen=window)
+        self._frames_processed = 0
+        self._frames_skipped = 0
+        self._started_at = time.monotonic()
+        self._last_publish = 0.0
+
+    # ── Aufzeichnen ──
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Zeichnet die Dauer einer Stufe auf.
+
+        Args:
+            stage (str): Name der Stufe (unbekannte Namen werden als neue Stufe angelegt).
+            seconds (float): Dauer in Sekunden.
+        """
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = RollingHistogram(self.window)
+            hist.add(seconds * 1000)
+
+    def frame_done(self, processed: bool = True) -> None:
+        """
+        Markiert einen abgeschlossenen Frame für die FPS-Berechnung.
+
+        Args:
+            processed (bool): False, wenn der Bewegungsfilter Inferenz und Tracking übersprungen hat.
+        """
+        with self._lock:
+            self._frame_times.append(time.monotonic())
+            if processed:
+                self._frames_processed += 1
+            else:
+                self._frames_skipped += 1
+
+    # ── Auswerten ──
+    def fps(self) -> float:
+        """Bildrate über das rollierende Fenster."""
+        with self._lock:
+            if len(self._frame_times) < 2:
+                return 0.0
+            span = self._frame_times[-1] - self._frame_times[0]
+            return (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def snapshot(self, extra: dict | None = None) -> dict:
+        """
+        Liefert alle Kennzahlen als JSON-taugliches Dict.
+
+        Args:
+            extra (dict | None): Zusätzliche Kennzahlen (z. B. Queue-Drops, DB-Commits).
+
+        Returns:
+            dict: Zeitstempel, FPS, Frame-Zähler, Auswertung je Stufe und Klassengrenzen des Histogramms.
+        """
+        fps = self.fps()
+        with self._lock:
+            stages = {name: hist.summary() for name, hist in self._stages.items()}
+            frames = {
+                "processed": self._frames_processed,
+                "skipped": self._frames_skipped,
+            }
+        return {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "uptime_s": round(time.monotonic() - self._started_at, 1),
+            "fps": round(fps, 2),
+            "frames": frames,
+            "bucket_edges_ms": list(BUCKET_EDGES_MS),
+            "stages": stages,
+            "extra": extra or {},
+        }
+
+    # ── Veröffentlichen ──
+    def publish_due(self) -> bool:
+        """True, wenn seit der letzten Veröffentlichung `publish_interval` Sekunden vergangen sind."""
+        return self.path is not None and time.monotonic() - self._last_publish >= self.publish_interval
+
+    def publish(self, extra: dict | None = None) -> None:
+        """
+        Schreibt den aktuellen Snapshot atomar (temporäre Datei + os.replace).
+
+        Args:
+            extra (dict | None): Zusätzliche Kennzahlen für den Snapshot.
+        """
+        self._last_publish = time.monotonic()
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(extra), f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def format_stats(self) -> str:
+        """Formatiert FPS und p95 je Stufe als einzeilige Log-Ausgabe."""
+        snap = self.snapshot()
+        stages = ", ".join(
+            f"{name} {s['p95_ms']:.1f}" for name, s in snap["stages"].items() if s["count"]
+        )
+        return f"Stufen p95 (ms): {stages or '–'} | {snap['fps']:.1f} FPS"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Lesen (Dashboard)
+# ────────────────────────────────────────────────────────────────────────────────
+def read_stage_stats(path: str) -> dict | None:
+    """
+    Liest den zuletzt veröffentlichten Snapshot.
+
+    Args:
+        path (str): Pfad zur Statistikdatei.
+
+    Returns:
+        dict | None: Snapshot oder None, falls nicht vorhanden bzw. nicht lesbar.
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
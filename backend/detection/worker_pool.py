@@ -0,0 +1,340 @@
+# backend/detection/worker_pool.py – Inferenz in mehreren Prozessen
+"""
+Verteilt die Erkennung auf mehrere Worker-Prozesse, je einer pro CPU-Kern.
+
+- Jeder Worker lädt sein eigenes Modell (NCNN mit einem Thread bzw. ultralytics
+  mit `torch.set_num_threads(1)`) und ist per `os.sched_setaffinity` auf einen
+  Kern festgelegt – kein GIL und kein gemeinsamer NCNN-Extractor mehr.
+- Frames werden reihum (Round-Robin) verteilt und über Shared Memory übergeben
+  (je Worker einige feste Slots, keine Pickle-Kopie des Bildes).
+- Die Ergebnisse kommen in beliebiger Reihenfolge zurück und werden vor dem
+  Tracker wieder in Aufnahmereihenfolge gebracht, damit ByteTrack und die Zählung
+  dieselbe Frame-Folge sehen wie im Einzelprozess.
+
+Die Detektionen werden als ultralytics-`Boxes` (NumPy) geliefert und können direkt
+an `ObjectCounter.process(frame, detections=...)` übergeben werden.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 👷 Worker-Prozess
+# ────────────────────────────────────────────────────────────────────────────────
+def _create_detector(engine: str, model_path: str, threads: int, detector_args: dict):
+    """Lädt das Modell im Worker (nie im Elternprozess, damit nichts geteilt oder geforkt wird)."""
+    if engine == "ncnn":
+        from backend.detection.ncnn_detector import NcnnDetector
+        return NcnnDetector(model_path, num_threads=threads, **detector_args)
+
+    import torch
+    from ultralytics import YOLO
+    from backend.detection.multi_camera import UltralyticsDetector
+    torch.set_num_threads(threads)
+    return UltralyticsDetector(YOLO(model_path), **detector_args)
+
+
+def _worker_main(index: int, core: int | None, engine: str, model_path: str, threads: int,
+                 detector_args: dict, shm_name: str, slot_bytes: int, tasks, results) -> None:
+    """
+    Hauptschleife eines Workers: Frame aus dem Slot lesen, erkennen, Ergebnis zurückschicken.
+
+    Nachrichten an den Elternprozess:
+        ("ready", index, pid)
+        ("done", seq, index, slot, data (N, 6): x1, y1, x2, y2, conf, cls, orig_shape, speed)
+        ("error", index, Meldung)
+    """
+    # STRG+C bzw. SIGTERM an die Prozessgruppe (z. B. systemd) – beendet wird nur über den Elternprozess
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        if core is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {core})
+        # Segment gehört dem Elternprozess (spawn-Worker teilen dessen resource_tracker, daher keine Abmeldung)
+        shm = shared_memory.SharedMemory(name=shm_name)
+        detector = _create_detector(engine, model_path, threads, detector_args)
+    except Exception as e:
+        results.put(("error", index, repr(e)))
+        return
+
+    results.put(("ready", index, os.getpid()))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, shape = task
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            detections = detector.detect(frame)
+            del frame
+            data = np.empty((len(detections.conf), 6), dtype=np.float32)
+            data[:, :4] = detections.xyxy
+            data[:, 4] = detections.conf
+            data[:, 5] = detections.cls
+            results.put(("done", seq, index, slot, data, shape[:2], dict(detector.speed)))
+    except Exception as e:
+        results.put(("error", index, repr(e)))
+    finally:
+        shm.close()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏊 Worker-Pool
+# ────────────────────────────────────────────────────────────────────────────────
+class InferenceWorkerPool:
+    """
+    Pool von Inferenz-Prozessen mit Round-Robin-Verteilung und Rücksortierung der Ergebnisse.
+
+    Args:
+        model_path (str): Modellpfad (NCNN-Verzeichnis bzw. ultralytics-Modell).
+        engine (str): "ncnn" oder "ultralytics".
+        num_workers (int | None): Anzahl Worker (None = ein Worker je verfügbarem Kern).
+        cores (list[int] | None): Kerne, auf die die Worker der Reihe nach festgelegt werden
+            (None = verfügbare Kerne laut `os.sched_getaffinity`).
+        threads (int): Inferenz-Threads je Worker (1 = ein Kern pro Worker).
+        slots_per_worker (int): Gleichzeitig ausstehende Frames je Worker (Shared-Memory-Slots).
+        max_frame_shape (tuple[int, int, int]): Größtes übergebenes Bild (H, W, C) zur Slot-Dimensionierung.
+        detector_args (dict | None): Weitere Argumente für den Detektor (z. B. `imgsz`, `classes`).
+        start_timeout (float): Maximale Wartezeit auf das Laden der Modelle in Sekunden.
+    """
+
+    def __init__(self, model_path: str, engine: str = "ncnn", num_workers: int | None = None,
+                 cores: list[int] | None = None, threads: int = 1, slots_per_worker: int = 2,
+                 max_frame_shape: tuple[int, int, int] = (720, 1280, 3), detector_args: dict | None = None,
+                 start_timeout: float = 120.0) -> None:
+        available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") \
+            else list(range(os.cpu_count() or 1))
+        self.model_path = model_path
+        self.engine = engine
+        self.num_workers = max(1, num_workers or len(available))
+        self.cores = list(cores) if cores else [available[i % len(available)] for i in range(self.num_workers)]
+        self.threads = threads
+        self.slots_per_worker = max(1, slots_per_worker)
+        self.slot_bytes = int(np.prod(max_frame_shape))
+        self.detector_args = detector_args or {}
+        self.start_timeout = start_timeout
+
+        self._processes: list = []
+        self._tasks: list = []
+        self._shms: list[shared_memory.SharedMemory] = []
+        self._free_slots: list[deque] = []
+        self._results = None
+        self._done: dict[int, tuple] = {}
+        self._next_seq = 0   # Nächste zu vergebende Sequenznummer
+        self._next_out = 0   # Nächste in Reihenfolge auszuliefernde Sequenznummer
+
+        # Laufzeiten des zuletzt ausgelieferten Frames in ms (wie NcnnDetector.speed)
+        self.speed = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+
+        # Metriken
+        self.completed = 0
+        self.out_of_order = 0
+        self.per_worker = [0] * self.num_workers
+
+    # ── Lebenszyklus ──
+    def start(self) -> None:
+        """Startet die Worker und wartet, bis alle ihr Modell geladen haben."""
+        ctx = mp.get_context("spawn")  # Kein fork nach dem Laden von torch/ncnn im Elternprozess
+        self._results = ctx.Queue()
+        for index in range(self.num_workers):
+            shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slots_per_worker)
+            tasks = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(index, self.cores[index], self.engine, self.model_path, self.threads,
+                      self.detector_args, shm.name, self.slot_bytes, tasks, self._results),
+                name=f"ekspar-infer-{index}",
+                daemon=True
+            )
+            process.start()
+            self._shms.append(shm)
+            self._tasks.append(tasks)
+            self._processes.append(process)
+            self._free_slots.append(deque(range(self.slots_per_worker)))
+
+        ready = 0
+        deadline = time.monotonic() + self.start_timeout
+        while ready < self.num_workers:
+            try:
+                message = self._results.get(timeout=max(0.1, deadline - time.monotonic()))
+            except queue.Empty:
+                self.stop()
+                raise RuntimeError("Inferenz-Worker nicht rechtzeitig bereit.")
+            if message[0] == "error":
+                self.stop()
+                raise RuntimeError(f"Inferenz-Worker {message[1]}: {message[2]}")
+            ready += 1
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Beendet alle Worker und gibt die Shared-Memory-Segmente frei.
+
+        Args:
+            timeout (float): Maximale Wartezeit je Worker in Sekunden.
+        """
+        for tasks in self._tasks:
+            try:
+                tasks.put(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._processes, self._tasks, self._shms, self._free_slots = [], [], [], []
+
+    def __enter__(self) -> "InferenceWorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── Verteilung ──
+    @property
+    def in_flight(self) -> int:
+        """Anzahl verteilter, noch nicht ausgelieferter Frames."""
+        return self._next_seq - self._next_out
+
+    @property
+    def capacity(self) -> int:
+        """Maximale Anzahl gleichzeitig ausstehender Frames."""
+        return self.num_workers * self.slots_per_worker
+
+    def has_capacity(self) -> bool:
+        """True, wenn der nächste Worker (Round-Robin) einen freien Slot hat."""
+        return bool(self._free_slots[self._next_seq % self.num_workers])
+
+    def submit(self, frame: np.ndarray) -> int:
+        """
+        Übergibt einen Frame an den nächsten Worker (Round-Robin).
+
+        Ist dessen Slot belegt, wird auf Ergebnisse gewartet (Gegendruck statt unbegrenzter Warteschlange).
+
+        Args:
+            frame (np.ndarray): BGR-Bild (uint8, darf ein nicht zusammenhängender ROI-Ausschnitt sein).
+
+        Returns:
+            int: Sequenznummer des Frames.
+
+        Raises:
+            ValueError: Wenn das Bild größer als ein Slot ist.
+        """
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame {frame.shape} größer als Slot ({self.slot_bytes} Bytes).")
+        seq = self._next_seq
+        worker = seq % self.num_workers
+        while not self._free_slots[worker]:
+            self._collect(timeout=None)
+
+        slot = self._free_slots[worker].popleft()
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shms[worker].buf, offset=slot * self.slot_bytes)
+        np.copyto(view, frame)
+        del view
+        self._tasks[worker].put((seq, slot, frame.shape))
+        self._next_seq += 1
+        return seq
+
+    def _collect(self, timeout: float | None) -> bool:
+        """Nimmt eine Worker-Nachricht entgegen und gibt deren Slot frei. False bei Zeitüberschreitung."""
+        while True:
+            try:
+                # Unbegrenzt wird sekundenweise gewartet, damit ein abgestürzter Worker auffällt
+                message = self._results.get(timeout=1.0 if timeout is None else timeout)
+                break
+            except queue.Empty:
+                dead = [p.name for p in self._processes if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Inferenz-Worker beendet: {', '.join(dead)}")
+                if timeout is not None:
+                    return False
+        if message[0] == "error":
+            raise RuntimeError(f"Inferenz-Worker {message[1]}: {message[2]}")
+
+        from ultralytics.engine.results import Boxes  # Format, das BYTETracker direkt verarbeitet
+        _, seq, index, slot, data, orig_shape, speed = message
+        self._free_slots[index].append(slot)
+        if seq != self._next_out:
+            self.out_of_order += 1
+        self._done[seq] = (Boxes(data, tuple(orig_shape)), speed)
+        self.per_worker[index] += 1
+        return True
+
+    def get(self, timeout: float | None = None) -> tuple[int, object, dict] | None:
+        """
+        Liefert das nächste Ergebnis in Aufnahmereihenfolge.
+
+        Args:
+            timeout (float | None): Maximale Wartezeit in Sekunden (0 = nicht blockierend, None = unbegrenzt).
+
+        Returns:
+            tuple | None: (Sequenznummer, Detektionen als `Boxes`, speed in ms) oder None, falls das
+                nächste Ergebnis (noch) nicht vorliegt bzw. nichts aussteht.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._next_out not in self._done:
+            if self.in_flight == 0:
+                return None
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._collect(timeout=remaining if remaining is None or remaining > 0 else 0.001):
+                return None
+
+        seq = self._next_out
+        detections, self.speed = self._done.pop(seq)
+        self._next_out += 1
+        self.completed += 1
+        return seq, detections, self.speed
+
+    def detect(self, frame: np.ndarray):
+        """
+        Synchrone Erkennung eines Frames (Detektor-Schnittstelle, z. B. für `ObjectCounter(detector=...)`).
+
+        Args:
+            frame (np.ndarray): BGR-Bild.
+
+        Returns:
+            Boxes: Detektionen des Frames.
+        """
+        seq = self.submit(frame)
+        while True:
+            item = self.get(timeout=None)
+            if item is not None and item[0] == seq:
+                return item[1]
+
+    # ── Metriken ──
+    def stats(self) -> dict:
+        """
+        Liefert Verteilung und Rücksortierung der Ergebnisse.
+
+        Returns:
+            dict: Worker, Kerne, ausgelieferte Frames je Worker, ausstehende und umsortierte Ergebnisse.
+        """
+        return {
+            "workers": self.num_workers,
+            "cores": self.cores,
+            "engine": self.engine,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "out_of_order": self.out_of_order,
+            "per_worker": list(self.per_worker),
+        }
+
+    def format_stats(self) -> str:
+        """Formatiert die Pool-Kennzahlen als einzeilige Log-Ausgabe."""
+        s = self.stats()
+        return (
+            f"Worker: {s['workers']} Prozesse auf Kernen {s['cores']}, {s['completed']} Frames "
+            f"(je Worker {s['per_worker']}), {s['out_of_order']} umsortiert, {s['in_flight']} ausstehend"
+        )
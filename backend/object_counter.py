@@ -1,11 +1,73 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
-from collections import defaultdict
-from typing import Any, Optional, Tuple
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import yaml
+from ultralytics.engine.model import Model
 from ultralytics.solutions.solutions import BaseSolution, SolutionAnnotator, SolutionResults
+from ultralytics.trackers.byte_tracker import BYTETracker
 from ultralytics.utils.plotting import colors
 
+# ByteTrack defaults (ultralytics/cfg/trackers/bytetrack.yaml), used when detections come from an external detector
+BYTETRACK_ARGS = {
+    "tracker_type": "bytetrack",
+    "track_high_thresh": 0.25,
+    "track_low_thresh": 0.1,
+    "new_track_thresh": 0.25,
+    "track_buffer": 30,
+    "match_thresh": 0.8,
+    "fuse_score": True,
+}
+
+
+def load_class_names(model: Any) -> Optional[Dict[int, str]]:
+    """
+    Read class names without loading a model backend.
+
+    Args:
+        model (Any): An already loaded ultralytics model, or the path of an exported model directory (or a file inside
+            it) containing `metadata.yaml`.
+
+    Returns:
+        (Dict[int, str] | None): Class index to name, or None if no metadata is available.
+    """
+    if isinstance(model, Model):
+        return model.names
+    path = Path(str(model))
+    for metadata in (path / "metadata.yaml", path.parent / "metadata.yaml"):
+        if metadata.is_file():
+            with open(metadata, encoding="utf-8") as f:
+                names = (yaml.safe_load(f) or {}).get("names")
+            if names:
+                return {int(k): str(v) for k, v in names.items()}
+    return None
+
+
+def names_only_model(names: Dict[int, str]) -> Model:
+    """
+    Build an unloaded ultralytics Model that only carries class names.
+
+    `BaseSolution` always wraps its `model` argument in `YOLO(...)`; an existing Model instance is adopted as is, so
+    passing this placeholder skips the weights and inference backend entirely (used with an external detector).
+
+    Args:
+        names (Dict[int, str]): Class index to name.
+
+    Returns:
+        (Model): Placeholder whose `names` property resolves without a predictor.
+    """
+    model = Model.__new__(Model)
+    super(Model, model).__init__()  # torch.nn.Module bookkeeping only, no weights
+    model.model = SimpleNamespace(names=names)
+    model.predictor = None
+    model.overrides = {}
+    return model
+
 
 class ObjectCounter(BaseSolution):
     """
@@ -17,15 +79,40 @@ class ObjectCounter(BaseSolution):
     Attributes:
         in_count (int): Counter for objects moving inward.
         out_count (int): Counter for objects moving outward.
-        counted_ids (List[int]): List of IDs of objects that have been counted.
+        counted_ids (Set[int]): Set of IDs of objects that have been counted (O(1) membership checks).
         classwise_counts (Dict[str, Dict[str, int]]): Dictionary for counts, categorized by object class.
         region_initialized (bool): Flag indicating whether the counting region has been initialized.
         show_in (bool): Flag to control display of inward count.
         show_out (bool): Flag to control display of outward count.
         margin (int): Margin for background rectangle size to display counts properly.
+        headless (bool): Skip all annotation work and only track and count objects.
+        roi (Tuple[int, int, int, int] | None): Crop (x1, y1, x2, y2) in full-frame pixels used for inference.
+        detector (Any | None): External detector with `detect(frame)` replacing the ultralytics predictor.
+        tracker (BYTETracker | None): Tracker fed with the external detector's results.
+        history_len (int): Maximum number of centroids kept per track.
+        track_ttl_frames (int): Tracks not seen for this many processed frames are evicted.
+        track_ttl_s (float | None): Tracks not seen for this many seconds are evicted (disabled if None).
+        last_seen (Dict[int, Tuple[int, float]]): Frame index and time each live track was last seen.
+        evicted_tracks (int): Total number of evicted tracks.
+        region_width (float): Precomputed width of the counting region's bounding box.
+        region_height (float): Precomputed height of the counting region's bounding box.
+        region_rect (Tuple[float, float, float, float] | None): (x1, y1, x2, y2) if the region is an axis-aligned
+            rectangle, enabling the vectorized, shapely-free counting path.
+        stage_stats (Any | None): Recorder with `record(stage, seconds)` receiving per-frame stage timings.
 
     Methods:
+        initialize_region: Initialize the region and precompute its geometry once.
+        update_region: Replace the counting region and ROI crop at runtime.
         count_objects: Count objects within a polygonal or linear region based on their tracks.
+        count_objects_batch: Count all of a frame's tracks against a rectangular region in one NumPy operation.
+        inference_input: Return the view of the frame the detector sees (full frame or ROI crop).
+        extract_tracks: Apply object tracking on the full frame or the ROI crop and return full-frame boxes.
+        track_detections: Update the tracker with externally computed detections.
+        store_tracking_history: Store the centroid of a box in the track history.
+        evict_stale_tracks: Drop history, counted state and bookkeeping of tracks that are gone.
+        track_stats: Report live versus evicted tracks.
+        record_stage_times: Split a frame's tracking time into preprocess, inference and tracking and record it.
+        update_counts: Update tracking history and counts for all tracks of the current frame.
         display_counts: Display object counts on the frame.
         process: Process input data and update counts.
 
@@ -36,19 +123,112 @@ class ObjectCounter(BaseSolution):
         >>> print(f"Inward count: {counter.in_count}, Outward count: {counter.out_count}")
     """
 
-    def __init__(self, **kwargs: Any) -> None:
-        """Initialize the ObjectCounter class for real-time object counting in video streams."""
+    def __init__(
+        self,
+        headless: bool = False,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        imgsz: Optional[int] = None,
+        detector: Optional[Any] = None,
+        tracker_frame_rate: int = 30,
+        history_len: int = 30,
+        track_ttl_frames: int = 300,
+        track_ttl_s: Optional[float] = None,
+        evict_interval: int = 30,
+        stage_stats: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the ObjectCounter class for real-time object counting in video streams.
+
+        Args:
+            headless (bool): If True, skip region/box drawing, label formatting and count display in `process`.
+            roi (Tuple[int, int, int, int], optional): Run inference only on this (x1, y1, x2, y2) crop of the frame.
+                Boxes are mapped back to full-frame coordinates, so the counting region stays in frame space.
+            imgsz (int, optional): Inference image size passed to the tracker (e.g. smaller for ROI crops).
+            detector (Any, optional): Detector with a `detect(frame)` method returning an object with `xyxy`, `xywh`,
+                `conf` and `cls` arrays (e.g. NcnnDetector). Replaces `model.track()` on the hot path; tracking is then
+                done by a ByteTrack instance owned by this counter.
+            tracker_frame_rate (int): Frame rate used to size the ByteTrack buffer for external detections.
+            history_len (int): Maximum number of centroids kept per track.
+            track_ttl_frames (int): Evict tracks not seen for this many processed frames. Must exceed the tracker's
+                lost-track buffer, otherwise a re-found track could be counted twice.
+            track_ttl_s (float, optional): Additionally evict tracks not seen for this many seconds.
+            evict_interval (int): Run the eviction scan every this many processed frames.
+            stage_stats (Any, optional): Recorder with a `record(stage, seconds)` method (e.g. StageStats) that receives
+                preprocess, inference, tracking and counting times for every processed frame.
+            **kwargs (Any): Solution arguments passed to BaseSolution. With a `detector`, `model` is only used to read
+                class names from its `metadata.yaml`; the ultralytics model and backend are not loaded.
+        """
+        if detector is not None:
+            names = load_class_names(kwargs.get("model"))
+            if names is not None:
+                kwargs["model"] = names_only_model(names)
         super().__init__(**kwargs)
 
         self.in_count = 0  # Counter for objects moving inward
         self.out_count = 0  # Counter for objects moving outward
-        self.counted_ids = []  # List of IDs of objects that have been counted
+        self.counted_ids = set()  # IDs of objects that have been counted
         self.classwise_count = defaultdict(lambda: {"IN": 0, "OUT": 0})  # Dictionary for counts, categorized by class
         self.region_initialized = False  # Flag indicating whether the region has been initialized
 
         self.show_in = self.CFG["show_in"]
         self.show_out = self.CFG["show_out"]
         self.margin = self.line_width * 2  # Scales the background rectangle size to display counts properly
+        self.headless = headless  # Tracking and counting only, no annotation
+        self.roi = tuple(int(v) for v in roi) if roi is not None else None  # Inference crop in frame pixels
+        if imgsz is not None:
+            self.track_add_args["imgsz"] = imgsz
+
+        # Memory-bounded track store: fixed-size history per track, eviction of tracks that are gone
+        self.history_len = history_len
+        self.track_ttl_frames = track_ttl_frames
+        self.track_ttl_s = track_ttl_s
+        self.evict_interval = max(1, evict_interval)
+        self.track_history = defaultdict(lambda: deque(maxlen=self.history_len))
+        self.last_seen = {}  # track_id -> (frame index, monotonic time)
+        self.evicted_tracks = 0
+        self.frame_count = 0
+
+        self.region_width = 0.0
+        self.region_height = 0.0
+        self.region_rect = None
+        self.stage_stats = stage_stats
+
+        self.detector = detector
+        self.tracker = None
+        if detector is not None:
+            self.tracker = BYTETracker(SimpleNamespace(**BYTETRACK_ARGS), frame_rate=tracker_frame_rate)
+
+    def initialize_region(self) -> None:
+        """Initialize the counting region and precompute its bounding box, orientation and rectangle shortcut."""
+        super().initialize_region()
+        xs = [p[0] for p in self.region]
+        ys = [p[1] for p in self.region]
+        x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
+        self.region_width = x2 - x1
+        self.region_height = y2 - y1
+
+        corners = {(x1, y1), (x2, y1), (x2, y2), (x1, y2)}
+        is_rect = len(self.region) == 4 and set(map(tuple, self.region)) == corners and x1 < x2 and y1 < y2
+        self.region_rect = (x1, y1, x2, y2) if is_rect else None
+
+    def update_region(self, region: List[Tuple[int, int]], roi: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """
+        Replace the counting region (and ROI crop) at runtime without reloading the model or resetting counts.
+
+        The region geometry is recomputed on the next `process` call; tracks and already counted IDs are kept, so a
+        person inside the region is not counted twice.
+
+        Args:
+            region (List[Tuple[int, int]]): New region points in full-frame pixels.
+            roi (Tuple[int, int, int, int], optional): New inference crop (x1, y1, x2, y2), or None for the full frame.
+
+        Examples:
+            >>> counter.update_region([(100, 100), (300, 100), (300, 400), (100, 400)])
+        """
+        self.region = region
+        self.roi = tuple(int(v) for v in roi) if roi is not None else None
+        self.region_initialized = False
 
     def count_objects(
         self,
@@ -96,18 +276,15 @@ class ObjectCounter(BaseSolution):
                 else:  # Moving upward
                     self.out_count += 1
                     self.classwise_count[self.names[cls]]["OUT"] += 1
-                self.counted_ids.append(track_id)
+                self.counted_ids.add(track_id)
 
         elif len(self.region) > 2:  # Polygonal region
             if self.r_s.contains(self.Point(current_centroid)):
-                # Determine motion direction for vertical or horizontal polygons
-                region_width = max(p[0] for p in self.region) - min(p[0] for p in self.region)
-                region_height = max(p[1] for p in self.region) - min(p[1] for p in self.region)
-
+                # Determine motion direction for vertical or horizontal polygons (geometry precomputed once)
                 if (
-                    region_width < region_height
+                    self.region_width < self.region_height
                     and current_centroid[0] > prev_position[0]
-                    or region_width >= region_height
+                    or self.region_width >= self.region_height
                     and current_centroid[1] > prev_position[1]
                 ):  # Moving right or downward
                     self.in_count += 1
@@ -115,7 +292,239 @@ class ObjectCounter(BaseSolution):
                 else:  # Moving left or upward
                     self.out_count += 1
                     self.classwise_count[self.names[cls]]["OUT"] += 1
-                self.counted_ids.append(track_id)
+                self.counted_ids.add(track_id)
+
+    def inference_input(self, im0):
+        """
+        Return the part of the frame that is passed to the detector.
+
+        Args:
+            im0 (numpy.ndarray): The full input frame.
+
+        Returns:
+            (numpy.ndarray): The ROI crop as a view (no copy) if an ROI is set, otherwise the frame itself.
+        """
+        if self.roi is None:
+            return im0
+        x1, y1, x2, y2 = self.roi
+        return im0[y1:y2, x1:x2]
+
+    def extract_tracks(self, im0, detections: Optional[Any] = None) -> None:
+        """
+        Apply object tracking to the input frame, or only to the configured ROI crop of it.
+
+        When an ROI is set, the tracker sees the cropped view and the resulting boxes are shifted back by the crop
+        offset, so track history, counting and annotation all operate in full-frame coordinates.
+
+        Args:
+            im0 (numpy.ndarray): The full input frame.
+            detections (Any, optional): Detections already computed for `inference_input(im0)`, e.g. by a detector
+                shared between several counters that runs all cameras' frames as one batch. Requires a counter
+                created with a `detector` (ByteTrack owned by this counter).
+
+        Examples:
+            >>> counter = ObjectCounter(roi=(400, 100, 900, 700))
+            >>> counter.extract_tracks(frame)
+        """
+        frame = self.inference_input(im0)
+
+        if detections is not None:
+            self.track_detections(detections, frame)
+        elif self.detector is None:
+            super().extract_tracks(frame)
+        else:
+            self.track_detections(self.detector.detect(frame), frame)
+
+        if self.roi is not None and len(self.track_ids):
+            x1, y1 = self.roi[:2]
+            boxes = self.boxes.clone() if hasattr(self.boxes, "clone") else self.boxes.copy()
+            boxes[:, 0::2] += x1
+            boxes[:, 1::2] += y1
+            self.boxes = boxes
+
+    def track_detections(self, detections: Any, im0=None) -> None:
+        """
+        Update the ByteTrack tracker with detections from an external detector and extract the active tracks.
+
+        Args:
+            detections (Any): Detections with `xyxy`, `xywh`, `conf` and `cls` NumPy arrays in frame coordinates.
+            im0 (numpy.ndarray, optional): The frame the detections belong to.
+
+        Examples:
+            >>> counter = ObjectCounter(detector=NcnnDetector("models/yolo11n_ncnn_model"))
+            >>> counter.track_detections(counter.detector.detect(frame), frame)
+        """
+        tracks = self.tracker.update(detections, im0)  # (N, 8): x1, y1, x2, y2, track_id, score, cls, idx
+        if len(tracks):
+            self.boxes = tracks[:, :4]
+            self.track_ids = tracks[:, 4].astype(int).tolist()
+            self.confs = tracks[:, 5].tolist()
+            self.clss = tracks[:, 6].astype(int).tolist()
+        else:
+            self.boxes, self.clss, self.track_ids, self.confs = [], [], [], []
+
+    def store_tracking_history(self, track_id: int, box) -> None:
+        """
+        Store the centroid of a bounding box in the tracking history of an object (max. `history_len` points).
+
+        Works for both torch tensors (ultralytics tracker) and NumPy arrays (external detector).
+
+        Args:
+            track_id (int): The unique identifier for the tracked object.
+            box (List[float]): The bounding box coordinates of the object in the format [x1, y1, x2, y2].
+        """
+        self.track_line = self.track_history[track_id]
+        self.track_line.append((float(box[0] + box[2]) / 2, float(box[1] + box[3]) / 2))  # deque drops oldest
+
+    def evict_stale_tracks(self) -> None:
+        """
+        Evict tracks that have not been seen for `track_ttl_frames` processed frames (or `track_ttl_s` seconds).
+
+        Removes their history, counted state and last-seen entry so memory stays flat regardless of how many objects
+        have passed. `classwise_count` is keyed by class name and therefore already bounded.
+
+        Examples:
+            >>> counter = ObjectCounter(track_ttl_frames=300)
+            >>> counter.evict_stale_tracks()
+        """
+        now = time.monotonic()
+        stale = [
+            track_id
+            for track_id, (frame_idx, seen_at) in self.last_seen.items()
+            if self.frame_count - frame_idx > self.track_ttl_frames
+            or (self.track_ttl_s is not None and now - seen_at > self.track_ttl_s)
+        ]
+        for track_id in stale:
+            del self.last_seen[track_id]
+            self.track_history.pop(track_id, None)
+            self.counted_ids.discard(track_id)
+        self.evicted_tracks += len(stale)
+
+    def track_stats(self) -> dict:
+        """
+        Report the size of the track store.
+
+        Returns:
+            (dict): 'live_tracks', 'evicted_tracks', 'counted_ids' and 'history_points'.
+        """
+        return {
+            "live_tracks": len(self.last_seen),
+            "evicted_tracks": self.evicted_tracks,
+            "counted_ids": len(self.counted_ids),
+            "history_points": sum(len(line) for line in self.track_history.values()),
+        }
+
+    def record_stage_times(self, extract_s: float, count_s: float, external: bool = False) -> None:
+        """
+        Record the stage timings of the current frame.
+
+        The time spent in `extract_tracks` is split using the detector's `speed` dict (ms per stage, as in ultralytics
+        `Results.speed`): preprocess, inference plus NMS postprocess, and the remainder as tracking.
+
+        Args:
+            extract_s (float): Seconds spent in `extract_tracks`.
+            count_s (float): Seconds spent in `update_counts`.
+            external (bool): Detections were passed in, so `extract_s` is tracking only; preprocess and inference are
+                recorded by whoever ran the (batched) detector.
+        """
+        if external:
+            self.stage_stats.record("tracking", extract_s)
+            self.stage_stats.record("counting", count_s)
+            return
+
+        speed = getattr(self.detector if self.detector is not None else self.tracks, "speed", None) or {}
+        preprocess_s = speed.get("preprocess", 0.0) / 1000
+        inference_s = (speed.get("inference", 0.0) + speed.get("postprocess", 0.0)) / 1000
+
+        self.stage_stats.record("preprocess", preprocess_s)
+        self.stage_stats.record("inference", inference_s)
+        self.stage_stats.record("tracking", max(0.0, extract_s - preprocess_s - inference_s))
+        self.stage_stats.record("counting", count_s)
+
+    def update_counts(self) -> None:
+        """
+        Update the tracking history and object counts for all tracks extracted from the current frame.
+
+        Examples:
+            >>> counter = ObjectCounter()
+            >>> counter.extract_tracks(frame)
+            >>> counter.update_counts()
+        """
+        self.frame_count += 1
+        now = time.monotonic()
+
+        if self.region_rect is not None:  # Rectangular region: collect candidates, count in one NumPy step
+            centroids, prev_positions, ids, clss = [], [], [], []
+            for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
+                self.store_tracking_history(track_id, box)  # Store track history
+                self.last_seen[track_id] = (self.frame_count, now)
+                track_line = self.track_history[track_id]
+                if len(track_line) > 1 and track_id not in self.counted_ids:
+                    centroids.append(track_line[-1])
+                    prev_positions.append(track_line[-2])
+                    ids.append(track_id)
+                    clss.append(cls)
+            if ids:
+                self.count_objects_batch(np.asarray(centroids), np.asarray(prev_positions), ids, clss)
+        else:
+            for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
+                self.store_tracking_history(track_id, box)  # Store track history
+                self.last_seen[track_id] = (self.frame_count, now)
+
+                # Store previous position of track for object counting
+                prev_position = None
+                if len(self.track_history[track_id]) > 1:
+                    prev_position = self.track_history[track_id][-2]
+                self.count_objects(self.track_history[track_id][-1], track_id, prev_position, cls)  # object counting
+
+        if self.frame_count % self.evict_interval == 0:
+            self.evict_stale_tracks()
+
+    def count_objects_batch(
+        self,
+        centroids: np.ndarray,
+        prev_positions: np.ndarray,
+        track_ids: List[int],
+        clss: List[int],
+    ) -> None:
+        """
+        Count all candidate tracks of a frame against the rectangular region in one vectorized step.
+
+        Equivalent to calling `count_objects` per track for an axis-aligned rectangle: a track is counted once when its
+        current centroid lies strictly inside the region; the direction follows the region's orientation.
+
+        Args:
+            centroids (np.ndarray): Current centroids (N, 2) of tracks that have not been counted yet.
+            prev_positions (np.ndarray): Previous centroids (N, 2) of the same tracks.
+            track_ids (List[int]): Track IDs matching the rows.
+            clss (List[int]): Class indices matching the rows.
+
+        Examples:
+            >>> counter = ObjectCounter(region=[(100, 100), (300, 100), (300, 400), (100, 400)])
+            >>> counter.initialize_region()
+            >>> counter.count_objects_batch(np.array([[200, 200]]), np.array([[190, 200]]), [1], [0])
+        """
+        x1, y1, x2, y2 = self.region_rect
+        inside = (
+            (centroids[:, 0] > x1) & (centroids[:, 0] < x2) & (centroids[:, 1] > y1) & (centroids[:, 1] < y2)
+        )
+        if not inside.any():
+            return
+
+        axis = 0 if self.region_width < self.region_height else 1  # Vertical region: x decides, else y
+        moving_in = centroids[:, axis] > prev_positions[:, axis]  # Moving right or downward
+
+        for i in np.flatnonzero(inside):
+            name = self.names[clss[i]]
+            if moving_in[i]:
+                self.classwise_count[name]["IN"] += 1
+            else:
+                self.classwise_count[name]["OUT"] += 1
+            self.counted_ids.add(track_ids[i])
+
+        n_in = int(np.count_nonzero(inside & moving_in))
+        self.in_count += n_in
+        self.out_count += int(np.count_nonzero(inside)) - n_in
 
     def display_counts(self, plot_im) -> None:
         """
@@ -138,15 +547,17 @@ class ObjectCounter(BaseSolution):
         if labels_dict:
             self.annotator.display_analytics(plot_im, labels_dict, (104, 31, 17), (255, 255, 255), self.margin)
 
-    def process(self, im0) -> SolutionResults:
+    def process(self, im0, detections: Optional[Any] = None) -> SolutionResults:
         """
         Process input data (frames or object tracks) and update object counts.
 
         This method initializes the counting region, extracts tracks, draws bounding boxes and regions, updates
-        object counts, and displays the results on the input image.
+        object counts, and displays the results on the input image. In headless mode only tracking and counting are
+        performed and the input image is returned unannotated.
 
         Args:
             im0 (numpy.ndarray): The input image or frame to be processed.
+            detections (Any, optional): Precomputed detections for `inference_input(im0)`, see `extract_tracks`.
 
         Returns:
             (SolutionResults): Contains processed image `im0`, 'in_count' (int, count of objects entering the region),
@@ -162,7 +573,22 @@ class ObjectCounter(BaseSolution):
             self.initialize_region()
             self.region_initialized = True
 
-        self.extract_tracks(im0)  # Extract tracks
+        t0 = time.perf_counter()
+        self.extract_tracks(im0, detections)  # Extract tracks
+        t1 = time.perf_counter()
+        self.update_counts()  # Update track history and counts
+        if self.stage_stats is not None:
+            self.record_stage_times(t1 - t0, time.perf_counter() - t1, external=detections is not None)
+
+        if self.headless:  # Skip annotator, drawing and label formatting entirely
+            return SolutionResults(
+                plot_im=im0,  # Unannotated input frame, no copy
+                in_count=self.in_count,
+                out_count=self.out_count,
+                classwise_count=dict(self.classwise_count),
+                total_tracks=len(self.track_ids),
+            )
+
         self.annotator = SolutionAnnotator(im0, line_width=self.line_width)  # Initialize annotator
 
         self.annotator.draw_region(
@@ -173,13 +599,6 @@ class ObjectCounter(BaseSolution):
         for box, track_id, cls, conf in zip(self.boxes, self.track_ids, self.clss, self.confs):
             # Draw bounding box and counting region
             self.annotator.box_label(box, label=self.adjust_box_label(cls, conf, track_id), color=colors(cls, True))
-            self.store_tracking_history(track_id, box)  # Store track history
-
-            # Store previous position of track for object counting
-            prev_position = None
-            if len(self.track_history[track_id]) > 1:
-                prev_position = self.track_history[track_id][-2]
-            self.count_objects(self.track_history[track_id][-1], track_id, prev_position, cls)  # object counting
 
         plot_im = self.annotator.result()
         self.display_counts(plot_im)  # Display the counts on the frame
@@ -0,0 +1,255 @@
+# backend/storage/export.py – Export der Zähldaten als CSV oder Parquet
+"""
+Exportiert Zähldaten direkt aus `data/log.db`, ohne die Historie in den Speicher
+zu laden.
+
+- Die Zeilen werden per Cursor in Blöcken (`chunk_size`) gelesen und sofort in die
+  Zieldatei geschrieben (CSV zeilenweise, Parquet als eine Row Group je Block).
+- Granularität: Rohdaten aus 'log' oder vorberechnete Buckets aus 'log_rollup'
+  (10 Minuten bis Monat, siehe `backend/storage/rollups.py`).
+- Spalten: `timestamp` (Ortszeit als ISO-String, in SQLite erzeugt) und `ts`
+  (Epoch-ms); in Parquet ist `timestamp` ein echter Zeitstempel (UTC), direkt aus `ts`.
+- Parquet benötigt das optionale Paket `pyarrow`; ohne es steht nur CSV zur Verfügung.
+
+Kommandozeile:
+    python backend/storage/export.py --db data/log.db --format parquet --granularity hourly --start 2025-01-01
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import csv
+import datetime
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.storage.rollups import GRANULARITIES
+
+# ─── Konstanten ────────────────────────────────────────────────────────────────
+FORMATS = ("csv", "parquet")
+RAW = "raw"
+CHUNK_SIZE = 50_000            # Zeilen je Block (begrenzt den Speicherbedarf)
+EXPORT_MAX_AGE = 3600.0        # Ältere Exportdateien werden beim nächsten Export entfernt (Sekunden)
+
+OPEN_END = 1 << 62             # Offenes Ende eines Zeitfensters (Epoch-ms)
+
+RAW_COLUMNS = ("timestamp", "ts", "camera", "in_count", "out_count", "current_count", "total_tracks")
+ROLLUP_COLUMNS = RAW_COLUMNS + ("in_delta",)
+
+# ─── SQL ───────────────────────────────────────────────────────────────────────
+LOCAL_ISO_SQL = "strftime('%Y-%m-%dT%H:%M:%f', {column} / 1000.0, 'unixepoch', 'localtime')"
+
+SELECT_RAW = f"""
+    SELECT {LOCAL_ISO_SQL.format(column="l.ts")}, l.ts, NULLIF(c.name, ''),
+           l.in_count, l.out_count, l.current_count, l.total_tracks
+    FROM log l JOIN camera c ON c.id = l.camera
+    WHERE l.ts >= ? AND l.ts < ? {{camera_filter}}
+    ORDER BY l.ts, l.camera
+"""
+
+SELECT_ROLLUP = f"""
+    SELECT {LOCAL_ISO_SQL.format(column="r.bucket")}, r.bucket, NULLIF(c.name, ''),
+           r.in_count, r.out_count, r.current_count, r.total_tracks, r.in_delta
+    FROM log_rollup r JOIN camera c ON c.id = r.camera
+    WHERE r.granularity = ? AND r.bucket >= ? AND r.bucket < ? {{camera_filter}}
+    ORDER BY r.bucket, r.camera
+"""
+
+
+def parquet_available() -> bool:
+    """True, wenn `pyarrow` installiert ist (Parquet-Export möglich)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Zeilen in Blöcken lesen
+# ────────────────────────────────────────────────────────────────────────────────
+def iter_chunks(conn: sqlite3.Connection, granularity: str = RAW, start: int = 0, end: int = OPEN_END,
+                camera: str | None = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Liefert die Exportzeilen blockweise.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+        granularity (str): RAW oder eine der GRANULARITIES.
+        start (int): Beginn in Epoch-ms (inklusive, 0 = ohne Grenze).
+        end (int): Ende in Epoch-ms (exklusive, OPEN_END = ohne Grenze).
+        camera (str | None): Nur diese Kamera (None = alle).
+        chunk_size (int): Zeilen je Block.
+
+    Yields:
+        list[tuple]: Block von Zeilen in der Spaltenreihenfolge von `columns_for(granularity)`.
+    """
+    camera_filter = "AND c.name = ?" if camera is not None else ""
+    if granularity == RAW:
+        sql, params = SELECT_RAW.format(camera_filter=camera_filter), [start, end]
+    elif granularity in GRANULARITIES:
+        sql, params = SELECT_ROLLUP.format(camera_filter=camera_filter), [granularity, start, end]
+    else:
+        raise ValueError(f"Unbekannte Granularität: {granularity}")
+    if camera is not None:
+        params.append(camera)
+
+    cursor = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def columns_for(granularity: str) -> tuple[str, ...]:
+    """Spaltennamen der Exportdatei für eine Granularität."""
+    return RAW_COLUMNS if granularity == RAW else ROLLUP_COLUMNS
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ✍️ Schreiben
+# ────────────────────────────────────────────────────────────────────────────────
+def write_csv(path: str, chunks, columns: tuple[str, ...]) -> int:
+    """
+    Schreibt die Blöcke zeilenweise als CSV.
+
+    Args:
+        path (str): Zieldatei.
+        chunks: Iterator über Zeilenblöcke (siehe `iter_chunks`).
+        columns (tuple[str, ...]): Kopfzeile.
+
+    Returns:
+        int: Anzahl geschriebener Datenzeilen.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def write_parquet(path: str, chunks, columns: tuple[str, ...]) -> int:
+    """
+    Schreibt die Blöcke als Parquet (eine Row Group je Block).
+
+    Args:
+        path (str): Zieldatei.
+        chunks: Iterator über Zeilenblöcke (siehe `iter_chunks`).
+        columns (tuple[str, ...]): Spaltennamen; `timestamp` wird als Zeitstempel (UTC) aus `ts` gebildet.
+
+    Returns:
+        int: Anzahl geschriebener Datenzeilen.
+    """
+    import pyarrow as pa  # Optional, erst beim Parquet-Export benötigt
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (name, pa.timestamp("ms", tz="UTC") if name == "timestamp" else pa.string() if name == "camera" else pa.int64())
+        for name in columns
+    ])
+    ts_index = columns.index("ts")
+    count = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in chunks:
+            values = list(zip(*rows))
+            arrays = []
+            for field, column in zip(schema, values):
+                if field.name == "timestamp":
+                    column = values[ts_index]  # Ganzzahlen direkt als Zeitstempel, ohne Parsen
+                arrays.append(pa.array(column, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+def export_file(db_path: str, fmt: str = "csv", granularity: str = RAW, start: int = 0, end: int = OPEN_END,
+                camera: str | None = None, directory: str | None = None,
+                chunk_size: int = CHUNK_SIZE) -> tuple[str, int]:
+    """
+    Erstellt eine Exportdatei blockweise aus der Datenbank.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        fmt (str): "csv" oder "parquet".
+        granularity (str): RAW oder eine der GRANULARITIES.
+        start (int): Beginn in Epoch-ms.
+        end (int): Ende in Epoch-ms (exklusive).
+        camera (str | None): Nur diese Kamera (None = alle).
+        directory (str | None): Zielverzeichnis (None = `exports/` neben der Datenbank).
+        chunk_size (int): Zeilen je Block.
+
+    Returns:
+        tuple[str, int]: Pfad der Exportdatei und Anzahl Datenzeilen.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Format: {fmt}")
+    if fmt == "parquet" and not parquet_available():
+        raise RuntimeError("Parquet-Export benötigt das Paket 'pyarrow'.")
+
+    directory = directory or os.path.join(os.path.dirname(os.path.abspath(db_path)), "exports")
+    os.makedirs(directory, exist_ok=True)
+    remove_old_exports(directory)
+    fd, path = tempfile.mkstemp(prefix=f"ekspar_{granularity}_", suffix=f".{fmt}", dir=directory)
+    os.close(fd)
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        chunks = iter_chunks(conn, granularity, start, end, camera, chunk_size)
+        writer = write_parquet if fmt == "parquet" else write_csv
+        count = writer(path, chunks, columns_for(granularity))
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        conn.close()
+    return path, count
+
+
+def remove_old_exports(directory: str, max_age: float = EXPORT_MAX_AGE) -> None:
+    """
+    Entfernt Exportdateien, die älter als `max_age` Sekunden sind.
+
+    Args:
+        directory (str): Exportverzeichnis.
+        max_age (float): Maximales Alter in Sekunden.
+    """
+    now = time.time()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith("ekspar_") and now - os.path.getmtime(path) > max_age:
+            os.remove(path)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    """Exportiert die Zähldaten über die Kommandozeile."""
+    parser = argparse.ArgumentParser(description="Zähldaten aus log.db als CSV oder Parquet exportieren")
+    parser.add_argument("--db", default="data/log.db", help="Pfad zur SQLite-Datenbank")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Dateiformat")
+    parser.add_argument("--granularity", choices=(RAW,) + GRANULARITIES, default=RAW, help="Rohdaten oder Buckets")
+    parser.add_argument("--start", default=None, help="Beginn als ISO-Zeitstempel (Ortszeit), z. B. 2025-01-01")
+    parser.add_argument("--end", default=None, help="Ende als ISO-Zeitstempel (Ortszeit, exklusive)")
+    parser.add_argument("--camera", default=None, help="Nur diese Kamera")
+    parser.add_argument("--output-dir", default=None, help="Zielverzeichnis (Standard: data/exports)")
+    args = parser.parse_args()
+
+    start_ms = int(datetime.datetime.fromisoformat(args.start).timestamp() * 1000) if args.start else 0
+    end_ms = int(datetime.datetime.fromisoformat(args.end).timestamp() * 1000) if args.end else OPEN_END
+
+    start = time.perf_counter()
+    path, count = export_file(args.db, args.format, args.granularity, start_ms, end_ms, args.camera,
+                              args.output_dir)
+    print(f"[INFO] {count} Zeilen nach {path} exportiert ({time.perf_counter() - start:.1f}s).")
+
+
+if __name__ == "__main__":
+    main()
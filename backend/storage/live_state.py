@@ -0,0 +1,177 @@
+# backend/storage/live_state.py – Live-Zählerstand für Dashboard & Co.
+"""
+Veröffentlicht den jeweils aktuellen Zählerstand (IN, OUT, Aktuell, Tracks).
+
+- `counter.json` wird nur bei geänderten Werten geschrieben und atomar per
+  `os.replace` ersetzt – Leser sehen nie eine halb geschriebene Datei.
+- Optional wird zusätzlich ein Datensatz fester Länge in eine per `mmap`
+  eingeblendete Datei geschrieben (z. B. `counter.bin`). Leser können ihn ohne
+  JSON-Parsing lesen; eine Sequenznummer (Seqlock) verhindert zerrissene Werte.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import datetime
+import json
+import mmap
+import os
+import struct
+import time
+
+# ─── Datensatz-Layout (Little Endian) ──────────────────────────────────────────
+# Header:  Magic, Version, Sequenznummer (ungerade = Schreibvorgang läuft)
+# Payload: Zeitstempel (Epoch-ms), IN, OUT, Aktuell, Tracks
+LIVE_MAGIC = b"EKSP"
+LIVE_VERSION = 1
+HEADER = struct.Struct("<4sII")
+PAYLOAD = struct.Struct("<qiiii")
+RECORD_SIZE = HEADER.size + PAYLOAD.size
+SEQ_OFFSET = 8  # Byte-Offset der Sequenznummer im Header
+
+LIVE_FIELDS = ("in", "out", "current", "total_tracks")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ✍️ Schreiben (Zählprozess)
+# ────────────────────────────────────────────────────────────────────────────────
+class LiveStatePublisher:
+    """
+    Schreibt den Live-Zählerstand nur bei Änderungen und immer atomar.
+
+    Args:
+        json_path (str): Pfad zur JSON-Datei (z. B. data/counter.json).
+        mmap_path (str | None): Optionaler Pfad für den Datensatz fester Länge.
+    """
+
+    def __init__(self, json_path: str, mmap_path: str | None = None) -> None:
+        self.json_path = json_path
+        self.mmap_path = mmap_path
+        self.writes = 0
+        self.skipped = 0
+
+        self._last: tuple | None = None
+        self._seq = 0
+        self._mm: mmap.mmap | None = None
+        self._file = None
+        if mmap_path:
+            self._open_mmap()
+
+    def _open_mmap(self) -> None:
+        """Legt die Datensatzdatei in fester Größe an und blendet sie ein."""
+        mode = "r+b" if os.path.exists(self.mmap_path) else "w+b"
+        self._file = open(self.mmap_path, mode)
+        self._file.truncate(RECORD_SIZE)
+        self._mm = mmap.mmap(self._file.fileno(), RECORD_SIZE)
+        magic, _, seq = HEADER.unpack_from(self._mm, 0)
+        self._seq = seq + (seq & 1) if magic == LIVE_MAGIC else 0
+
+    def publish(self, data: dict) -> bool:
+        """
+        Veröffentlicht den Zählerstand, sofern sich ein Wert geändert hat.
+
+        Args:
+            data (dict): Zähldaten mit 'timestamp' (ggf. 'ts' in Epoch-ms), 'in', 'out', 'current', 'total_tracks'.
+
+        Returns:
+            bool: True, wenn geschrieben wurde, False bei unverändertem Stand.
+        """
+        values = tuple(int(data[key]) for key in LIVE_FIELDS)
+        if values == self._last:
+            self.skipped += 1
+            return False
+
+        self._write_json(data)
+        if self._mm is not None:
+            ts_ms = data.get("ts") or int(datetime.datetime.fromisoformat(data["timestamp"]).timestamp() * 1000)
+            self._write_record(ts_ms, values)
+
+        self._last = values
+        self.writes += 1
+        return True
+
+    def _write_json(self, data: dict) -> None:
+        """Schreibt die JSON-Datei in eine temporäre Datei und ersetzt das Original atomar."""
+        tmp_path = f"{self.json_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.json_path)
+
+    def _write_record(self, ts_ms: int, values: tuple) -> None:
+        """Schreibt den Datensatz fester Länge nach dem Seqlock-Verfahren."""
+        mm = self._mm
+        self._seq += 1  # ungerade → Schreibvorgang läuft
+        HEADER.pack_into(mm, 0, LIVE_MAGIC, LIVE_VERSION, self._seq)
+        PAYLOAD.pack_into(mm, HEADER.size, ts_ms, *values)
+        self._seq += 1  # gerade → Datensatz konsistent
+        struct.pack_into("<I", mm, SEQ_OFFSET, self._seq)
+
+    def close(self) -> None:
+        """Gibt die eingeblendete Datei frei."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Lesen (Dashboard)
+# ────────────────────────────────────────────────────────────────────────────────
+def read_live_record(mmap_path: str, retries: int = 5) -> dict | None:
+    """
+    Liest den Datensatz fester Länge ohne JSON-Parsing.
+
+    Args:
+        mmap_path (str): Pfad zur Datensatzdatei.
+        retries (int): Anzahl Leseversuche, falls gerade geschrieben wird.
+
+    Returns:
+        dict | None: Zähldaten im Format von counter.json oder None, falls nicht lesbar.
+    """
+    try:
+        with open(mmap_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < RECORD_SIZE:
+                return None
+            with mmap.mmap(f.fileno(), RECORD_SIZE, access=mmap.ACCESS_READ) as mm:
+                for _ in range(retries):
+                    magic, version, seq_before = HEADER.unpack_from(mm, 0)
+                    if magic != LIVE_MAGIC or version != LIVE_VERSION:
+                        return None
+                    if seq_before & 1:
+                        time.sleep(0.001)
+                        continue
+                    ts_ms, in_count, out_count, current, total_tracks = PAYLOAD.unpack_from(mm, HEADER.size)
+                    (seq_after,) = struct.unpack_from("<I", mm, SEQ_OFFSET)
+                    if seq_before == seq_after and seq_before > 0:
+                        return {
+                            "timestamp": datetime.datetime.fromtimestamp(ts_ms / 1000).isoformat(),
+                            "in": in_count,
+                            "out": out_count,
+                            "current": current,
+                            "total_tracks": total_tracks
+                        }
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def read_live_state(json_path: str, mmap_path: str | None = None) -> dict | None:
+    """
+    Liest den aktuellen Zählerstand – bevorzugt aus dem Datensatz, sonst aus der JSON-Datei.
+
+    Args:
+        json_path (str): Pfad zur JSON-Datei.
+        mmap_path (str | None): Optionaler Pfad zur Datensatzdatei.
+
+    Returns:
+        dict | None: Zähldaten oder None, falls weder Datensatz noch JSON-Datei vorhanden sind.
+    """
+    if mmap_path and os.path.exists(mmap_path):
+        data = read_live_record(mmap_path)
+        if data is not None:
+            return data
+
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, "r") as f:
+        return json.load(f)
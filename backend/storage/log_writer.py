@@ -0,0 +1,417 @@
+# backend/storage/log_writer.py – Gepufferter SQLite-Writer für Zähldaten
+"""
+Langlebiger Writer für die Tabelle 'log' in `data/log.db`.
+
+Hält eine einzige Verbindung im WAL-Modus offen, sammelt Zeilen im Speicher und
+schreibt sie gebündelt (nach Zeilenanzahl oder Zeitfenster) in einer Transaktion.
+Ein Hintergrund-Thread schreibt gepufferte Zeilen auch dann nach spätestens
+`flush_interval` Sekunden, wenn keine weiteren Zeilen folgen (Bewegungsfilter im
+Leerlauf, Pause). Beim Beenden werden offene Zeilen mit `close()` geschrieben.
+
+Schlägt ein Commit fehl (z. B. "database is locked" während einer Migration oder
+der Aufbewahrung), bleiben die Zeilen gepuffert und werden nach `flush_interval`
+erneut geschrieben; erst oberhalb von `max_pending` Zeilen werden die ältesten
+verworfen (gezählt in `rows_dropped`).
+
+Schema (kompakt, nur Ganzzahlen):
+- `ts`: Zeitpunkt in Epoch-Millisekunden (UTC). Zusammen mit `camera` bildet er
+  den Primärschlüssel einer WITHOUT-ROWID-Tabelle; die Zeilen liegen damit
+  physisch nach Zeit sortiert, Bereichsabfragen (`WHERE ts >= ? AND ts < ?`)
+  brauchen weder Index noch Umwandlung von Zeit-Strings.
+- `camera`: ID aus der Tabelle 'camera' (0 = Einzelkamerabetrieb, Name '').
+
+Zeilen werden nie überschrieben: Der Writer vergibt je Kamera streng steigende
+Zeitstempel und verschiebt einen Datensatz, dessen `ts` schon belegt ist (z. B.
+zwei Exporte in derselben Millisekunde), um jeweils 1 ms nach hinten.
+
+Datenbanken im alten Schema (ISO-String `timestamp`, Kameraname als Text) werden
+beim Öffnen per `ensure_log_schema()` einmalig umgeschrieben; für große Bestände
+mit Größenbericht und VACUUM siehe `backend/storage/migrate_log.py`.
+
+Mit jedem Commit werden die Rollup-Buckets (`backend/storage/rollups.py`) in
+derselben Transaktion fortgeschrieben; fehlt die Tabelle, wird sie beim Öffnen
+einmalig aus den Rohdaten nachberechnet.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import datetime
+import sqlite3
+import threading
+import time
+
+from backend.storage.rollups import ensure_rollup_table, last_in_counts, update_rollups
+
+# ─── SQL ───────────────────────────────────────────────────────────────────────
+CREATE_CAMERA_TABLE = """
+    CREATE TABLE IF NOT EXISTS camera (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+"""
+
+INSERT_DEFAULT_CAMERA = "INSERT OR IGNORE INTO camera (id, name) VALUES (0, '')"
+
+CREATE_LOG_TABLE = """
+    CREATE TABLE IF NOT EXISTS log (
+        ts INTEGER NOT NULL,
+        camera INTEGER NOT NULL DEFAULT 0,
+        in_count INTEGER,
+        out_count INTEGER,
+        current_count INTEGER,
+        total_tracks INTEGER,
+        PRIMARY KEY (ts, camera)
+    ) WITHOUT ROWID
+"""
+
+INSERT_LOG_ROW = """
+    INSERT INTO log (ts, camera, in_count, out_count, current_count, total_tracks)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Altes Schema → neues Schema: ISO-String (Ortszeit) in Epoch-ms, Kameraname in ID
+MIGRATE_LEGACY_CAMERAS = """
+    INSERT OR IGNORE INTO camera (name)
+    SELECT DISTINCT camera FROM log_legacy WHERE coalesce(camera, '') != ''
+"""
+
+MIGRATE_LEGACY_ROWS = """
+    INSERT OR REPLACE INTO log (ts, camera, in_count, out_count, current_count, total_tracks)
+    SELECT ts, camera, in_count, out_count, current_count, total_tracks FROM (
+        SELECT CAST(round((julianday(l.timestamp, 'utc') - 2440587.5) * 86400000.0) AS INTEGER) AS ts,
+               coalesce(c.id, 0) AS camera,
+               l.in_count, l.out_count, l.current_count, l.total_tracks
+        FROM log_legacy l LEFT JOIN camera c ON c.name = l.camera
+    )
+    WHERE ts IS NOT NULL
+    ORDER BY ts, camera
+"""
+
+
+def to_epoch_ms(timestamp: str) -> int:
+    """
+    Wandelt einen ISO-Zeitstempel (Ortszeit, wie `datetime.isoformat()`) in Epoch-Millisekunden.
+
+    Args:
+        timestamp (str): ISO-8601-Zeitstempel.
+    """
+    return int(datetime.datetime.fromisoformat(timestamp).timestamp() * 1000)
+
+
+def log_schema_state(conn: sqlite3.Connection) -> str:
+    """
+    Prüft das Schema nur lesend (ohne Schreibsperre), z. B. für das Dashboard.
+
+    Args:
+        conn (sqlite3.Connection): Offene (auch schreibgeschützte) Verbindung.
+
+    Returns:
+        str: 'missing' (noch keine Tabelle 'log'), 'legacy' (altes Schema, Migration nötig),
+            'no_rollups' (Rollups fehlen, Nachberechnung nötig) oder 'current'.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(log)")}
+    if not columns:
+        return "missing"
+    if "timestamp" in columns:
+        return "legacy"
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "camera" not in tables:
+        return "legacy"
+    if "log_rollup" not in tables:
+        return "no_rollups"
+    return "current"
+
+
+def ensure_log_schema(conn: sqlite3.Connection) -> bool:
+    """
+    Legt die Tabellen 'log' und 'camera' an bzw. überführt eine Tabelle im alten Schema.
+
+    Die Umstellung läuft in einer Transaktion (`BEGIN IMMEDIATE`), damit Dashboard und
+    Zählprozess sie nicht gleichzeitig ausführen. Die Rollups werden dabei verworfen
+    und anschließend von `ensure_rollup_table()` neu berechnet.
+
+    Neue Datenbanken werden mit `auto_vacuum = INCREMENTAL` angelegt (Speicherfreigabe
+    durch `backend/storage/retention.py`); bei bestehenden wirkt die Einstellung erst
+    nach einem VACUUM (`backend/storage/migrate_log.py`).
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+
+    Returns:
+        bool: True, wenn eine Tabelle im alten Schema überführt wurde.
+    """
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(log)")}
+        legacy = "timestamp" in columns
+        if legacy:
+            if "camera" not in columns:
+                conn.execute("ALTER TABLE log ADD COLUMN camera TEXT")
+            conn.execute("ALTER TABLE log RENAME TO log_legacy")
+        conn.execute(CREATE_CAMERA_TABLE)
+        conn.execute(INSERT_DEFAULT_CAMERA)
+        conn.execute(CREATE_LOG_TABLE)
+        if legacy:
+            conn.execute(MIGRATE_LEGACY_CAMERAS)
+            conn.execute(MIGRATE_LEGACY_ROWS)
+            conn.execute("DROP TABLE log_legacy")  # Entfernt auch idx_log_timestamp
+            conn.execute("DROP TABLE IF EXISTS log_rollup")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return legacy
+
+
+def camera_id(conn: sqlite3.Connection, name: str | None) -> int:
+    """
+    Liefert die ID einer Kamera und legt sie bei Bedarf an.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+        name (str | None): Kameraname (None/'' = Einzelkamerabetrieb → 0).
+    """
+    if not name:
+        return 0
+    row = conn.execute("SELECT id FROM camera WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        with conn:
+            row = (conn.execute("INSERT INTO camera (name) VALUES (?)", (name,)).lastrowid,)
+    return row[0]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗃 LogWriter
+# ────────────────────────────────────────────────────────────────────────────────
+class LogWriter:
+    """
+    Schreibt Zähldaten gebündelt über eine dauerhaft geöffnete SQLite-Verbindung.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        batch_size (int): Commit, sobald so viele Zeilen gepuffert sind.
+        flush_interval (float): Commit spätestens nach so vielen Sekunden (auch ohne weitere Zeilen).
+        max_pending (int): Höchstens so viele Zeilen puffern, solange Commits fehlschlagen.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 50, flush_interval: float = 5.0,
+                 max_pending: int = 10_000) -> None:
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+
+        # Verbindung wird vom Export-Thread genutzt, Zugriffe sind per Lock serialisiert
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Nur wirksam, solange die Datei leer ist (vor WAL)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        if ensure_log_schema(self._conn):
+            print(f"[INFO] Tabelle 'log' in {db_path} ins kompakte Schema überführt.")
+        if ensure_rollup_table(self._conn):
+            print(f"[INFO] Rollups aus bestehenden Zähldaten in {db_path} nachberechnet.")
+        self._conn.commit()
+        self._last_in = last_in_counts(self._conn)  # Ausgangswerte für in_delta je Kamera
+        self._camera_ids: dict[str | None, int] = {}
+        self._last_ts: dict[int, int] = {}  # Zuletzt vergebener Zeitstempel je Kamera-ID
+
+        self._lock = threading.Lock()
+        self._pending: list[tuple] = []
+        self._last_commit = time.monotonic()
+        self._retry_at = 0.0  # Nach einem fehlgeschlagenen Commit erst ab diesem Zeitpunkt erneut versuchen
+
+        # Zeitgesteuerter Flush, falls nach den letzten Zeilen nichts mehr nachkommt
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="ekspar-log-flush", daemon=True)
+            self._flusher.start()
+
+        # Metriken
+        self._rows_written = 0
+        self._commits = 0
+        self._commit_time_sum = 0.0
+        self._commit_time_max = 0.0
+        self._failed_commits = 0
+        self._rows_dropped = 0
+
+    def write(self, data: dict) -> None:
+        """
+        Puffert einen Datensatz und schreibt den Puffer, wenn Größe oder Zeitfenster erreicht sind.
+
+        Args:
+            data (dict): Zähldaten mit den Schlüsseln 'ts' (Epoch-ms) bzw. 'timestamp',
+                'in', 'out', 'current', 'total_tracks' und optional 'camera'.
+        """
+        ts = data.get("ts")
+        if ts is None:
+            ts = to_epoch_ms(data["timestamp"])
+        with self._lock:
+            camera = data.get("camera")
+            if camera not in self._camera_ids and self._conn is not None:
+                self._camera_ids[camera] = camera_id(self._conn, camera)
+            cam_id = self._camera_ids.get(camera, 0)
+            self._pending.append((
+                self._next_ts_locked(cam_id, ts),
+                cam_id,
+                data["in"],
+                data["out"],
+                data["current"],
+                data["total_tracks"]
+            ))
+            now = time.monotonic()
+            if now >= self._retry_at and (
+                len(self._pending) >= self.batch_size
+                or now - self._last_commit >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Schreibt alle gepufferten Zeilen in einer Transaktion."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self, attempts: int = 3) -> None:
+        """
+        Schreibt offene Zeilen und schließt die Verbindung.
+
+        Args:
+            attempts (int): Commit-Versuche (im Abstand von einer Sekunde), bevor offene Zeilen verloren gehen.
+        """
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                for attempt in range(max(1, attempts)):
+                    if attempt:
+                        time.sleep(1.0)
+                    if self._flush_locked():
+                        break
+                else:
+                    print(f"[ERROR] {len(self._pending)} Zeilen konnten beim Beenden nicht geschrieben werden.")
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def _flush_loop(self) -> None:
+        """Schreibt liegen gebliebene Zeilen, sobald das Zeitfenster abgelaufen ist."""
+        while not self._stop.wait(min(1.0, self.flush_interval)):
+            with self._lock:
+                now = time.monotonic()
+                if self._pending and now >= self._retry_at and now - self._last_commit >= self.flush_interval:
+                    self._flush_locked()
+
+    def _next_ts_locked(self, cam_id: int, ts: int) -> int:
+        """
+        Vergibt einen freien Zeitstempel (Aufrufer hält den Lock).
+
+        Args:
+            cam_id (int): Kamera-ID.
+            ts (int): Gewünschter Zeitpunkt in Epoch-ms.
+
+        Returns:
+            int: `ts` bzw. der nächste freie Zeitpunkt nach dem zuletzt vergebenen.
+        """
+        last = self._last_ts.get(cam_id)
+        if last is None and self._conn is not None:
+            # Einmal je Kamera: bereits gespeicherte Zeilen ab `ts` (Bereichsscan über den Primärschlüssel)
+            last = self._conn.execute(
+                "SELECT MAX(ts) FROM log WHERE ts >= ? AND camera = ?", (ts, cam_id)
+            ).fetchone()[0]
+        if last is not None and ts <= last:
+            ts = last + 1
+        self._last_ts[cam_id] = ts
+        return ts
+
+    def _restamp_locked(self) -> None:
+        """Vergibt die Zeitstempel des Puffers neu, falls fremde Zeilen sie inzwischen belegen."""
+        self._last_ts.clear()
+        self._pending = [(self._next_ts_locked(row[1], row[0]), *row[1:]) for row in self._pending]
+
+    def _flush_locked(self) -> bool:
+        """
+        Schreibt den Puffer (Aufrufer hält den Lock).
+
+        Der Puffer wird erst nach dem erfolgreichen Commit geleert und der Rollup-Stand
+        (`_last_in`) erst dann übernommen; bei einem Fehler bleibt beides unverändert
+        für den nächsten Versuch.
+
+        Returns:
+            bool: True, wenn nichts offen ist bzw. der Commit gelungen ist.
+        """
+        self._last_commit = time.monotonic()
+        if not self._pending or self._conn is None:
+            return True
+
+        rows = self._pending
+        last_in = dict(self._last_in)
+        start = time.perf_counter()
+        try:
+            with self._conn:  # Transaktion: Commit bzw. Rollback bei Fehler
+                self._conn.executemany(INSERT_LOG_ROW, rows)
+                update_rollups(self._conn, rows, last_in)
+        except sqlite3.IntegrityError as e:
+            # Zeitstempel von außen belegt (anderer Writer, Migration): neu vergeben, beim nächsten Schreiben erneut
+            self._failed_commits += 1
+            self._restamp_locked()
+            print(f"[WARN] Zeitstempel bereits belegt, {len(self._pending)} Zeilen werden neu eingeordnet: {e}")
+            return False
+        except sqlite3.Error as e:
+            self._failed_commits += 1
+            self._retry_at = time.monotonic() + self.flush_interval
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]  # Älteste zuerst; in_delta bleibt über den Rollup-Stand korrekt
+                self._rows_dropped += overflow
+            print(f"[WARN] Commit fehlgeschlagen, {len(self._pending)} Zeilen bleiben gepuffert: {e}")
+            return False
+        elapsed = time.perf_counter() - start
+
+        self._pending = []
+        self._last_in = last_in
+        self._retry_at = 0.0
+        self._rows_written += len(rows)
+        self._commits += 1
+        self._commit_time_sum += elapsed
+        self._commit_time_max = max(self._commit_time_max, elapsed)
+        return True
+
+    # ── Metriken ──
+    def stats(self) -> dict:
+        """
+        Liefert Schreiblatenz und Batch-Größen des Writers.
+
+        Returns:
+            dict: Geschriebene Zeilen, Commits, Zeilen pro Commit, Commit-Latenzen (ms),
+                fehlgeschlagene Commits und verworfene Zeilen.
+        """
+        with self._lock:
+            commits = self._commits
+            return {
+                "rows_written": self._rows_written,
+                "rows_pending": len(self._pending),
+                "commits": commits,
+                "rows_per_commit": self._rows_written / commits if commits else 0.0,
+                "avg_commit_ms": self._commit_time_sum / commits * 1000 if commits else 0.0,
+                "max_commit_ms": self._commit_time_max * 1000,
+                "failed_commits": self._failed_commits,
+                "rows_dropped": self._rows_dropped,
+            }
+
+    def format_stats(self) -> str:
+        """Formatiert die Writer-Kennzahlen als einzeilige Log-Ausgabe."""
+        s = self.stats()
+        errors = ""
+        if s["failed_commits"]:
+            errors = f", {s['failed_commits']} Commits fehlgeschlagen, {s['rows_dropped']} Zeilen verworfen"
+        return (
+            f"DB: {s['rows_written']} Zeilen in {s['commits']} Commits "
+            f"(Ø {s['rows_per_commit']:.1f} Zeilen/Commit, Ø {s['avg_commit_ms']:.1f}ms, "
+            f"max {s['max_commit_ms']:.1f}ms, offen {s['rows_pending']}{errors})"
+        )
@@ -0,0 +1,107 @@
+# backend/storage/migrate_log.py – Einmalige Umstellung von log.db auf das kompakte Schema
+"""
+Überführt eine bestehende `data/log.db` vom alten Schema (ISO-String `timestamp`,
+Kameraname als Text, separater Zeitindex) in das kompakte Ganzzahl-Schema
+(`ts` in Epoch-ms + Kamera-ID als geclusterter Primärschlüssel, siehe
+`backend/storage/log_writer.py`).
+
+Ablauf:
+1. Größe von Datenbank und WAL vorher ermitteln (optional Sicherungskopie).
+2. Tabelle per `ensure_log_schema()` umschreiben und Rollups neu berechnen.
+3. `VACUUM` gibt den frei gewordenen Platz zurück und schaltet `auto_vacuum =
+   INCREMENTAL` ein (Speicherfreigabe durch `backend/storage/retention.py`);
+   der WAL wird geleert.
+4. Größe nachher und Ersparnis ausgeben.
+
+Der Zählprozess und das Dashboard sollten währenddessen gestoppt sein; beide
+würden die Umstellung sonst beim nächsten Öffnen selbst (ohne VACUUM) ausführen.
+
+Kommandozeile:
+    python backend/storage/migrate_log.py --db data/log.db --backup data/log_backup.db
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.storage.log_writer import ensure_log_schema
+from backend.storage.rollups import ensure_rollup_table
+
+
+def db_size(db_path: str) -> int:
+    """
+    Gesamtgröße der Datenbank in Bytes (Hauptdatei plus WAL).
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+    """
+    return sum(os.path.getsize(path) for path in (db_path, f"{db_path}-wal") if os.path.exists(path))
+
+
+def format_size(size: int) -> str:
+    """Formatiert eine Größe in Bytes als MB."""
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def migrate(db_path: str, backup_path: str | None = None) -> tuple[int, int, bool]:
+    """
+    Stellt die Datenbank auf das kompakte Schema um und verkleinert die Datei.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        backup_path (str | None): Ziel einer Sicherungskopie vor der Umstellung.
+
+    Returns:
+        tuple[int, int, bool]: Größe vorher, Größe nachher (Bytes) und ob umgestellt wurde.
+    """
+    before = db_size(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        if backup_path:
+            backup = sqlite3.connect(backup_path)
+            with backup:
+                conn.backup(backup)
+            backup.close()
+            print(f"[INFO] Sicherungskopie: {backup_path}")
+
+        migrated = ensure_log_schema(conn)
+        ensure_rollup_table(conn)
+        conn.commit()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")  # Wird mit dem VACUUM wirksam
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return before, db_size(db_path), migrated
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    """Führt die Umstellung über die Kommandozeile aus und berichtet die Dateigröße."""
+    parser = argparse.ArgumentParser(description="log.db auf das kompakte Ganzzahl-Schema umstellen")
+    parser.add_argument("--db", default="data/log.db", help="Pfad zur SQLite-Datenbank")
+    parser.add_argument("--backup", default=None, help="Sicherungskopie vor der Umstellung anlegen")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] Datenbank nicht gefunden: {args.db}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    before, after, migrated = migrate(args.db, args.backup)
+    elapsed = time.perf_counter() - start
+    if not migrated:
+        print(f"[INFO] {args.db} nutzt bereits das kompakte Schema (nur VACUUM, {elapsed:.1f}s).")
+    saved = round((before - after) / before * 100) if before else 0
+    print(f"[INFO] Größe vorher: {format_size(before)}, nachher: {format_size(after)} "
+          f"({saved}% kleiner, {elapsed:.1f}s).")
+
+
+if __name__ == "__main__":
+    main()
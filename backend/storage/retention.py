@@ -0,0 +1,301 @@
+# backend/storage/retention.py – Aufbewahrung und Verdichtung der Zähldaten
+"""
+Begrenzt das Wachstum von `data/log.db`.
+
+Aufbewahrungsregel (Standard):
+- Rohzeilen ('log') 7 Tage,
+- 10- und 30-Minuten-Buckets ('log_rollup') 90 Tage,
+- Stunden-, Tages-, Wochen- und Monats-Buckets unbegrenzt.
+
+Die gröberen Stufen müssen nicht erst beim Löschen berechnet werden: Der
+LogWriter schreibt jede Rohzeile in derselben Transaktion in alle Rollups fort
+(`backend/storage/rollups.py`). Alte Zeilen sind dort also bereits verdichtet
+und können entfernt werden. Bis wohin Rohzeilen gelöscht wurden, steht in
+'log_meta'; ein späteres Nachberechnen der Rollups lässt ältere Buckets unberührt.
+
+Gelöscht wird in kleinen Transaktionen mit kurzen Pausen auf einer eigenen
+Verbindung, sodass der Writer zwischen zwei Blöcken committen kann. Freie Seiten
+werden per `PRAGMA incremental_vacuum` schrittweise an das Dateisystem
+zurückgegeben (benötigt `auto_vacuum = INCREMENTAL`; neue Datenbanken werden so
+angelegt, bestehende stellt `backend/storage/migrate_log.py` einmalig um).
+
+Im Zählprozess läuft `RetentionJob` als Hintergrund-Thread; einmalig von Hand:
+    python backend/storage/retention.py --db data/log.db --raw-days 7 --rollup-days 10min=90 30min=90
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from backend.storage.rollups import CREATE_META_TABLE, GRANULARITIES, RAW_PRUNED_BEFORE
+
+# ─── Konstanten ────────────────────────────────────────────────────────────────
+RAW_DAYS = 7                                   # Rohzeilen (None = unbegrenzt)
+ROLLUP_DAYS = {"10min": 90, "30min": 90}       # Buckets je Granularität (fehlt = unbegrenzt)
+BATCH_ROWS = 5000                              # Zeilen je Lösch-Transaktion
+VACUUM_PAGES = 256                             # Seiten je incremental_vacuum-Schritt
+PAUSE = 0.05                                   # Pause zwischen zwei Schritten (Sekunden), Writer kommt dazwischen
+DAY_MS = 86_400_000
+
+# ─── SQL ───────────────────────────────────────────────────────────────────────
+DELETE_RAW_BATCH = """
+    DELETE FROM log WHERE (ts, camera) IN (
+        SELECT ts, camera FROM log WHERE ts < ? ORDER BY ts LIMIT ?
+    )
+"""
+
+DELETE_ROLLUP_BATCH = """
+    DELETE FROM log_rollup WHERE (granularity, camera, bucket) IN (
+        SELECT granularity, camera, bucket FROM log_rollup WHERE granularity = ? AND bucket < ? LIMIT ?
+    )
+"""
+
+UPDATE_PRUNED_BEFORE = """
+    INSERT INTO log_meta (key, value) VALUES (?, ?)
+    ON CONFLICT (key) DO UPDATE SET value = max(value, excluded.value)
+"""
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧹 Löschen und Speicher freigeben
+# ────────────────────────────────────────────────────────────────────────────────
+def _delete_in_batches(conn: sqlite3.Connection, sql: str, params: tuple, batch_rows: int, pause: float,
+                       stop: threading.Event | None = None, after_batch: tuple | None = None) -> int:
+    """
+    Führt ein Lösch-Statement blockweise in je einer kurzen Transaktion aus.
+
+    Args:
+        conn (sqlite3.Connection): Eigene Verbindung des Jobs.
+        sql (str): DELETE mit LIMIT als letztem Parameter.
+        params (tuple): Parameter vor dem LIMIT.
+        batch_rows (int): Zeilen je Transaktion.
+        pause (float): Pause zwischen zwei Transaktionen in Sekunden.
+        stop (threading.Event | None): Abbruch zwischen zwei Blöcken.
+        after_batch (tuple | None): (SQL, Parameter), das in jeder Transaktion mit ausgeführt wird.
+
+    Returns:
+        int: Anzahl gelöschter Zeilen.
+    """
+    deleted = 0
+    while stop is None or not stop.is_set():
+        with conn:
+            count = conn.execute(sql, (*params, batch_rows)).rowcount
+            if count and after_batch is not None:
+                conn.execute(*after_batch)
+        deleted += count
+        if count < batch_rows:
+            break
+        time.sleep(pause)
+    return deleted
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int = VACUUM_PAGES, pause: float = PAUSE,
+                       stop: threading.Event | None = None) -> int | None:
+    """
+    Gibt freie Seiten schrittweise an das Dateisystem zurück.
+
+    Args:
+        conn (sqlite3.Connection): Eigene Verbindung des Jobs.
+        pages (int): Seiten je Schritt (je Schritt eine kurze Schreibtransaktion).
+        pause (float): Pause zwischen zwei Schritten in Sekunden.
+        stop (threading.Event | None): Abbruch zwischen zwei Schritten.
+
+    Returns:
+        int | None: Freigegebene Seiten; None, wenn `auto_vacuum` nicht INCREMENTAL ist.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return None
+    freed = 0
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    while free > 0 and (stop is None or not stop.is_set()):
+        # executescript läuft das PRAGMA vollständig durch; execute() gibt nur eine Seite frei
+        conn.executescript(f"PRAGMA incremental_vacuum({min(pages, free)})")
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free:
+            break
+        freed += free - remaining
+        free = remaining
+        time.sleep(pause)
+    return freed
+
+
+def apply_retention(conn: sqlite3.Connection, raw_days: float | None = RAW_DAYS,
+                    rollup_days: dict[str, float] | None = None, now_ms: int | None = None,
+                    batch_rows: int = BATCH_ROWS, pause: float = PAUSE,
+                    stop: threading.Event | None = None) -> dict:
+    """
+    Löscht Rohzeilen und feine Buckets außerhalb der Aufbewahrungsfristen und gibt Speicher frei.
+
+    Args:
+        conn (sqlite3.Connection): Eigene Verbindung (nicht die des Writers).
+        raw_days (float | None): Aufbewahrung der Rohzeilen in Tagen (None = unbegrenzt).
+        rollup_days (dict[str, float] | None): Aufbewahrung je Granularität in Tagen
+            (None = ROLLUP_DAYS; fehlende Granularitäten unbegrenzt).
+        now_ms (int | None): Bezugszeitpunkt in Epoch-ms (None = jetzt).
+        batch_rows (int): Zeilen je Lösch-Transaktion.
+        pause (float): Pause zwischen zwei Transaktionen in Sekunden.
+        stop (threading.Event | None): Abbruch zwischen zwei Blöcken.
+
+    Returns:
+        dict: Gelöschte Rohzeilen, gelöschte Buckets je Granularität und freigegebene Seiten.
+    """
+    rollup_days = ROLLUP_DAYS if rollup_days is None else rollup_days
+    validate_policy(raw_days, rollup_days)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+
+    with conn:
+        conn.execute(CREATE_META_TABLE)
+
+    raw_deleted = 0
+    if raw_days is not None:
+        cutoff = now_ms - int(raw_days * DAY_MS)
+        raw_deleted = _delete_in_batches(conn, DELETE_RAW_BATCH, (cutoff,), batch_rows, pause, stop,
+                                         after_batch=(UPDATE_PRUNED_BEFORE, (RAW_PRUNED_BEFORE, cutoff)))
+
+    rollups_deleted = {}
+    for granularity, days in rollup_days.items():
+        cutoff = now_ms - int(days * DAY_MS)
+        rollups_deleted[granularity] = _delete_in_batches(conn, DELETE_ROLLUP_BATCH, (granularity, cutoff),
+                                                          batch_rows, pause, stop)
+
+    return {
+        "raw_deleted": raw_deleted,
+        "rollups_deleted": rollups_deleted,
+        "pages_freed": incremental_vacuum(conn, pause=pause, stop=stop),
+    }
+
+
+def validate_policy(raw_days: float | None, rollup_days: dict[str, float]) -> None:
+    """
+    Prüft die Aufbewahrungsregel (bekannte Granularitäten, positive Fristen).
+
+    Args:
+        raw_days (float | None): Aufbewahrung der Rohzeilen in Tagen.
+        rollup_days (dict[str, float]): Aufbewahrung je Granularität in Tagen.
+    """
+    if raw_days is not None and raw_days <= 0:
+        raise ValueError(f"Aufbewahrung der Rohzeilen muss positiv sein: {raw_days}")
+    for granularity, days in rollup_days.items():
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unbekannte Granularität: {granularity}")
+        if days <= 0:
+            raise ValueError(f"Aufbewahrung für '{granularity}' muss positiv sein: {days}")
+
+
+def format_result(result: dict, elapsed: float) -> str:
+    """Formatiert das Ergebnis eines Laufs als einzeilige Log-Ausgabe."""
+    rollups = ", ".join(f"{g} {n}" for g, n in result["rollups_deleted"].items() if n) or "0"
+    pages = result["pages_freed"]
+    freed = "incremental_vacuum aus (migrate_log.py)" if pages is None else f"{pages} Seiten freigegeben"
+    return (
+        f"Aufbewahrung: {result['raw_deleted']} Rohzeilen, Buckets {rollups} gelöscht, "
+        f"{freed} ({elapsed:.1f}s)"
+    )
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱ Hintergrund-Job (Zählprozess)
+# ────────────────────────────────────────────────────────────────────────────────
+class RetentionJob:
+    """
+    Wendet die Aufbewahrungsregel periodisch in einem eigenen Thread an.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank (Schema muss existieren, siehe LogWriter).
+        raw_days (float | None): Aufbewahrung der Rohzeilen in Tagen (None = unbegrenzt).
+        rollup_days (dict[str, float] | None): Aufbewahrung je Granularität in Tagen (None = ROLLUP_DAYS).
+        interval (float): Sekunden zwischen zwei Läufen; der erste Lauf startet sofort.
+    """
+
+    def __init__(self, db_path: str, raw_days: float | None = RAW_DAYS,
+                 rollup_days: dict[str, float] | None = None, interval: float = 3600.0) -> None:
+        self.db_path = db_path
+        self.raw_days = raw_days
+        self.rollup_days = ROLLUP_DAYS if rollup_days is None else rollup_days
+        self.interval = interval
+        validate_policy(raw_days, self.rollup_days)
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Metriken
+        self.runs = 0
+        self.last_result: dict | None = None
+
+    # ── Lebenszyklus ──
+    def start(self) -> None:
+        """Startet den Hintergrund-Thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ekspar-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Stoppt den Thread (ein laufender Lauf bricht nach dem aktuellen Block ab).
+
+        Args:
+            timeout (float): Maximale Wartezeit auf den Thread in Sekunden.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        """Führt die Läufe im Abstand von `interval` Sekunden aus."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA busy_timeout=5000")
+        try:
+            while not self._stop.is_set():
+                try:
+                    start = time.perf_counter()
+                    self.last_result = apply_retention(conn, self.raw_days, self.rollup_days, stop=self._stop)
+                    self.runs += 1
+                    if self.last_result["raw_deleted"] or any(self.last_result["rollups_deleted"].values()):
+                        print(f"[INFO] {format_result(self.last_result, time.perf_counter() - start)}")
+                except sqlite3.Error as e:
+                    print(f"[WARN] Aufbewahrung fehlgeschlagen: {e}")
+                self._stop.wait(self.interval)
+        finally:
+            conn.close()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+def parse_rollup_days(values: list[str]) -> dict[str, float]:
+    """Wandelt Angaben wie '10min=90' in ein Wörterbuch Granularität → Tage."""
+    result = {}
+    for value in values:
+        granularity, _, days = value.partition("=")
+        result[granularity] = float(days)
+    return result
+
+
+def main() -> None:
+    """Wendet die Aufbewahrungsregel einmalig über die Kommandozeile an."""
+    parser = argparse.ArgumentParser(description="Alte Zähldaten in log.db löschen und Speicher freigeben")
+    parser.add_argument("--db", default="data/log.db", help="Pfad zur SQLite-Datenbank")
+    parser.add_argument("--raw-days", type=float, default=RAW_DAYS, help="Rohzeilen so viele Tage behalten")
+    parser.add_argument("--rollup-days", nargs="*", default=None,
+                        help="Buckets je Granularität, z. B. 10min=90 30min=90 (Standard: 10min/30min 90 Tage)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        rollup_days = parse_rollup_days(args.rollup_days) if args.rollup_days is not None else None
+        start = time.perf_counter()
+        result = apply_retention(conn, args.raw_days, rollup_days)
+        print(f"[INFO] {format_result(result, time.perf_counter() - start)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# backend/storage/rollups.py – Vorberechnete Zeitbuckets für das Dashboard
+"""
+Rollup-Tabelle `log_rollup` mit denselben Zeitbuckets wie das Dashboard
+(10 Minuten, 30 Minuten, Stunde, Tag, Woche, Monat).
+
+Je Granularität, Kamera und Bucket werden die Maxima der Zählerstände sowie die
+Summe der IN-Zuwächse (`in_delta`) gehalten. Der LogWriter aktualisiert die
+Buckets in derselben Transaktion, in der er die Rohzeilen schreibt; bestehende
+Datenbanken werden einmalig per SQL aus der Tabelle 'log' nachberechnet
+(`backfill_rollups`). "Letztes Jahr" und "Insgesamt" lesen dadurch nur noch
+einige hundert Zeilen statt der gesamten Historie.
+
+Wie in 'log' ist `bucket` der Bucket-Beginn in Epoch-Millisekunden (UTC) und
+`camera` die Kamera-ID aus der Tabelle 'camera'. Die Buckets selbst werden in
+lokaler Zeit gebildet (ein Tag beginnt um 00:00 Ortszeit), wie sie das Dashboard
+anzeigt.
+
+`in_delta` einer Zeile ist der Zuwachs des kumulativen IN-Zählers gegenüber der
+vorherigen Zeile derselben Kamera, nach unten auf 0 begrenzt (wie im Dashboard
+per `diff().clip(lower=0)`); die erste Zeile zählt mit ihrem vollen Wert.
+
+Nachberechnen von Hand:
+    python backend/storage/rollups.py --db data/log.db
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import argparse
+import datetime
+import sqlite3
+import time
+
+# ─── Granularitäten ────────────────────────────────────────────────────────────
+# Bucket-Beginn in lokaler Zeit, Woche ab Montag
+GRANULARITIES = ("10min", "30min", "hourly", "daily", "weekly", "monthly")
+
+# Gleiche Buckets als SQL-Ausdruck über `local` ('YYYY-MM-DD HH:MM:SS' in Ortszeit, für das Nachberechnen)
+BUCKET_SQL = {
+    "10min": "substr(local, 1, 15) || '0:00'",
+    "30min": "substr(local, 1, 14) || CASE WHEN substr(local, 15, 2) < '30' THEN '00:00' ELSE '30:00' END",
+    "hourly": "substr(local, 1, 13) || ':00:00'",
+    "daily": "substr(local, 1, 10) || ' 00:00:00'",
+    "weekly": "date(substr(local, 1, 10), '-6 days', 'weekday 1') || ' 00:00:00'",
+    "monthly": "substr(local, 1, 7) || '-01 00:00:00'",
+}
+
+# ─── SQL ───────────────────────────────────────────────────────────────────────
+CREATE_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS log_rollup (
+        granularity TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        camera INTEGER NOT NULL DEFAULT 0,
+        in_count INTEGER,
+        out_count INTEGER,
+        current_count INTEGER,
+        total_tracks INTEGER,
+        in_delta INTEGER,
+        row_count INTEGER,
+        PRIMARY KEY (granularity, camera, bucket)
+    ) WITHOUT ROWID
+"""
+
+UPSERT_ROLLUP = """
+    INSERT INTO log_rollup
+        (granularity, bucket, camera, in_count, out_count, current_count, total_tracks, in_delta, row_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (granularity, camera, bucket) DO UPDATE SET
+        in_count = max(in_count, excluded.in_count),
+        out_count = max(out_count, excluded.out_count),
+        current_count = max(current_count, excluded.current_count),
+        total_tracks = max(total_tracks, excluded.total_tracks),
+        in_delta = in_delta + excluded.in_delta,
+        row_count = row_count + excluded.row_count
+"""
+
+SELECT_ROLLUP_RANGE = """
+    SELECT r.bucket AS ts, r.in_count, r.out_count, r.current_count, r.total_tracks, r.in_delta,
+           NULLIF(c.name, '') AS camera
+    FROM log_rollup r JOIN camera c ON c.id = r.camera
+    WHERE r.granularity = ? AND r.bucket >= ? AND r.bucket < ?
+    ORDER BY r.camera, r.bucket
+"""
+
+# Verwaltungswerte der Datenbank, z. B. bis wohin Rohzeilen gelöscht wurden (backend/storage/retention.py)
+CREATE_META_TABLE = "CREATE TABLE IF NOT EXISTS log_meta (key TEXT PRIMARY KEY, value INTEGER)"
+RAW_PRUNED_BEFORE = "raw_pruned_before"
+
+# Zuwachs und Ortszeit je Rohzeile einmal berechnen, dann je Granularität aggregieren
+BACKFILL_DELTAS = """
+    CREATE TEMP TABLE rollup_deltas AS
+    SELECT datetime(ts / 1000, 'unixepoch', 'localtime') AS local, camera,
+           in_count, out_count, current_count, total_tracks,
+           max(0, in_count - coalesce(lag(in_count) OVER (PARTITION BY camera ORDER BY ts), 0)) AS in_delta
+    FROM log
+"""
+
+# Bucket-Beginn (Ortszeit) zurück in Epoch-Millisekunden; nur Buckets nach `bucket > ?`
+BACKFILL_ROLLUP = """
+    INSERT INTO log_rollup
+        (granularity, bucket, camera, in_count, out_count, current_count, total_tracks, in_delta, row_count)
+    SELECT * FROM (
+        SELECT ? AS granularity, CAST(strftime('%s', {bucket}, 'utc') AS INTEGER) * 1000 AS bucket, camera,
+               max(in_count), max(out_count), max(current_count), max(total_tracks), sum(in_delta), count(*)
+        FROM rollup_deltas
+        GROUP BY 2, camera
+    )
+    WHERE bucket > ?
+"""
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🪣 Buckets
+# ────────────────────────────────────────────────────────────────────────────────
+def bucket_start(ts: int, granularity: str) -> int:
+    """
+    Bestimmt den Beginn des Buckets, in den ein Zeitpunkt fällt.
+
+    Args:
+        ts (int): Zeitpunkt in Epoch-Millisekunden.
+        granularity (str): Eine der GRANULARITIES.
+
+    Returns:
+        int: Bucket-Beginn (Ortszeit gerundet) in Epoch-Millisekunden.
+    """
+    dt = datetime.datetime.fromtimestamp(ts / 1000)
+    if granularity == "10min":
+        dt = dt.replace(minute=dt.minute - dt.minute % 10, second=0, microsecond=0)
+    elif granularity == "30min":
+        dt = dt.replace(minute=dt.minute - dt.minute % 30, second=0, microsecond=0)
+    elif granularity == "hourly":
+        dt = dt.replace(minute=0, second=0, microsecond=0)
+    elif granularity == "daily":
+        dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif granularity == "weekly":
+        dt = (dt - datetime.timedelta(days=dt.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    elif granularity == "monthly":
+        dt = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        raise ValueError(f"Unbekannte Granularität: {granularity}")
+    return int(dt.timestamp()) * 1000
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ✍️ Fortschreiben (LogWriter)
+# ────────────────────────────────────────────────────────────────────────────────
+def ensure_rollup_table(conn: sqlite3.Connection) -> bool:
+    """
+    Legt die Rollup-Tabelle an und berechnet sie bei Bedarf einmalig aus 'log' nach.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung mit vorhandener Tabelle 'log'.
+
+    Returns:
+        bool: True, wenn nachberechnet wurde.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'log_rollup'"
+    ).fetchone()
+    conn.execute(CREATE_ROLLUP_TABLE)
+    if exists or conn.execute("SELECT 1 FROM log LIMIT 1").fetchone() is None:
+        return False
+    backfill_rollups(conn)
+    return True
+
+
+def last_in_counts(conn: sqlite3.Connection) -> dict[int, int]:
+    """
+    Liefert den letzten IN-Zählerstand je Kamera als Ausgangswert für `in_delta`.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+
+    Returns:
+        dict[int, int]: Kamera-ID (0 = Einzelkamerabetrieb) → letzter IN-Zählerstand.
+    """
+    cameras = [row[0] for row in conn.execute("SELECT DISTINCT camera FROM log_rollup WHERE granularity = 'monthly'")]
+    last = {}
+    for camera in cameras:
+        row = conn.execute(
+            "SELECT in_count FROM log WHERE camera = ? ORDER BY ts DESC LIMIT 1", (camera,)
+        ).fetchone()
+        if row is not None and row[0] is not None:
+            last[camera] = row[0]
+    return last
+
+
+def update_rollups(conn: sqlite3.Connection, rows: list[tuple], last_in: dict[int, int]) -> None:
+    """
+    Schreibt einen Block neuer Rohzeilen in alle Granularitäten fort (im Aufrufer-Transaktionskontext).
+
+    Die Zeilen werden zuerst im Speicher je Bucket zusammengefasst, sodass pro Block
+    und Granularität meist nur ein Upsert anfällt.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+        rows (list[tuple]): Zeilen wie für INSERT_LOG_ROW
+            (ts, camera, in, out, current, total_tracks), chronologisch.
+        last_in (dict[int, int]): Letzter IN-Zählerstand je Kamera-ID; wird fortgeschrieben.
+    """
+    buckets: dict[tuple[str, int, int], list] = {}
+    for ts, camera, in_count, out_count, current_count, total_tracks in rows:
+        previous = last_in.get(camera, 0)
+        in_delta = max(0, in_count - previous)
+        last_in[camera] = in_count
+
+        values = (in_count, out_count, current_count, total_tracks)
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(ts, granularity), camera)
+            agg = buckets.get(key)
+            if agg is None:
+                buckets[key] = [*values, in_delta, 1]
+            else:
+                for i, value in enumerate(values):
+                    agg[i] = max(agg[i], value)
+                agg[4] += in_delta
+                agg[5] += 1
+
+    conn.executemany(UPSERT_ROLLUP, [(*key, *agg) for key, agg in buckets.items()])
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔁 Nachberechnen
+# ────────────────────────────────────────────────────────────────────────────────
+def raw_pruned_before(conn: sqlite3.Connection) -> int:
+    """
+    Zeitpunkt (Epoch-ms), vor dem Rohzeilen gelöscht wurden; 0, wenn noch nie gelöscht wurde.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+    """
+    conn.execute(CREATE_META_TABLE)
+    row = conn.execute("SELECT value FROM log_meta WHERE key = ?", (RAW_PRUNED_BEFORE,)).fetchone()
+    return row[0] if row else 0
+
+
+def backfill_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Berechnet alle Granularitäten aus der Tabelle 'log' neu (in einer Transaktion).
+
+    Wurden Rohzeilen gelöscht (siehe `raw_pruned_before`), bleiben alle Buckets bis
+    einschließlich des angeschnittenen Buckets unverändert; neu berechnet wird nur,
+    was vollständig durch Rohzeilen abgedeckt ist.
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung mit vorhandener Tabelle 'log_rollup'.
+    """
+    pruned_before = raw_pruned_before(conn)
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.rollup_deltas")
+        conn.execute(BACKFILL_DELTAS)
+        for granularity in GRANULARITIES:
+            keep_until = bucket_start(pruned_before, granularity) if pruned_before else -(1 << 62)
+            conn.execute("DELETE FROM log_rollup WHERE granularity = ? AND bucket > ?", (granularity, keep_until))
+            conn.execute(BACKFILL_ROLLUP.format(bucket=BUCKET_SQL[granularity]), (granularity, keep_until))
+    conn.execute("DROP TABLE temp.rollup_deltas")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Lesen (Dashboard)
+# ────────────────────────────────────────────────────────────────────────────────
+def read_rollups(conn: sqlite3.Connection, granularity: str, start: int, end: int) -> list[tuple]:
+    """
+    Liest die Buckets einer Granularität im Zeitfenster [start, end).
+
+    Args:
+        conn (sqlite3.Connection): Offene Verbindung.
+        granularity (str): Eine der GRANULARITIES.
+        start (int): Beginn in Epoch-Millisekunden; der angeschnittene erste Bucket wird mitgeliefert.
+        end (int): Ende in Epoch-Millisekunden (exklusive).
+
+    Returns:
+        list[tuple]: (ts, in_count, out_count, current_count, total_tracks, in_delta, camera) je Bucket.
+    """
+    if start > 0:
+        start = bucket_start(start, granularity)
+    return conn.execute(SELECT_ROLLUP_RANGE, (granularity, start, end)).fetchall()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Entry Point
+# ────────────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    """Berechnet die Rollups einer bestehenden Datenbank neu."""
+    parser = argparse.ArgumentParser(description="Rollup-Tabelle von log.db neu berechnen")
+    parser.add_argument("--db", default="data/log.db", help="Pfad zur SQLite-Datenbank")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        conn.execute(CREATE_ROLLUP_TABLE)
+        start = time.perf_counter()
+        backfill_rollups(conn)
+        count = conn.execute("SELECT count(*) FROM log_rollup").fetchone()[0]
+        print(f"[INFO] {count} Rollup-Zeilen in {time.perf_counter() - start:.1f}s berechnet.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
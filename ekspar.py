@@ -3,7 +3,8 @@
 Startet das gesamte EKSPAR-System inklusive:
 - Streamlit-Dashboard
 - Live-Personenzählung
-- Kamera-Modus-Handling via Lock-Datei
+- Lokale HTTP-API für Live- und Verlaufsdaten (backend/api_server.py)
+- Kamera-Modus-Handling per Steuer-Socket (Lock-Datei als Fallback)
 """
 
 # ─── Standardbibliotheken ──────────────────────────────────────────────────────
@@ -11,14 +12,21 @@ import os
 import subprocess
 import time
 
+from backend.control import (ControlServer, ModeState, read_lock, write_lock, send_command,
+                             COUNTER_SOCKET_PATH, LAUNCHER_SOCKET_PATH, LOCK_PATH)
+
 # ─── Konstante Pfade ───────────────────────────────────────────────────────────
-LOCK_FILE = "camera.lock"
+LOCK_FILE = LOCK_PATH  # Absolut (Projektverzeichnis), wie Dashboard und Zählung
+LOCK_POLL_INTERVAL = 5.0  # Fallback: Lock-Datei ohne Socket-Befehl spätestens alle 5 s prüfen
 CONFIG_FILE = "backend/config/bbox_config.json"
 STREAMLIT_CMD = ["streamlit", "run", "frontend/dashboard.py"]
 COUNTER_CMD = ["python3", "backend/detection/person_counter.py"]
+API_CMD = ["python3", "backend/api_server.py"]  # Adresse/Port: --host/--port bzw. API_HOST/API_PORT
+API_ENABLED = True
 
 streamlit_proc = None
 counter_proc = None
+api_proc = None
 
 def get_camera_mode() -> str | None:
     """
@@ -27,10 +35,7 @@ def get_camera_mode() -> str | None:
     Returns:
         str | None: 'config', 'counting' oder None (nicht gesetzt)
     """
-    if not os.path.exists(LOCK_FILE):
-        return None
-    with open(LOCK_FILE, "r") as f:
-        return f.read().strip()
+    return read_lock(LOCK_FILE)
 
 def lock_camera(mode: str) -> None:
     """
@@ -39,13 +44,11 @@ def lock_camera(mode: str) -> None:
     Args:
         mode (str): 'config' oder 'counting'
     """
-    with open(LOCK_FILE, "w") as f:
-        f.write(mode)
+    write_lock(mode, LOCK_FILE)
 
 def unlock_camera() -> None:
     """Entfernt die Lock-Datei, um den Modus freizugeben."""
-    if os.path.exists(LOCK_FILE):
-        os.remove(LOCK_FILE)
+    write_lock(None, LOCK_FILE)
 
 def start_streamlit() -> None:
     """Startet das Streamlit-Dashboard im Hintergrund."""
@@ -61,6 +64,14 @@ def start_counter() -> None:
         counter_proc = subprocess.Popen(COUNTER_CMD)
 
 
+def start_api() -> None:
+    """Startet die lokale HTTP-API im Hintergrund, sofern aktiviert."""
+    global api_proc
+    if API_ENABLED:
+        print("[INFO] Starte HTTP-API...")
+        api_proc = subprocess.Popen(API_CMD)
+
+
 def stop_counter() -> None:
     """Beendet den Personenzählprozess, falls aktiv."""
     global counter_proc
@@ -71,6 +82,20 @@ def stop_counter() -> None:
         counter_proc = None
 
 
+def counter_has_camera_service() -> bool:
+    """
+    Prüft, ob die laufende Zählung per Steuer-Socket erreichbar ist.
+
+    Ihr Kameradienst liefert dann Standbilder selbst und pausiert im
+    Konfigurationsmodus, statt beendet werden zu müssen.
+
+    Returns:
+        bool: True, wenn die Zählung auf PING antwortet
+    """
+    reply = send_command(COUNTER_SOCKET_PATH, "PING", timeout=1.0)
+    return reply is not None and reply.startswith("OK")
+
+
 def cleanup() -> None:
     """Beendet alle Prozesse und entfernt die Lock-Datei."""
     print("[INFO] Aufräumen...")
@@ -79,6 +104,10 @@ def cleanup() -> None:
         print("[INFO] Beende Streamlit...")
         streamlit_proc.terminate()
         streamlit_proc.wait()
+    if api_proc:
+        print("[INFO] Beende HTTP-API...")
+        api_proc.terminate()
+        api_proc.wait()
     unlock_camera()
     print("[INFO] System beendet.")
 
@@ -104,21 +133,33 @@ def main() -> None:
     else:
         lock_camera("counting")
 
+    # Modus kommt per Socket-Befehl MODE vom Dashboard; die Lock-Datei wird nur
+    # noch als Fallback geprüft (z. B. bei manueller Änderung)
+    mode = ModeState(LOCK_FILE, poll_interval=LOCK_POLL_INTERVAL)
+    control = ControlServer(LAUNCHER_SOCKET_PATH)
+    control.on("MODE", mode.handle_command)
+
     try:
+        control.start()
         start_streamlit()
+        start_api()
         time.sleep(2)  # Dashboard initialisieren lassen
         start_counter()
 
         print("[INFO] EKSPAR-System läuft. STRG+C zum Beenden.")
-        last_mode = get_camera_mode()
+        last_mode = mode.current()
 
         while True:
-            time.sleep(1)
-            current_mode = get_camera_mode()
+            mode.changed.wait(LOCK_POLL_INTERVAL)
+            mode.changed.clear()
+            current_mode = mode.current()
 
             if current_mode == "config" and last_mode != "config":
-                print("[INFO] Konfigurationsmodus erkannt – stoppe Zählung...")
-                stop_counter()
+                if counter_has_camera_service():
+                    print("[INFO] Konfigurationsmodus erkannt – Zählung pausiert, Kamera bleibt aktiv.")
+                else:
+                    print("[INFO] Konfigurationsmodus erkannt – stoppe Zählung...")
+                    stop_counter()
 
             if current_mode == "counting" and last_mode != "counting":
                 print("[INFO] Zählmodus erkannt – starte Zählung neu...")
@@ -129,6 +170,7 @@ def main() -> None:
     except KeyboardInterrupt:
         print("\n[INFO] STRG+C erkannt. Beende...")
     finally:
+        control.stop()
         cleanup()
 
 
@@ -7,9 +7,17 @@ from PIL import Image, ImageDraw
 import json
 import os
 import math
+import socket
+import time
 from datetime import datetime
+from urllib.parse import urlencode
 import io
 from backend.camera.camera_interface import capture_image
+from backend.control import switch_mode
+from backend.storage.live_state import read_live_state
+from backend.detection.stage_stats import read_stage_stats
+from backend.storage import export
+from backend.api_server import API_PORT
 
 # ─── Pfade setzen ───
 CURRENT_DIR = os.path.dirname(__file__)
@@ -17,8 +25,13 @@ ROOT_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 CONFIG_PATH = os.path.join(ROOT_DIR, "backend", "config", "bbox_config.json")
 IMAGE_PATH = os.path.join(ROOT_DIR, "static", "last_config.jpg")
 COUNTER_PATH = os.path.join(ROOT_DIR, "data", "counter.json")
+LIVE_STATE_PATH = os.path.join(ROOT_DIR, "data", "counter.bin")
+STATS_PATH = os.path.join(ROOT_DIR, "data", "stats.json")
+STATS_STALE_SECONDS = 30  # Ältere Statistiken gelten als veraltet (Zählung gestoppt?)
 DIRECTION_PATH = os.path.join(ROOT_DIR, "backend", "config", "direction_config.json")
 LOCK_PATH = os.path.join(ROOT_DIR, "camera.lock")
+LIVE_REFRESH_SECONDS = 2       # Eigenes Aktualisierungsintervall des Live-Zählers (Fragment)
+HISTORY_REFRESH_SECONDS = 30   # Verlauf höchstens so oft neu aufbauen, und nur bei geänderten Zählerständen
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Utility Funktionen (Bild laden, Hilfsfunktionen, Pfeile etc.)
@@ -136,25 +149,67 @@ def save_bbox(bbox: dict) -> None:
 # ────────────────────────────────────────────────────────────────────────────────
 # 📊 Datenaggregation für Zeitverlauf (Dashboard-Backend)
 # ────────────────────────────────────────────────────────────────────────────────
+# Zeitfilter, die direkt die vorberechneten Rollups lesen (statt Rohdaten zu aggregieren);
+# Rohzeilen werden nur RETENTION_RAW_DAYS (7 Tage) aufbewahrt, siehe backend/storage/retention.py
+ROLLUP_GRANULARITY = {
+    "Letzter Monat": "daily",
+    "Letztes Jahr": "weekly",
+    "Insgesamt": "monthly",
+}
+
+# Kurze Zeitfilter (Rohdaten): IN-Zuwächse aus den Rollups derselben Bucket-Größe wie
+# die Rundung in `apply_dynamic_aggregation`, damit der erste Bucket wie bei den
+# langen Filtern gegen die letzte Zeile vor dem Zeitfenster gerechnet wird
+RAW_DELTA_GRANULARITY = {
+    "Heute": "10min",
+    "Gestern": "30min",
+    "Letzte Woche": "hourly",
+}
+
+def to_epoch_ms(ts: pd.Timestamp) -> int:
+    """Wandelt einen Zeitpunkt in Ortszeit (ohne Zeitzone) in Epoch-Millisekunden wie die Spalte `ts`."""
+    return int(ts.to_pydatetime().timestamp() * 1000)
+
+def get_time_range(time_filter: str, now: pd.Timestamp) -> tuple[int, int]:
+    """
+    Bestimmt das Zeitfenster eines Zeitfilters als halboffenes Intervall [Beginn, Ende).
+
+    Die Grenzen sind Epoch-Millisekunden wie die Spalte `ts` und können direkt
+    im `WHERE` über den Primärschlüssel verwendet werden.
+
+    Args:
+        time_filter: Zeitbereichsfilter (z. B. "Heute", "Gestern", "Letzte Woche" etc.)
+        now: Aktueller Zeitpunkt (Ortszeit, ohne Zeitzone).
+
+    Returns:
+        Tuple (Beginn, Ende) in Epoch-ms; "Insgesamt" liefert den gesamten Bereich.
+    """
+    today = now.normalize()
+
+    if time_filter == "Heute":
+        return to_epoch_ms(today), to_epoch_ms(today + pd.Timedelta(days=1))
+    if time_filter == "Gestern":
+        return to_epoch_ms(today - pd.Timedelta(days=1)), to_epoch_ms(today)
+    if time_filter == "Letzte Woche":
+        return to_epoch_ms(now - pd.Timedelta(days=7)), export.OPEN_END
+    if time_filter == "Letzter Monat":
+        return to_epoch_ms(now - pd.DateOffset(months=1)), export.OPEN_END
+    if time_filter == "Letztes Jahr":
+        return to_epoch_ms(now - pd.DateOffset(years=1)), export.OPEN_END
+    return 0, export.OPEN_END  # Insgesamt
 
 def apply_dynamic_aggregation(df: pd.DataFrame, time_filter: str) -> pd.DataFrame:
     """
     Aggregiert die Zähldaten je nach Zeitfilter für Visualisierungen im Dashboard.
 
     Args:
-        df: DataFrame mit Zeitstempeln und Zähldaten.
+        df: DataFrame mit Zähldaten und Spalte 'timestamp' (datetime64 in Ortszeit, bereits
+            aus `ts` per `history.ms_to_local` berechnet – hier wird nichts geparst).
         time_filter: Zeitbereichsfilter (z. B. "Heute", "Gestern", "Letzte Woche" etc.)
 
     Returns:
         Aggregierter DataFrame mit gruppierten Zeitwerten.
     """
-    # Sicherstellen, dass Timestamps korrekt interpretiert werden
-    df["timestamp"] = pd.to_datetime(
-        df["timestamp"],
-        format="%Y-%m-%dT%H:%M:%S.%f",
-        errors="coerce"
-    )
-
     # Dynamisch runden je nach Filter
     if time_filter == "Heute":
         df["rounded_time"] = df["timestamp"].dt.floor("10min")
@@ -190,19 +245,20 @@ def apply_dynamic_aggregation(df: pd.DataFrame, time_filter: str) -> pd.DataFram
 # ────────────────────────────────────────────────────────────────────────────────
 # 📊 Dashboard – Live-Zähler & Visualisierungen
 # ────────────────────────────────────────────────────────────────────────────────
-def show_live_counts() -> None:
+def show_live_counts() -> dict | None:
     """
     Zeigt die aktuellen Live-Zähler im Dashboard an (IN, OUT, Aktuell, Tracks).
 
-    Lädt die Daten aus der counter.json-Datei und zeigt sie in vier Spalten.
-    """
-    if not os.path.exists(COUNTER_PATH):
-        st.warning("❌ Zählerdatei nicht gefunden.")
-        return
+    Liest den Live-Zählerstand (bevorzugt counter.bin, sonst counter.json) und zeigt ihn in vier Spalten.
 
+    Returns:
+        dict | None: Gelesener Zählerstand oder None.
+    """
     try:
-        with open(COUNTER_PATH, "r") as f:
-            data = json.load(f)
+        data = read_live_state(COUNTER_PATH, LIVE_STATE_PATH)
+        if data is None:
+            st.warning("❌ Zählerdatei nicht gefunden.")
+            return None
 
         # Live-Zähler anzeigen
         col1, col2, col3, col4 = st.columns(4)
@@ -216,14 +272,46 @@ def show_live_counts() -> None:
         if timestamp:
             try:
                 ts = datetime.fromisoformat(timestamp)
-                st.caption(f"Aktualisiert: {ts.strftime('%Y-%m-%d %H:%M:%S')}")
+                st.caption(f"Letzte Änderung: {ts.strftime('%Y-%m-%d %H:%M:%S')}")
             except Exception:
                 st.caption("⚠️ Ungültiger Zeitstempel")
         else:
             st.caption("ℹ️ Kein Zeitstempel verfügbar")
+        return data
 
     except Exception as e:
         st.error(f"Fehler beim Laden der Zähldaten: {e}")
+        return None
+
+
+def _live_key(data: dict | None) -> tuple | None:
+    """Zählerstände, deren Änderung einen neuen Verlauf rechtfertigt."""
+    return (data.get("in"), data.get("out")) if data else None
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_counts_fragment() -> None:
+    """
+    Live-Zähler als Fragment: wird alle LIVE_REFRESH_SECONDS Sekunden für sich neu gezeichnet.
+
+    Liest nur den Live-Zählerstand; Verlauf und Diagramme bleiben unberührt. Erst wenn
+    sich die Zählerstände seit dem letzten Aufbau des Verlaufs geändert haben und dieser
+    mindestens HISTORY_REFRESH_SECONDS alt ist, wird die ganze Seite neu ausgeführt.
+    """
+    data = show_live_counts()
+    rendered_at = st.session_state.get("history_rendered_at")
+    if (
+        rendered_at is not None
+        and _live_key(data) != st.session_state.get("history_live_key")
+        and time.monotonic() - rendered_at >= HISTORY_REFRESH_SECONDS
+    ):
+        st.rerun()
+
+
+def mark_history_rendered() -> None:
+    """Merkt sich Zeitpunkt und Zählerstände des zuletzt aufgebauten Verlaufs (für `live_counts_fragment`)."""
+    st.session_state.history_rendered_at = time.monotonic()
+    st.session_state.history_live_key = _live_key(read_live_state(COUNTER_PATH, LIVE_STATE_PATH))
 
 
 def show_count_history(df: pd.DataFrame, time_filter: str, y_axis_step: int = 1) -> None:
@@ -251,8 +339,6 @@ def show_count_history(df: pd.DataFrame, time_filter: str, y_axis_step: int = 1)
         st.info("ℹ️ Keine Daten für den ausgewählten Zeitraum.")
         return
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
     df = df.sort_values("timestamp")
     df["current_count"] = df["current_count"].fillna(0).astype(int)
 
@@ -275,17 +361,17 @@ def show_count_history(df: pd.DataFrame, time_filter: str, y_axis_step: int = 1)
     st.altair_chart(chart, use_container_width=True)
 
 
-def show_hourly_distribution(df: pd.DataFrame) -> alt.Chart:
+def show_hourly_distribution(profile: pd.DataFrame) -> alt.Chart:
     """
     Erstellt ein Balkendiagramm mit der Verteilung der erfassten Personen pro Stunde.
 
     Args:
-        df (pd.DataFrame): Zeitstempelbasierter Zähldatensatz mit Spalte 'in_delta'.
+        profile (pd.DataFrame): Tagesprofil aus `history.load_time_of_day` (Spalten 'hour', 'in_delta').
 
     Returns:
         alt.Chart: Altair-Balkendiagramm mit Personenverteilung nach Stunde.
     """
-    if df.empty or "timestamp" not in df.columns or "in_delta" not in df.columns:
+    if profile.empty:
         return alt.Chart(pd.DataFrame(columns=["hour", "in_delta"])).mark_bar().encode(
             x=alt.X("hour:O", title="Stunde des Tages"),
             y=alt.Y("in_delta:Q", title="Personenanzahl")
@@ -295,10 +381,7 @@ def show_hourly_distribution(df: pd.DataFrame) -> alt.Chart:
             title="📊 Personen pro Stunde (keine Daten)"
         )
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df["hour"] = df["timestamp"].dt.hour
-    hourly = df.groupby("hour")["in_delta"].sum().reset_index()
+    hourly = profile.groupby("hour", as_index=False)["in_delta"].sum()
 
     chart = alt.Chart(hourly).mark_bar().encode(
         x=alt.X("hour:O", title="Stunde des Tages", sort=list(range(24))),
@@ -313,17 +396,17 @@ def show_hourly_distribution(df: pd.DataFrame) -> alt.Chart:
     return chart
 
 
-def show_daily_average(df: pd.DataFrame) -> alt.Chart:
+def show_daily_average(profile: pd.DataFrame) -> alt.Chart:
     """
     Zeigt den durchschnittlichen Tagesverlauf der Personenzählung.
 
     Args:
-        df (pd.DataFrame): Zeitstempelbasierter Zähldatensatz mit Spalte 'in_delta'.
+        profile (pd.DataFrame): Tagesprofil aus `history.load_time_of_day` (Spalten 'time', 'in_delta_avg').
 
     Returns:
         alt.Chart: Altair-Liniendiagramm mit Durchschnittszählung pro Zeitfenster.
     """
-    if df.empty or "timestamp" not in df.columns:
+    if profile.empty:
         return alt.Chart(pd.DataFrame(columns=["time", "in_delta"])).mark_line().encode(
             x="time:O", y="in_delta:Q"
         ).properties(
@@ -331,19 +414,7 @@ def show_daily_average(df: pd.DataFrame) -> alt.Chart:
             title="📈 Durchschnittlicher Tagesverlauf (keine Daten)"
         )
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-
-    # Fehlende Spalte dynamisch berechnen
-    if "in_delta" not in df.columns and "in_count" in df.columns:
-        df["in_delta"] = df["in_count"].diff().fillna(df["in_count"]).clip(lower=0)
-    elif "in_delta" not in df.columns:
-        df["in_delta"] = 0
-
-    # Zeit extrahieren (nur Uhrzeit für Gruppierung)
-    df["time"] = df["timestamp"].dt.strftime("%H:%M")
-    daily_avg = df.groupby("time")["in_delta"].mean().reset_index()
-    daily_avg["in_delta"] = daily_avg["in_delta"].round(2)
+    daily_avg = profile[["time", "in_delta_avg"]].rename(columns={"in_delta_avg": "in_delta"})
 
     chart = alt.Chart(daily_avg).mark_line(
         point=True,
@@ -359,6 +430,229 @@ def show_daily_average(df: pd.DataFrame) -> alt.Chart:
 
     return chart
 
+# ────────────────────────────────────────────────────────────────────────────────
+# 📤 Export (erst auf Anforderung, blockweise aus der Datenbank)
+# ────────────────────────────────────────────────────────────────────────────────
+EXPORT_GRANULARITIES = {
+    "Rohdaten": export.RAW,
+    "10 Minuten": "10min",
+    "30 Minuten": "30min",
+    "Stündlich": "hourly",
+    "Täglich": "daily",
+    "Wöchentlich": "weekly",
+    "Monatlich": "monthly",
+}
+EXPORT_API_TIMEOUT = 0.3  # Sekunden für die Erreichbarkeitsprüfung der HTTP-API
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def api_reachable(host: str, port: int = API_PORT) -> bool:
+    """Prüft (zwischengespeichert), ob die lokale HTTP-API unter host:port Verbindungen annimmt."""
+    try:
+        with socket.create_connection((host, port), timeout=EXPORT_API_TIMEOUT):
+            return True
+    except OSError:
+        return False
+
+
+def export_api_url(params: dict) -> str | None:
+    """
+    Download-Link auf `/api/export`, sofern die HTTP-API für den Browser erreichbar ist.
+
+    Der Browser erreicht die API unter demselben Hostnamen wie das Dashboard; ist sie
+    dort nicht erreichbar (z. B. nur an 127.0.0.1 gebunden, Zugriff aus dem Netz),
+    gibt es keinen Link.
+
+    Args:
+        params (dict): Query-Parameter (format, bucket, start, end, camera, name).
+
+    Returns:
+        str | None: URL oder None.
+    """
+    host = (st.context.headers.get("Host") or "127.0.0.1").rsplit(":", 1)[0].strip("[]")
+    if not api_reachable(host):
+        return None
+    url_host = f"[{host}]" if ":" in host else host
+    query = urlencode({k: v for k, v in params.items() if v is not None})
+    return f"http://{url_host}:{API_PORT}/api/export?{query}"
+
+
+def discard_export() -> None:
+    """Entfernt die vorbereitete Exportdatei nach dem Herunterladen (Callback des Download-Buttons)."""
+    prepared = st.session_state.pop("export", None)
+    if prepared and os.path.exists(prepared["path"]):
+        os.remove(prepared["path"])
+
+def show_export(db_path: str, time_filter: str, start: int, end: int, camera: str | None = None) -> None:
+    """
+    Export-Bereich: Die Datei wird erst nach Klick blockweise aus SQLite erzeugt.
+
+    Läuft die HTTP-API, führt der Download-Link auf `/api/export`: Die API erzeugt die
+    Datei und sendet sie blockweise von der Festplatte, das Dashboard lädt sie nie.
+    Ohne API wird die Datei wie bisher vorbereitet und nach dem Herunterladen wieder
+    entfernt, damit spätere Reruns sie nicht erneut einlesen.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        time_filter (str): Aktueller Zeitfilter (für den Dateinamen).
+        start (int): Beginn des Zeitfensters in Epoch-ms.
+        end (int): Ende des Zeitfensters in Epoch-ms (exklusive).
+        camera (str | None): Ausgewählte Kamera (None = alle).
+    """
+    with st.expander("📤 Export"):
+        formats = ["CSV", "Parquet"] if export.parquet_available() else ["CSV"]
+        col1, col2 = st.columns(2)
+        fmt = col1.radio("Format", formats, horizontal=True).lower()
+        label = col2.selectbox("Auflösung", list(EXPORT_GRANULARITIES))
+        granularity = EXPORT_GRANULARITIES[label]
+        name = f"ekspar_export_{time_filter.lower().replace(' ', '_')}_{granularity}.{fmt}"
+
+        url = export_api_url({"format": fmt, "bucket": granularity, "start": start, "end": end,
+                              "camera": camera, "name": name})
+        if url is not None:
+            st.link_button("📥 Herunterladen", url)
+        else:
+            if st.button("Export erstellen"):
+                discard_export()
+                with st.spinner("Export wird erstellt …"):
+                    path, count = export.export_file(db_path, fmt, granularity, start, end, camera)
+                st.session_state.export = {"path": path, "count": count, "fmt": fmt, "name": name}
+
+            prepared = st.session_state.get("export")
+            if prepared and os.path.exists(prepared["path"]):
+                with open(prepared["path"], "rb") as f:
+                    st.download_button(
+                        label=f"📥 Herunterladen ({prepared['count']:,} Zeilen)",
+                        data=f,
+                        file_name=prepared["name"],
+                        mime="text/csv" if prepared["fmt"] == "csv" else "application/vnd.apache.parquet",
+                        on_click=discard_export
+                    )
+        st.caption("Exportiert Rohdaten oder vorberechnete Zeitbuckets des gewählten Zeitraums.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖥 System – Laufzeiten der Zählpipeline
+# ────────────────────────────────────────────────────────────────────────────────
+STAGE_LABELS = {
+    "capture": "📷 Aufnahme (Warten auf Kamera)",
+    "motion_gate": "🎚 Bewegungsfilter",
+    "preprocess": "🧹 Vorverarbeitung",
+    "inference": "🧠 Inferenz",
+    "tracking": "🧭 Tracking",
+    "counting": "🔢 Zählung",
+    "export": "💾 Export (JSON + DB)",
+}
+
+
+def stage_histogram_chart(stage: dict, edges: list[int], title: str) -> alt.Chart:
+    """
+    Erstellt ein Balkendiagramm der Laufzeitverteilung einer Stufe.
+
+    Args:
+        stage (dict): Auswertung der Stufe mit Schlüssel 'histogram'.
+        edges (list[int]): Klassengrenzen in ms.
+        title (str): Diagrammtitel.
+
+    Returns:
+        alt.Chart: Altair-Balkendiagramm (Anzahl Messwerte je Zeitklasse).
+    """
+    labels = [f"< {edges[0]} ms"]
+    labels += [f"{lo}–{hi} ms" for lo, hi in zip(edges[:-1], edges[1:])]
+    labels.append(f"≥ {edges[-1]} ms")
+    hist = pd.DataFrame({"Dauer": labels, "Anzahl": stage.get("histogram", [0] * len(labels))})
+
+    return alt.Chart(hist).mark_bar().encode(
+        x=alt.X("Dauer:N", title="Dauer", sort=labels),
+        y=alt.Y("Anzahl:Q", title="Anzahl Frames"),
+        tooltip=["Dauer", "Anzahl"]
+    ).properties(
+        width="container",
+        height=250,
+        title=title
+    )
+
+
+def show_system_stats() -> None:
+    """
+    Zeigt FPS, Perzentile und Laufzeitverteilung je Pipeline-Stufe sowie Kennzahlen
+    von Datenbank-Writer, Pipeline und Tracker (aus data/stats.json).
+    """
+    data = read_stage_stats(STATS_PATH)
+    if data is None:
+        st.warning("❌ Keine Laufzeitstatistik gefunden – läuft die Zählung?")
+        return
+
+    try:
+        ts = datetime.fromisoformat(data["timestamp"])
+        age = (datetime.now() - ts).total_seconds()
+        if age > STATS_STALE_SECONDS:
+            st.warning(f"⚠️ Statistik ist {age:.0f} s alt – die Zählung läuft vermutlich nicht.")
+        st.caption(f"Stand: {ts.strftime('%Y-%m-%d %H:%M:%S')} · Laufzeit: {data.get('uptime_s', 0):.0f} s")
+    except Exception:
+        st.caption("⚠️ Ungültiger Zeitstempel")
+
+    # ── Übersicht ──
+    frames = data.get("frames", {})
+    extra = data.get("extra", {})
+    db = extra.get("db", {})
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("🎞 FPS", f"{data.get('fps', 0):.1f}")
+    col2.metric("🧠 Verarbeitet", frames.get("processed", 0))
+    col3.metric("💤 Übersprungen", frames.get("skipped", 0))
+    col4.metric("💾 Max. DB-Commit", f"{db.get('max_commit_ms', 0):.1f} ms")
+
+    # ── Perzentile je Stufe ──
+    stages = data.get("stages", {})
+    rows = [
+        {
+            "Stufe": STAGE_LABELS.get(name, name),
+            "Messwerte": s["count"],
+            "Ø ms": s["mean_ms"],
+            "p50 ms": s["p50_ms"],
+            "p95 ms": s["p95_ms"],
+            "p99 ms": s["p99_ms"],
+            "Max ms": s["max_ms"],
+        }
+        for name, s in stages.items() if s.get("count")
+    ]
+    st.markdown("### ⏱ Laufzeiten je Stufe")
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    else:
+        st.info("ℹ️ Noch keine Messwerte vorhanden.")
+
+    # ── Verteilung einer Stufe ──
+    measured = [name for name, s in stages.items() if s.get("count")]
+    if measured:
+        selected = st.selectbox("Verteilung anzeigen für", measured,
+                                format_func=lambda name: STAGE_LABELS.get(name, name))
+        st.altair_chart(
+            stage_histogram_chart(stages[selected], data.get("bucket_edges_ms", []),
+                                  f"📊 {STAGE_LABELS.get(selected, selected)}"),
+            use_container_width=True
+        )
+
+    # ── Weitere Kennzahlen ──
+    with st.expander("🔧 Details (Datenbank, Pipeline, Tracker)"):
+        if db:
+            st.markdown(
+                f"**Datenbank:** {db.get('rows_written', 0)} Zeilen in {db.get('commits', 0)} Commits · "
+                f"Ø {db.get('avg_commit_ms', 0):.1f} ms · max {db.get('max_commit_ms', 0):.1f} ms · "
+                f"offen {db.get('rows_pending', 0)}"
+            )
+        pipeline = extra.get("pipeline")
+        if pipeline:
+            st.markdown(
+                f"**Pipeline:** Latenz Ø {pipeline.get('avg_latency_ms', 0):.0f} ms · "
+                f"Aufnahme-Drops {pipeline.get('capture_drops', 0)} · Export-Queue {pipeline.get('export_queue_depth', 0)}"
+            )
+        tracks = extra.get("tracks")
+        if tracks:
+            st.markdown(
+                f"**Tracker:** {tracks.get('live_tracks', 0)} aktiv · {tracks.get('evicted_tracks', 0)} entfernt · "
+                f"{tracks.get('history_points', 0)} Verlaufspunkte"
+            )
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧭 Konfigurationsmodus – Schrittweises UI (Schritt 1–4 + Übersicht)
 # ────────────────────────────────────────────────────────────────────────────────
@@ -563,8 +857,9 @@ def draw_overview_and_save() -> None:
         if st.button("💾 Konfiguration speichern & System starten"):
             with open(DIRECTION_PATH, "w") as f:
                 json.dump(st.session_state.direction, f, indent=4)
-            with open("camera.lock", "w") as f:
-                f.write("counting")
+            # Lock-Datei schreiben und Zählung/Starter per Socket benachrichtigen;
+            # eine laufende Zählung übernimmt die Konfiguration ohne Neustart
+            switch_mode("counting", LOCK_PATH)
 
             st.session_state.pop("step", None)
             st.success("✅ Konfiguration gespeichert. System startet...")
@@ -585,9 +880,10 @@ def reset_config(delete_files: bool = False) -> None:
     st.session_state.bbox = None
     st.session_state.direction = []
     if delete_files:
-        for path in [CONFIG_PATH, DIRECTION_PATH, LOCK_PATH]:
+        for path in [CONFIG_PATH, DIRECTION_PATH]:
             if os.path.exists(path):
                 os.remove(path)
+        switch_mode(None, LOCK_PATH)  # Entfernt camera.lock, laufende Zählung pausiert sofort
 
 
 def show_config_overview() -> None:
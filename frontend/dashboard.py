@@ -18,7 +18,9 @@ from PIL import Image, ImageDraw
 
 # ─── Eigene Module ─────────────────────────────────────────────────────────────
 from backend.camera.camera_interface import capture_image
-from frontend import components
+from backend.storage.log_writer import ensure_log_schema, log_schema_state
+from backend.storage.rollups import ensure_rollup_table
+from frontend import components, history
 
 # ─── Systempfade und Konstanten ────────────────────────────────────────────────
 st.set_page_config(page_title="EKSPAR", layout="wide")
@@ -42,30 +44,55 @@ if "step" not in st.session_state and (not os.path.exists(CONFIG_PATH) or not os
 # ────────────────────────────────────────────────────────────────────────────────
 # 🗃 Datenbank-Initialisierung
 # ────────────────────────────────────────────────────────────────────────────────
+class PendingMigration(Exception):
+    """Die Datenbank muss erst vom Zählprozess bzw. `migrate_log.py` umgestellt werden."""
+
+
+@st.cache_resource(show_spinner=False)
 def init_db() -> None:
     """
-    Erstellt (falls nötig) die SQLite-Datenbank mit Tabelle für Zähldaten.
+    Prüft die SQLite-Datenbank einmal je Prozess und legt sie (leer) an, falls sie fehlt.
+
+    Die Prüfung ist rein lesend; die Schreibsperre wird nur für eine neue, leere
+    Datenbank genommen. Migration und Rollup-Nachberechnung bestehender Daten
+    übernehmen der Zählprozess bzw. `backend/storage/migrate_log.py` – solange sie
+    ausstehen, wird eine Exception ausgelöst (und nicht zwischengespeichert), sodass
+    der nächste Rerun erneut prüft.
     """
-    try:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    state = "missing"
+    if os.path.exists(DB_PATH):
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+        try:
+            state = log_schema_state(conn)
+        finally:
+            conn.close()
+
+    if state == "missing":
         conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS log (
-                timestamp TEXT,
-                in_count INTEGER,
-                out_count INTEGER,
-                current_count INTEGER,
-                total_tracks INTEGER
-            )
-        """)
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        st.error("❌ Fehler beim Initialisieren der Datenbank.")
-        st.exception(e)
+        try:
+            ensure_log_schema(conn)
+            ensure_rollup_table(conn)
+            conn.commit()
+        finally:
+            conn.close()
+    elif state != "current":
+        raise PendingMigration(state)
+
 
 # ─── Init ───
-init_db()
+db_ready = False
+try:
+    init_db()
+    db_ready = True
+except PendingMigration:
+    st.warning(
+        "⚠️ Die Datenbank wird noch umgestellt (altes Schema bzw. fehlende Rollups). "
+        "Bitte die Zählung starten oder `python backend/storage/migrate_log.py` ausführen."
+    )
+except Exception as e:
+    st.error("❌ Fehler beim Initialisieren der Datenbank.")
+    st.exception(e)
 
 # ─── UI-Stil ───
 st.markdown("""
@@ -80,13 +107,13 @@ st.markdown("""
 
 # ─── Seitennavigation ───
 st.title("EKSPAR – Live Dashboard")
-page = st.sidebar.radio("Navigation", ["📈 Live Dashboard", "📷 Konfiguration"])
+page = st.sidebar.radio("Navigation", ["📈 Live Dashboard", "🖥 System", "📷 Konfiguration"])
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📈 Live-Modus: Daten laden & visualisieren
 # ────────────────────────────────────────────────────────────────────────────────
 if page == "📈 Live Dashboard":
-    components.show_live_counts()
+    components.live_counts_fragment()
 
     st.markdown("---")
     st.markdown("## 📈 Verlauf – Personen im Raum")
@@ -99,66 +126,64 @@ if page == "📈 Live Dashboard":
 
     now = pd.Timestamp.now().tz_localize(None)
 
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query("SELECT * FROM log", conn)
-        conn.close()
-
-        df["timestamp"] = pd.to_datetime(df["timestamp"], format="%Y-%m-%dT%H:%M:%S.%f", errors="coerce")
-        df = df.sort_values("timestamp")
-
-        if time_filter == "Heute":
-            df = df[df["timestamp"].dt.date == now.date()]
-        elif time_filter == "Gestern":
-            df = df[df["timestamp"].dt.date == (now - pd.Timedelta(days=1)).date()]
-        elif time_filter == "Letzte Woche":
-            df = df[df["timestamp"] >= now - pd.Timedelta(days=7)]
-        elif time_filter == "Letzter Monat":
-            df = df[df["timestamp"] >= now - pd.DateOffset(months=1)]
-        elif time_filter == "Letztes Jahr":
-            df = df[df["timestamp"] >= now - pd.DateOffset(years=1)]
-
-        df = components.apply_dynamic_aggregation(df, time_filter)
-        df["in_delta"] = df["in_count"].diff().fillna(df["in_count"]).clip(lower=0)
-        total_people = int(df["in_delta"].sum())
-
-
-        # Dynamische Textausgabe (sprachlich korrekt)
-        filter_text = {
-            "Heute": "heute",
-            "Gestern": "gestern",
-            "Letzte Woche": "in der letzten Woche",
-            "Letzter Monat": "im letzten Monat",
-            "Letztes Jahr": "im letzten Jahr",
-            "Insgesamt": "insgesamt"
-        }
+    if not db_ready:
+        st.info("📌 Der Verlauf erscheint, sobald die Datenbank umgestellt ist.")
+    else:
+        try:
+            # Nur neu angehängte Zeilen nachladen; lange Zeiträume kommen aus den Rollups,
+            # kurze aus den zwischengespeicherten Rohzeilen der letzten 8 Tage (eine Woche plus Reserve)
+            store = history.get_history_store(DB_PATH)
+            last_key = store.refresh(now)
+            start, end = components.get_time_range(time_filter, now.floor("min"))
 
-        st.markdown(f"""
-            <div class="big-metric">👥 {total_people:,} Personen {filter_text.get(time_filter, '')}</div>
-        """, unsafe_allow_html=True)
+            # Mehrkamerabetrieb: Zählerstände sind je Kamera kumulativ → eine Kamera auswählen
+            cameras = store.cameras()
+            camera = st.sidebar.selectbox("Kamera", cameras) if len(cameras) > 1 else None
 
-        components.show_count_history(df, time_filter)
+            df = history.load_history(DB_PATH, store.identity, last_key, time_filter, start, end, camera)
+            total_people = int(df["in_delta"].sum())
 
-        if not df.empty:
-            if time_filter in ["Heute", "Gestern", "Letzte Woche"]:
-                st.altair_chart(components.show_hourly_distribution(df), use_container_width=True)
 
-            if time_filter in ["Letzte Woche", "Letzter Monat", "Insgesamt"]:
-                st.altair_chart(components.show_daily_average(df), use_container_width=True)
+            # Dynamische Textausgabe (sprachlich korrekt)
+            filter_text = {
+                "Heute": "heute",
+                "Gestern": "gestern",
+                "Letzte Woche": "in der letzten Woche",
+                "Letzter Monat": "im letzten Monat",
+                "Letztes Jahr": "im letzten Jahr",
+                "Insgesamt": "insgesamt"
+            }
 
-        st.download_button(
-            label="📤 CSV-Export starten",
-            data=df.to_csv(index=False).encode("utf-8"),
-            file_name=f"ekpsar_export_{time_filter.lower().replace(' ', '_')}.csv",
-            mime="text/csv"
-        )
+            st.markdown(f"""
+                <div class="big-metric">👥 {total_people:,} Personen {filter_text.get(time_filter, '')}</div>
+            """, unsafe_allow_html=True)
 
-        st.caption("Exportiert die aggregierten Zähldaten im CSV-Format.")
+            components.show_count_history(df, time_filter)
 
-    except Exception as e:
-        st.error("❌ Fehler beim Laden oder Verarbeiten der Verlaufsdaten.")
-        st.info("📌 Bitte prüfe die Datenbankverbindung, Zeitfilter oder exportierte Dateien.")
-        st.exception(e)
+            if not df.empty:
+                # Gemeinsames Tagesprofil (Stunden-Buckets) für beide Diagramme, je Zeitfenster zwischengespeichert
+                profile = history.load_time_of_day(DB_PATH, store.identity, last_key, start, end, camera)
+
+                if time_filter in ["Heute", "Gestern", "Letzte Woche"]:
+                    st.altair_chart(components.show_hourly_distribution(profile), use_container_width=True)
+
+                if time_filter in ["Letzte Woche", "Letzter Monat", "Insgesamt"]:
+                    st.altair_chart(components.show_daily_average(profile), use_container_width=True)
+
+            components.show_export(DB_PATH, time_filter, start, end, camera)
+            components.mark_history_rendered()
+
+        except Exception as e:
+            st.error("❌ Fehler beim Laden oder Verarbeiten der Verlaufsdaten.")
+            st.info("📌 Bitte prüfe die Datenbankverbindung, Zeitfilter oder exportierte Dateien.")
+            st.exception(e)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖥 System: Laufzeiten der Zählpipeline
+# ────────────────────────────────────────────────────────────────────────────────
+elif page == "🖥 System":
+    st.markdown("## 🖥 System – Laufzeiten der Zählung")
+    components.show_system_stats()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧭 Konfigurationsmodus
@@ -0,0 +1,357 @@
+# frontend/history.py – Datenschicht für den Verlauf im Dashboard
+"""
+Zwischengespeicherter, inkrementell nachgeladener Verlauf aus `data/log.db`.
+
+- `HistoryStore` (per `st.cache_resource` einmal je Datenbank): eine gemeinsame
+  Lese-Verbindung und die Rohzeilen des längsten Zeitraums, der aus Rohdaten
+  gezeigt wird (eine Woche; ältere Rohzeilen löscht die Aufbewahrung). Bei jedem Rerun werden nur die seit dem letzten Laden
+  angehängten Zeilen gelesen (Primärschlüssel `(ts, camera)` größer als der
+  zuletzt geladene).
+- `load_history()` (per `st.cache_data`): aggregierter Verlauf je Zeitfilter und
+  Kamera, verschlüsselt über Datenbankidentität und letzten Schlüssel. Ein Wechsel
+  des Filters ist damit eine reine Speicheroperation; neu gerechnet wird nur, wenn
+  tatsächlich neue Zeilen vorliegen.
+- `load_time_of_day()` (per `st.cache_data`): gemeinsames Tagesprofil des gewählten
+  Zeitfensters für "Personen pro Stunde" und "Durchschnittlicher Tagesverlauf",
+  per `np.bincount` über ganzzahlige Minuten-des-Tages aus den Stunden-Buckets.
+
+Zeitpunkte kommen als Epoch-Millisekunden (`ts`) aus der Datenbank und werden
+vektorisiert in Ortszeit umgerechnet (`ms_to_local`); Zeit-Strings werden nicht
+mehr geparst.
+
+Die Datenbankidentität (Gerät + Inode) ändert sich, wenn die Datei ersetzt wird
+(z. B. nach dem Zurücksetzen); dann wird ein neuer Store angelegt.
+"""
+
+# ─── Imports ───────────────────────────────────────────────────────────────────
+import datetime
+import os
+import sqlite3
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from backend.storage.rollups import bucket_start, read_rollups
+from frontend import components
+
+# ─── SQL ───────────────────────────────────────────────────────────────────────
+LOG_COLUMNS = ["ts", "in_count", "out_count", "current_count", "total_tracks", "camera"]
+
+SELECT_LOG_SINCE_TIME = """
+    SELECT l.ts, l.in_count, l.out_count, l.current_count, l.total_tracks, NULLIF(c.name, ''), l.camera
+    FROM log l JOIN camera c ON c.id = l.camera
+    WHERE l.ts >= ?
+    ORDER BY l.ts, l.camera
+"""
+
+SELECT_LOG_AFTER_KEY = """
+    SELECT l.ts, l.in_count, l.out_count, l.current_count, l.total_tracks, NULLIF(c.name, ''), l.camera
+    FROM log l JOIN camera c ON c.id = l.camera
+    WHERE (l.ts, l.camera) > (?, ?)
+    ORDER BY l.ts, l.camera
+"""
+
+SELECT_BUCKET_DELTAS = """
+    SELECT r.bucket, r.in_delta
+    FROM log_rollup r JOIN camera c ON c.id = r.camera
+    WHERE r.granularity = ? AND r.bucket >= ? AND r.bucket < ? {camera_filter}
+"""
+
+# Tagesprofil: Bins in Minuten des Tages (Stunden-Buckets → 60 Minuten je Bin)
+PROFILE_BIN_MINUTES = 60
+PROFILE_BINS = 24 * 60 // PROFILE_BIN_MINUTES
+PROFILE_LABELS = [f"{m // 60:02d}:{m % 60:02d}" for m in range(0, 24 * 60, PROFILE_BIN_MINUTES)]
+NS_PER_MINUTE = 60_000_000_000
+
+# Rohzeilen bleiben für den längsten Rohdaten-Filter ("Letzte Woche") plus Reserve im Speicher
+RAW_HORIZON = pd.DateOffset(days=8)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🕒 Zeitumrechnung
+# ────────────────────────────────────────────────────────────────────────────────
+def local_timezone() -> datetime.tzinfo:
+    """
+    Zeitzone des Systems (TZ-Variable bzw. /etc/localtime) für die Anzeige.
+
+    `dateutil.tz.tzlocal()` wäre gleichwertig, rechnet in pandas aber elementweise
+    und ist bei großen Spalten um ein Vielfaches langsamer.
+    """
+    key = os.environ.get("TZ", "").lstrip(":")
+    if key:
+        try:
+            return ZoneInfo(key)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    try:
+        with open("/etc/localtime", "rb") as f:
+            return ZoneInfo.from_file(f)
+    except (OSError, ValueError):
+        return datetime.datetime.now().astimezone().tzinfo
+
+
+LOCAL_TZ = local_timezone()
+
+
+def ms_to_local(ts: pd.Series) -> pd.Series:
+    """
+    Wandelt Epoch-Millisekunden vektorisiert in Ortszeit (datetime64 ohne Zeitzone).
+
+    Args:
+        ts (pd.Series): Zeitpunkte in Epoch-ms.
+    """
+    return pd.to_datetime(ts, unit="ms", utc=True).dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄 Store (eine Instanz je Datenbank, von allen Sitzungen geteilt)
+# ────────────────────────────────────────────────────────────────────────────────
+def db_identity(db_path: str) -> tuple[int, int] | None:
+    """
+    Kennung der Datenbankdatei (Gerät, Inode); None, wenn sie (noch) nicht existiert.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class HistoryStore:
+    """
+    Rohzeilen der letzten Woche mit inkrementellem Nachladen.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.identity = db_identity(db_path)
+        self.last_key: tuple[int, int] = (-1, -1)
+        self.frame = pd.DataFrame(columns=["timestamp"] + LOG_COLUMNS).astype(
+            {"timestamp": "datetime64[ns]", "ts": "int64"}
+        )
+        self._loaded = False
+        # Streamlit bedient Sitzungen in eigenen Threads → Zugriffe serialisieren
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def refresh(self, now: pd.Timestamp) -> tuple[int, int]:
+        """
+        Lädt neue Zeilen nach und verwirft Zeilen außerhalb des Rohdaten-Horizonts.
+
+        Beim ersten Aufruf wird nur der Horizont über den Primärschlüssel geladen,
+        danach nur noch Zeilen hinter dem zuletzt geladenen Schlüssel.
+
+        Args:
+            now (pd.Timestamp): Aktueller Zeitpunkt (Ortszeit).
+
+        Returns:
+            tuple[int, int]: Zuletzt geladener Schlüssel (ts, Kamera-ID), Teil des Cache-Schlüssels.
+        """
+        with self._lock:
+            horizon = components.to_epoch_ms(now - RAW_HORIZON)
+            if not self._loaded:
+                rows = self._conn.execute(SELECT_LOG_SINCE_TIME, (horizon,)).fetchall()
+                self._loaded = True
+            else:
+                rows = self._conn.execute(SELECT_LOG_AFTER_KEY, self.last_key).fetchall()
+            if not rows:
+                return self.last_key
+
+            self.last_key = (rows[-1][0], rows[-1][-1])
+            new = pd.DataFrame([row[:-1] for row in rows], columns=LOG_COLUMNS)
+            new.insert(0, "timestamp", ms_to_local(new["ts"]))
+
+            frame = pd.concat([self.frame, new], ignore_index=True) if len(self.frame) else new
+            self.frame = frame[frame["ts"] >= horizon].reset_index(drop=True)
+            return self.last_key
+
+    def window(self, start: int, end: int) -> pd.DataFrame:
+        """
+        Rohzeilen im Zeitfenster [start, end) (binäre Suche auf der sortierten Spalte `ts`).
+
+        Args:
+            start (int): Beginn in Epoch-ms.
+            end (int): Ende in Epoch-ms (exklusive).
+
+        Returns:
+            pd.DataFrame: Kopie der Zeilen im Fenster.
+        """
+        with self._lock:
+            ts = self.frame["ts"]
+            lo, hi = ts.searchsorted(start, side="left"), ts.searchsorted(end, side="left")
+            return self.frame.iloc[lo:hi].copy()
+
+    def rollups(self, time_filter: str, start: int, end: int) -> pd.DataFrame:
+        """
+        Vorberechnete Buckets eines langen Zeitfilters über die gemeinsame Verbindung.
+
+        Args:
+            time_filter (str): Zeitfilter aus `components.ROLLUP_GRANULARITY`.
+            start (int): Beginn in Epoch-ms.
+            end (int): Ende in Epoch-ms (exklusive).
+
+        Returns:
+            pd.DataFrame: Buckets mit Zählerständen, 'in_delta' und 'camera'.
+        """
+        with self._lock:
+            rows = read_rollups(self._conn, components.ROLLUP_GRANULARITY[time_filter], start, end)
+        df = pd.DataFrame(rows, columns=LOG_COLUMNS[:-1] + ["in_delta", "camera"])
+        df.insert(0, "timestamp", ms_to_local(df["ts"]))
+        return df
+
+    def bucket_deltas(self, start: int, end: int, camera: str | None = None,
+                      granularity: str = "hourly") -> tuple[np.ndarray, np.ndarray]:
+        """
+        IN-Zuwächse der Buckets einer Granularität im Zeitfenster (über den Primärschlüssel der Rollups).
+
+        Der Zuwachs des ersten Buckets ist gegen die letzte Zeile davor gerechnet,
+        nicht gegen null.
+
+        Args:
+            start (int): Beginn in Epoch-ms (der angeschnittene erste Bucket zählt mit).
+            end (int): Ende in Epoch-ms (exklusive).
+            camera (str | None): Nur diese Kamera (None = alle).
+            granularity (str): Rollup-Granularität (z. B. "10min" oder "hourly").
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Bucket-Beginn (Epoch-ms) und `in_delta` je Bucket und Kamera.
+        """
+        start = bucket_start(start, granularity) if start > 0 else start
+        sql = SELECT_BUCKET_DELTAS.format(camera_filter="AND c.name = ?" if camera is not None else "")
+        params = (granularity, start, end) if camera is None else (granularity, start, end, camera)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        data = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return data[:, 0], data[:, 1]
+
+    def cameras(self) -> list[str]:
+        """Kameras im Rohdaten-Horizont (für die Kameraauswahl im Mehrkamerabetrieb)."""
+        with self._lock:
+            return sorted(self.frame["camera"].dropna().unique())
+
+
+@st.cache_resource(show_spinner=False)
+def _history_store(db_path: str, identity: tuple[int, int]) -> HistoryStore:
+    """Ein Store je Datenbankdatei (neue Identität → neuer Store)."""
+    return HistoryStore(db_path)
+
+
+def get_history_store(db_path: str) -> HistoryStore:
+    """
+    Liefert den gemeinsamen Store der Datenbank.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank (muss existieren, siehe `init_db`).
+    """
+    return _history_store(db_path, db_identity(db_path))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Aggregierter Verlauf (je Filter zwischengespeichert)
+# ────────────────────────────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_history(db_path: str, identity: tuple[int, int], last_key: tuple[int, int], time_filter: str,
+                 start: int, end: int, camera: str | None = None) -> pd.DataFrame:
+    """
+    Aggregierter Verlauf eines Zeitfilters, wie er im Dashboard angezeigt wird.
+
+    `identity` und `last_key` gehen nur in den Cache-Schlüssel ein: Solange keine
+    neuen Zeilen vorliegen, liefert ein erneuter Aufruf das gespeicherte Ergebnis.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        identity (tuple[int, int]): Datenbankidentität (siehe `db_identity`).
+        last_key (tuple[int, int]): Zuletzt geladener Schlüssel (siehe `HistoryStore.refresh`).
+        time_filter (str): Zeitfilter (z. B. "Heute").
+        start (int): Beginn des Zeitfensters in Epoch-ms.
+        end (int): Ende des Zeitfensters in Epoch-ms (exklusive).
+        camera (str | None): Nur diese Kamera (None = alle Zeilen).
+
+    Returns:
+        pd.DataFrame: Aggregierte Zähldaten mit Spalte 'in_delta'.
+    """
+    store = get_history_store(db_path)
+    if time_filter in components.ROLLUP_GRANULARITY:
+        df = store.rollups(time_filter, start, end)
+        return df[df["camera"] == camera] if camera is not None else df
+
+    df = store.window(start, end)
+    if camera is not None:
+        df = df[df["camera"] == camera]
+    df = components.apply_dynamic_aggregation(df, time_filter)
+
+    # IN-Zuwächse aus den Rollups gleicher Bucket-Größe: wie bei den langen Filtern
+    # gegen die letzte Zeile vor dem Zeitfenster gerechnet (nicht der volle Zählerstand)
+    granularity = components.RAW_DELTA_GRANULARITY.get(time_filter)
+    if granularity is None:
+        df["in_delta"] = df["in_count"].diff().fillna(0).clip(lower=0)
+        return df
+    ts, in_delta = store.bucket_deltas(start, end, camera, granularity)
+    deltas = pd.Series(in_delta, index=ms_to_local(pd.Series(ts))).groupby(level=0).sum()
+    df["in_delta"] = df["timestamp"].map(deltas).fillna(0).astype(np.int64)
+    return df
+
+
+
+def time_of_day_profile(ts: np.ndarray, in_delta: np.ndarray) -> pd.DataFrame:
+    """
+    Summe und Tagesdurchschnitt der IN-Zuwächse je Tageszeit-Bin.
+
+    Die Bins sind ganzzahlige Minuten des Tages in Ortszeit (`np.bincount`, ohne
+    Gruppieren nach Zeit-Strings); der Durchschnitt bezieht sich auf die Tage mit Daten.
+
+    Args:
+        ts (np.ndarray): Bucket-Beginn in Epoch-ms.
+        in_delta (np.ndarray): IN-Zuwachs je Bucket.
+
+    Returns:
+        pd.DataFrame: Spalten 'hour', 'time' (Bin-Beginn "HH:MM"), 'in_delta' (Summe) und
+            'in_delta_avg' (Ø je Tag); leer ohne Daten.
+    """
+    if len(ts) == 0:
+        return pd.DataFrame(columns=["hour", "time", "in_delta", "in_delta_avg"])
+
+    local_ns = ms_to_local(pd.Series(ts)).to_numpy().view(np.int64)
+    minute_of_day = (local_ns // NS_PER_MINUTE) % (24 * 60)
+    days = np.unique(local_ns // (NS_PER_MINUTE * 24 * 60)).size
+    total = np.bincount(minute_of_day // PROFILE_BIN_MINUTES, weights=in_delta, minlength=PROFILE_BINS)
+    return pd.DataFrame({
+        "hour": np.arange(PROFILE_BINS) * PROFILE_BIN_MINUTES // 60,
+        "time": PROFILE_LABELS,
+        "in_delta": total.astype(np.int64),
+        "in_delta_avg": (total / days).round(2),
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_time_of_day(db_path: str, identity: tuple[int, int], last_key: tuple[int, int],
+                     start: int, end: int, camera: str | None = None) -> pd.DataFrame:
+    """
+    Tagesprofil des Zeitfensters, gemeinsam für Stundenverteilung und Tagesverlauf.
+
+    Liest nur die Stunden-Buckets (unbegrenzt aufbewahrt, ein Jahr ≈ 8760 Zeilen je
+    Kamera); `identity` und `last_key` gehen wie bei `load_history` nur in den
+    Cache-Schlüssel ein.
+
+    Args:
+        db_path (str): Pfad zur SQLite-Datenbank.
+        identity (tuple[int, int]): Datenbankidentität (siehe `db_identity`).
+        last_key (tuple[int, int]): Zuletzt geladener Schlüssel (siehe `HistoryStore.refresh`).
+        start (int): Beginn des Zeitfensters in Epoch-ms.
+        end (int): Ende des Zeitfensters in Epoch-ms (exklusive).
+        camera (str | None): Nur diese Kamera (None = alle).
+
+    Returns:
+        pd.DataFrame: Tagesprofil (siehe `time_of_day_profile`).
+    """
+    ts, in_delta = get_history_store(db_path).bucket_deltas(start, end, camera)
+    return time_of_day_profile(ts, in_delta)